@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     OfertaLaboral, Candidato, Noticia, Valoracion, Suscriptor, 
     AlertaEmpleo, Postulacion, PerfilEmpresa, ReporteOferta, 
-    Notificacion, Pregunta, Favorito, Servicio
+    Notificacion, Pregunta, Favorito, Servicio, Tarea
 )
 
 @admin.register(OfertaLaboral)
@@ -60,6 +60,13 @@ class NoticiaAdmin(admin.ModelAdmin):
     list_display = ('titulo', 'autor', 'fecha_publicacion')
     search_fields = ('titulo', 'contenido')
 
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ('funcion', 'estado', 'intentos', 'disponible_desde', 'fecha_creacion', 'fecha_fin')
+    list_filter = ('estado', 'funcion')
+    search_fields = ('funcion', 'clave')
+    readonly_fields = ('fecha_creacion', 'fecha_fin', 'error')
+
 admin.site.register(AlertaEmpleo)
 admin.site.register(Postulacion)
 admin.site.register(Notificacion)
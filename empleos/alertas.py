@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .busqueda import tokenizar
+
+# --- MOTOR DE COINCIDENCIA DE ALERTAS ---
+# Cada alerta se descompone en palabras normalizadas (tabla PalabraAlerta, índice token+región).
+# Una alerta coincide con una oferta cuando TODAS sus palabras aparecen en el título.
+
+COMODIN = '*'  # alerta sin palabras útiles: avisa de cualquier oferta de la región
+
+
+def palabras_de_alerta(palabra_clave):
+    return sorted(set(tokenizar(palabra_clave))) or [COMODIN]
+
+
+def indexar_alerta(alerta):
+    from .models import PalabraAlerta
+    palabras = palabras_de_alerta(alerta.palabra_clave)
+    # Juntos: si falla la inserción, la alerta conserva sus palabras anteriores en vez de quedar sin ninguna
+    with transaction.atomic():
+        PalabraAlerta.objects.filter(alerta=alerta).delete()
+        PalabraAlerta.objects.bulk_create([
+            PalabraAlerta(alerta=alerta, token=token, region=alerta.region, tokens_requeridos=len(palabras))
+            for token in palabras
+        ])
+
+
+def alertas_para_oferta(oferta, frecuencia=None):
+    from .models import AlertaEmpleo, PalabraAlerta
+    tokens = set(tokenizar(oferta.titulo)) | {COMODIN}
+    palabras = PalabraAlerta.objects.filter(region=oferta.region, token__in=tokens)
+    if frecuencia:
+        palabras = palabras.filter(alerta__frecuencia=frecuencia)
+    coincidentes = (
+        palabras
+        .values('alerta_id', 'tokens_requeridos')
+        .annotate(encontradas=Count('token', distinct=True))
+        .filter(encontradas=F('tokens_requeridos'))
+        .values('alerta_id')
+    )
+    return AlertaEmpleo.objects.filter(id__in=coincidentes)
+
+
+def destinatarios_por_oferta(ofertas, frecuencia=None):
+    """{oferta_id: [emails]} con el criterio de alertas_para_oferta, en una sola consulta para todas."""
+    from .models import PalabraAlerta
+    tokens_oferta = {oferta.id: set(tokenizar(oferta.titulo)) | {COMODIN} for oferta in ofertas}
+    if not tokens_oferta:
+        return {}
+    palabras = PalabraAlerta.objects.filter(
+        region__in={oferta.region for oferta in ofertas}, token__in=set().union(*tokens_oferta.values())
+    )
+    if frecuencia:
+        palabras = palabras.filter(alerta__frecuencia=frecuencia)
+    alertas = {}
+    for alerta_id, region, token, requeridos, email in palabras.values_list(
+        'alerta_id', 'region', 'token', 'tokens_requeridos', 'alerta__email'
+    ):
+        alertas.setdefault(alerta_id, (region, email.strip().lower(), requeridos, set()))[3].add(token)
+    # Solo alertas con todas sus palabras entre las traídas; luego, contenidas en el título de cada oferta
+    por_region = {}
+    for region, email, requeridos, tokens in alertas.values():
+        if email and len(tokens) == requeridos:
+            por_region.setdefault(region, []).append((email, tokens))
+    return {
+        oferta.id: sorted({email for email, tokens in por_region.get(oferta.region, ()) if tokens <= tokens_oferta[oferta.id]})
+        for oferta in ofertas
+    }
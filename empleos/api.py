@@ -0,0 +1,192 @@
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from .cache import estado_consulta, huella_estado
+from .models import Candidato, OfertaLaboral, PerfilEmpresa, Servicio
+from .paginacion import paginar_cursor
+
+# --- API JSON DE SOLO LECTURA (v1) ---
+# /api/v1/<recurso>/ lista con ?campos=a,b,c y paginación por ?cursor=; /api/v1/<recurso>/<id>/ detalle.
+# El ETag y el Last-Modified salen de un agregado (Max(fecha_modificacion), Count) sobre el
+# mismo queryset filtrado (ver empleos.cache.estado_consulta): un cliente que pregunta "¿hay
+# algo nuevo?" recibe un 304 con una sola consulta y sin serializar nada.
+
+POR_PAGINA = 20
+MAX_POR_PAGINA = 100
+
+
+class Recurso:
+    modelo = None
+    campos = ()  # columnas expuestas
+    campos_por_defecto = ()
+    filtros = ()  # parámetros GET que filtran por igualdad
+    orden = ('-id',)
+
+    def queryset(self):
+        return self.modelo.objects.all()
+
+    def url(self, fila):
+        return None
+
+
+class RecursoOfertas(Recurso):
+    modelo = OfertaLaboral
+    campos = (
+        'id', 'titulo', 'empresa', 'tipo', 'modalidad', 'duracion', 'region', 'experiencia', 'sueldo',
+        'fecha_publicacion', 'fecha_cierre', 'etiquetas', 'descripcion', 'es_destacado',
+    )
+    campos_por_defecto = ('id', 'titulo', 'empresa', 'tipo', 'modalidad', 'region', 'sueldo', 'fecha_publicacion', 'es_destacado')
+    filtros = ('region', 'tipo', 'modalidad', 'experiencia')
+    orden = ('-fecha_publicacion', '-id')
+
+    def queryset(self):
+        return OfertaLaboral.objects.filter(publicada=True)
+
+    def url(self, fila):
+        return reverse('detalle', args=[fila['id']])
+
+
+class RecursoServicios(Recurso):
+    modelo = Servicio
+    campos = ('id', 'titulo', 'descripcion', 'rubro', 'region', 'precio_referencial', 'fecha_publicacion')
+    campos_por_defecto = ('id', 'titulo', 'rubro', 'region', 'precio_referencial', 'fecha_publicacion')
+    filtros = ('rubro', 'region')
+    orden = ('-fecha_publicacion', '-id')
+
+    def queryset(self):
+        return Servicio.objects.filter(publicado=True)
+
+    def url(self, fila):
+        return reverse('detalle_servicio', args=[fila['id']])
+
+
+class RecursoEmpresas(Recurso):
+    modelo = PerfilEmpresa
+    campos = ('id', 'nombre', 'sitio_web', 'descripcion', 'es_destacada', 'fecha_creacion')
+    campos_por_defecto = ('id', 'nombre', 'sitio_web', 'es_destacada')
+    orden = ('-fecha_creacion', '-id')
+
+    def queryset(self):
+        return PerfilEmpresa.objects.exclude(nombre__isnull=True).exclude(nombre='')
+
+    def url(self, fila):
+        return reverse('perfil_empresa', args=[fila['nombre']]) if fila.get('nombre') else None
+
+
+class RecursoCandidatos(Recurso):
+    # Solo el resumen público: nunca datos de contacto ni archivos
+    modelo = Candidato
+    campos = ('id', 'nombre', 'titular', 'rubro', 'region', 'experiencia', 'disponibilidad', 'fecha_creacion')
+    campos_por_defecto = campos
+    filtros = ('rubro', 'region', 'experiencia')
+    orden = ('-fecha_creacion', '-id')
+
+    def queryset(self):
+        return Candidato.objects.filter(publicado=True)
+
+    def url(self, fila):
+        return reverse('detalle_candidato', args=[fila['id']])
+
+
+RECURSOS = {
+    'ofertas': RecursoOfertas(),
+    'servicios': RecursoServicios(),
+    'empresas': RecursoEmpresas(),
+    'candidatos': RecursoCandidatos(),
+}
+
+
+def _filtrar(request, recurso):
+    queryset = recurso.queryset()
+    for filtro in recurso.filtros:
+        if request.GET.get(filtro):
+            queryset = queryset.filter(**{filtro: request.GET[filtro]})
+    return queryset
+
+
+def _estado(request, recurso, id=None):
+    # etag_func y last_modified_func lo piden ambos: una sola consulta por petición
+    if not hasattr(request, '_estado_api'):
+        queryset = recurso.queryset().filter(id=id) if id is not None else _filtrar(request, recurso)
+        request._estado_api = estado_consulta(queryset)
+    return request._estado_api
+
+
+def _etag(request, recurso, id=None):
+    return huella_estado(request, _estado(request, RECURSOS[recurso], id))
+
+
+def _ultima_modificacion(request, recurso, id=None):
+    return _estado(request, RECURSOS[recurso], id)[0]
+
+
+def _error(mensaje, estado=400):
+    return JsonResponse({'error': mensaje}, status=estado)
+
+
+def _campos_pedidos(request, recurso):
+    pedidos = request.GET.get('campos')
+    if not pedidos:
+        return list(recurso.campos_por_defecto), None
+    campos = [c.strip() for c in pedidos.split(',') if c.strip() and c.strip() != 'url']
+    desconocidos = [c for c in campos if c not in recurso.campos]
+    if desconocidos:
+        return None, f"Campos no disponibles: {', '.join(desconocidos)}. Opciones: {', '.join(recurso.campos)}"
+    return campos, None
+
+
+def _columnas(recurso, campos):
+    # Además de lo pedido se leen las columnas del orden (las usa el cursor) y las de la URL
+    return set(campos) | {c.lstrip('-') for c in recurso.orden} | ({'id', 'nombre'} & set(recurso.campos))
+
+
+def _fila(request, recurso, fila, campos):
+    # `url` siempre va: es el enlace a la página pública del recurso
+    datos = {c: fila[c] for c in campos}
+    url = recurso.url(fila)
+    datos['url'] = request.build_absolute_uri(url) if url else None
+    return datos
+
+
+def _responder(datos):
+    respuesta = JsonResponse(datos, json_dumps_params={'ensure_ascii': False})
+    patch_cache_control(respuesta, public=True, max_age=60)
+    return respuesta
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_ultima_modificacion)
+def lista(request, recurso):
+    recurso = RECURSOS[recurso]
+    campos, error = _campos_pedidos(request, recurso)
+    if error:
+        return _error(error)
+
+    queryset = _filtrar(request, recurso)
+
+    por_pagina = request.GET.get('por_pagina', '')
+    por_pagina = min(int(por_pagina), MAX_POR_PAGINA) if por_pagina.isdigit() and int(por_pagina) > 0 else POR_PAGINA
+
+    pagina = paginar_cursor(request, queryset.values(*_columnas(recurso, campos)), recurso.orden, por_pagina=por_pagina)
+    return _responder({
+        'resultados': [_fila(request, recurso, fila, campos) for fila in pagina],
+        'siguiente': request.build_absolute_uri(pagina.url_siguiente) if pagina.has_next else None,
+        'anterior': request.build_absolute_uri(pagina.url_anterior) if pagina.has_previous else None,
+    })
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_ultima_modificacion)
+def detalle(request, recurso, id):
+    recurso = RECURSOS[recurso]
+    campos, error = _campos_pedidos(request, recurso)
+    if error:
+        return _error(error)
+    if not request.GET.get('campos'):
+        campos = list(recurso.campos)
+    fila = recurso.queryset().values(*_columnas(recurso, campos)).filter(id=id).first()
+    if fila is None:
+        return _error('No encontrado', 404)
+    return _responder(_fila(request, recurso, fila, campos))
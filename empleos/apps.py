@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def verificar_indices_busqueda(sender, using, **kwargs):
+    from django.db import connections
+    from .busqueda import instalar_indices_busqueda
+    # Solo instala en las tablas que ya tienen la columna documento_busqueda
+    instalar_indices_busqueda(connections[using])
 
 
 class EmpleosConfig(AppConfig):
     name = 'empleos'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(verificar_indices_busqueda, sender=self)
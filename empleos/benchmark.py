@@ -0,0 +1,162 @@
+import math
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from .models import OfertaLaboral
+from .sinteticos import PREFIJO
+
+# --- BENCHMARK DE LAS VISTAS CALIENTES ---
+# Recorre cada escenario con el cliente de pruebas de Django sobre la base de datos actual
+# (normalmente cargada con `manage.py sembrar_datos`) y reporta p50/p95 de latencia y el
+# número de consultas. `manage.py benchmark --guardar base.json` deja una línea base;
+# `--comparar base.json` falla si alguna vista se volvió más lenta o hace más consultas.
+# Se navega con un usuario staff logueado: así la caché de páginas anónimas no esconde el
+# costo real y se puede entrar a panel_admin y publicar ofertas.
+# Las escrituras (publicar_empleo) se deshacen al terminar cada repetición.
+
+
+class Escenario:
+    def __init__(self, nombre, vista, consulta='', args=None, metodo='get', datos=None, estado=200, max_consultas=None, ajustes=None):
+        self.nombre = nombre
+        self.vista = vista
+        self.consulta = consulta
+        self.args = args  # función(contexto) -> argumentos de la URL
+        self.metodo = metodo
+        self.datos = datos or {}
+        self.estado = estado
+        self.max_consultas = max_consultas  # presupuesto: superarlo es una regresión
+        self.ajustes = ajustes or {}
+
+    def url(self, contexto):
+        url = reverse(self.vista, args=self.args(contexto) if self.args else None)
+        return f"{url}?{self.consulta}" if self.consulta else url
+
+
+class Contexto:
+    def __init__(self, semilla=1):
+        self.azar = random.Random(semilla)
+        self.ofertas = list(
+            OfertaLaboral.objects.filter(publicada=True).order_by('-fecha_publicacion').values_list('id', flat=True)[:500]
+        )
+
+    def oferta(self):
+        return [self.azar.choice(self.ofertas)]
+
+
+NUEVA_OFERTA = {
+    'titulo': 'Vendedor Part Time', 'empresa': 'Benchmark', 'tipo': 'part_time', 'modalidad': 'Presencial',
+    'region': 'RM', 'experiencia': 'junior', 'sueldo': '650000', 'descripcion': 'Oferta de prueba del benchmark.',
+    'captcha': '7',
+}
+
+ESCENARIOS = [
+    # +2 sin calentamiento: la barra de destacados (templatetags/destacados.py) aún no está en caché
+    Escenario('inicio', 'home', max_consultas=10),
+    Escenario('inicio_filtros', 'home', 'region=RM&min_sueldo=800000&dias=30', max_consultas=10),
+    Escenario('inicio_busqueda', 'home', 'q=vendedor', max_consultas=10),
+    Escenario('detalle_oferta', 'detalle', args=Contexto.oferta, max_consultas=12),
+    Escenario('lista_candidatos', 'candidatos', max_consultas=6),
+    Escenario('lista_candidatos_filtros', 'candidatos', 'region=RM&experiencia=junior&q=analista', max_consultas=6),
+    # Con TAREAS_SINCRONAS el reparto a las alertas coincidentes corre dentro de la petición
+    Escenario(
+        'publicar_empleo', 'publicar_empleo', metodo='post', datos=NUEVA_OFERTA, estado=302, max_consultas=40,
+        ajustes={'TAREAS_SINCRONAS': True, 'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend', 'CORREOS_POR_SEGUNDO': 10 ** 6},
+    ),
+    Escenario('mapa_empleos', 'mapa_empleos', max_consultas=6),
+    # El ETag del mapa sale de un agregado en la base de datos: una consulta más, a cambio de 304 fiables
+    Escenario('mapa_datos', 'mapa_datos', 'zoom=5', max_consultas=5),
+    Escenario('mapa_datos_puntos', 'mapa_datos', 'zoom=13&bbox=-70.70,-33.48,-70.64,-33.42', max_consultas=6),
+    Escenario('panel_admin', 'panel_admin', max_consultas=12),
+]
+
+
+def percentil(valores, p):
+    # Rango más cercano: sin interpolar, siempre es una medición real
+    ordenados = sorted(valores)
+    return ordenados[max(math.ceil(p / 100 * len(ordenados)) - 1, 0)]
+
+
+def usuario_benchmark():
+    usuario, _ = User.objects.get_or_create(
+        username=f"{PREFIJO}benchmark", defaults={'is_staff': True, 'email': 'benchmark@example.com'}
+    )
+    return usuario
+
+
+def _pedir(cliente, escenario, contexto):
+    url = escenario.url(contexto)
+    peticion = getattr(cliente, escenario.metodo)
+    with CaptureQueriesContext(connection) as consultas:
+        inicio = time.perf_counter()
+        if escenario.metodo == 'get':
+            respuesta = peticion(url, secure=True)
+        else:
+            # Las escrituras se deshacen para que cada repetición parta del mismo estado
+            with transaction.atomic():
+                respuesta = peticion(url, escenario.datos, secure=True)
+                transaction.set_rollback(True)
+        duracion = time.perf_counter() - inicio
+    return respuesta.status_code, duracion, len(consultas)
+
+
+def medir(escenario, cliente, contexto, repeticiones=20, calentamiento=2):
+    tiempos, consultas, errores = [], [], []
+    with override_settings(**escenario.ajustes):
+        for i in range(calentamiento + repeticiones):
+            estado, duracion, cantidad = _pedir(cliente, escenario, contexto)
+            if i < calentamiento:
+                continue
+            if estado != escenario.estado:
+                errores.append(estado)
+            tiempos.append(duracion * 1000)
+            consultas.append(cantidad)
+    return {
+        'p50_ms': round(percentil(tiempos, 50), 2),
+        'p95_ms': round(percentil(tiempos, 95), 2),
+        'max_ms': round(max(tiempos), 2),
+        'consultas': max(consultas),
+        'consultas_min': min(consultas),
+        'errores': errores,
+    }
+
+
+def ejecutar(nombres=None, repeticiones=20, calentamiento=2, semilla=1):
+    """Mide los escenarios pedidos (todos por defecto). Devuelve {nombre: resultado}."""
+    escenarios = [e for e in ESCENARIOS if not nombres or e.nombre in nombres]
+    contexto = Contexto(semilla)
+    if not contexto.ofertas:
+        raise ValueError("No hay ofertas publicadas: cargue datos con `manage.py sembrar_datos`.")
+    cliente = Client()
+    cliente.force_login(usuario_benchmark())
+    hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+    resultados = {}
+    with override_settings(ALLOWED_HOSTS=hosts):
+        for escenario in escenarios:
+            resultados[escenario.nombre] = medir(escenario, cliente, contexto, repeticiones, calentamiento)
+    return resultados
+
+
+def regresiones(resultados, base=None, tolerancia=0.25):
+    """Lista de problemas: errores, consultas sobre el presupuesto o peor que la línea base."""
+    presupuestos = {e.nombre: e.max_consultas for e in ESCENARIOS}
+    problemas = []
+    for nombre, actual in resultados.items():
+        if actual['errores']:
+            problemas.append(f"{nombre}: respuestas inesperadas {sorted(set(actual['errores']))}")
+        if presupuestos.get(nombre) is not None and actual['consultas'] > presupuestos[nombre]:
+            problemas.append(f"{nombre}: {actual['consultas']} consultas (presupuesto {presupuestos[nombre]})")
+        anterior = (base or {}).get(nombre)
+        if not anterior:
+            continue
+        if actual['consultas'] > anterior['consultas']:
+            problemas.append(f"{nombre}: {actual['consultas']} consultas (base {anterior['consultas']})")
+        if actual['p95_ms'] > anterior['p95_ms'] * (1 + tolerancia):
+            problemas.append(f"{nombre}: p95 {actual['p95_ms']} ms (base {anterior['p95_ms']} ms, tolerancia {tolerancia:.0%})")
+    return problemas
@@ -0,0 +1,227 @@
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+# --- NORMALIZACIÓN (ESPAÑOL) ---
+
+PALABRAS_VACIAS = {
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'se', 'sin', 'su', 'un', 'una', 'y',
+}
+
+LIMITE_DOCUMENTO = 4000  # caracteres de la descripción que entran al índice
+
+_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+
+def normalizar_texto(texto):
+    """Minúsculas y sin tildes: 'Gasfíter Señor' -> 'gasfiter senor'."""
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(' ', texto).strip()
+
+
+def tokenizar(texto):
+    return [t for t in normalizar_texto(texto).split() if t not in PALABRAS_VACIAS]
+
+
+def construir_documento(oferta):
+    partes = [
+        oferta.titulo, oferta.empresa, oferta.etiquetas,
+        (oferta.descripcion or '')[:LIMITE_DOCUMENTO],
+    ]
+    return ' '.join(tokenizar(' '.join(p for p in partes if p)))
+
+
+def construir_documento_candidato(candidato):
+    partes = [candidato.titular, (candidato.presentacion or '')[:LIMITE_DOCUMENTO]]
+    return ' '.join(tokenizar(' '.join(p for p in partes if p)))
+
+
+# --- MOTORES DE BÚSQUEDA ---
+
+class BuscadorBase:
+    """Filtra y ordena por relevancia un queryset de un modelo de TABLAS_BUSQUEDA.
+
+    Cada motor anota el campo `rango` (mayor = más relevante).
+    """
+
+    def buscar(self, queryset, q):
+        raise NotImplementedError
+
+    def vacio(self, queryset):
+        # Sin palabras útiles (solo palabras vacías o signos): nada, pero con `rango` para poder ordenar
+        return queryset.none().annotate(rango=Value(0.0, output_field=FloatField()))
+
+
+class BuscadorBasico(BuscadorBase):
+    # Respaldo para motores sin índice de texto: todas las palabras deben aparecer
+    def buscar(self, queryset, q):
+        tokens = tokenizar(q)
+        if not tokens:
+            return self.vacio(queryset)
+        for token in tokens:
+            queryset = queryset.filter(documento_busqueda__contains=token)
+        return queryset.annotate(rango=Value(1.0, output_field=FloatField()))
+
+
+class BuscadorSQLite(BuscadorBase):
+    # Tabla FTS5 <tabla>_fts, sincronizada por triggers (ver migraciones 0030 y 0037)
+    def buscar(self, queryset, q):
+        tokens = tokenizar(q)
+        if not tokens:
+            return self.vacio(queryset)
+        consulta = ' '.join(f'{t}*' for t in tokens)
+        tabla = queryset.model._meta.db_table
+        fts = TABLAS_BUSQUEDA[tabla]['fts']
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [consulta]),
+        ).annotate(rango=RawSQL(
+            f'SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = {tabla}.id',
+            [consulta], output_field=FloatField(),
+        ))
+
+
+class BuscadorPostgres(BuscadorBase):
+    # Índices GIN sobre el SearchVector de documento_busqueda y pg_trgm (ver instalar_indices_busqueda)
+    def buscar(self, queryset, q):
+        # Importa psycopg: solo se carga si la base de datos es PostgreSQL
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+
+        tokens = tokenizar(q)
+        if not tokens:
+            return self.vacio(queryset)
+        consulta = SearchQuery(' & '.join(f'{t}:*' for t in tokens), config='simple', search_type='raw')
+        resultado = (
+            queryset.alias(vector=SearchVector('documento_busqueda', config='simple')).filter(vector=consulta)
+            .annotate(rango=SearchRank(F('vector'), consulta))
+        )
+        if resultado.exists():
+            return resultado
+        # Sin coincidencias exactas: tolerancia a errores de tipeo con trigramas (texto <% documento)
+        texto = ' '.join(tokens)
+        return queryset.filter(TrigramWordSimilar(F('documento_busqueda'), texto)).annotate(
+            rango=TrigramWordSimilarity(texto, 'documento_busqueda'),
+        )
+
+
+MOTORES_POR_VENDOR = {
+    'postgresql': BuscadorPostgres,
+    'sqlite': BuscadorSQLite,
+}
+
+
+def obtener_buscador():
+    ruta = getattr(settings, 'BUSCADOR_OFERTAS', None)
+    if ruta:
+        return import_string(ruta)()
+    return MOTORES_POR_VENDOR.get(connection.vendor, BuscadorBasico)()
+
+
+def buscar_ofertas(queryset, q):
+    # Una consulta sin palabras útiles ('de', '¿?') no filtra: se muestra el listado normal
+    if not tokenizar(q):
+        return queryset
+    return obtener_buscador().buscar(queryset, q).order_by('-es_destacado', '-rango', '-fecha_publicacion')
+
+
+def buscar_candidatos(queryset, q):
+    # Solo filtra: el directorio mantiene su orden por fecha (y su paginación por cursor)
+    if not tokenizar(q):
+        return queryset
+    return obtener_buscador().buscar(queryset, q)
+
+
+# --- ÍNDICES (se crean en las migraciones 0030 y 0037 y se verifican en cada migrate) ---
+# Cada tabla con columna documento_busqueda tiene su tabla FTS5 (SQLite) o sus índices GIN (PostgreSQL).
+
+TABLAS_BUSQUEDA = {
+    'empleos_ofertalaboral': {'fts': 'empleos_ofertalaboral_fts', 'indice': 'empleos_oferta_busqueda'},
+    'empleos_candidato': {'fts': 'empleos_candidato_fts', 'indice': 'empleos_candidato_busqueda'},
+}
+
+
+def triggers_sqlite(tabla):
+    fts = TABLAS_BUSQUEDA[tabla]['fts']
+    return {
+        f'{fts}_ai': (
+            f'AFTER INSERT ON {tabla} BEGIN '
+            f'INSERT INTO {fts}(rowid, documento) VALUES (new.id, new.documento_busqueda); END'
+        ),
+        f'{fts}_ad': (
+            f'AFTER DELETE ON {tabla} BEGIN '
+            f'DELETE FROM {fts} WHERE rowid = old.id; END'
+        ),
+        f'{fts}_au': (
+            f'AFTER UPDATE OF documento_busqueda ON {tabla} BEGIN '
+            f'DELETE FROM {fts} WHERE rowid = old.id; '
+            f'INSERT INTO {fts}(rowid, documento) VALUES (new.id, new.documento_busqueda); END'
+        ),
+    }
+
+
+def _tablas_con_documento(conexion, tablas):
+    with conexion.cursor() as cursor:
+        existentes = set(conexion.introspection.table_names(cursor))
+        return [
+            tabla for tabla in tablas if tabla in existentes and 'documento_busqueda' in
+            [c.name for c in conexion.introspection.get_table_description(cursor, tabla)]
+        ]
+
+
+def instalar_indices_busqueda(conexion, tablas=None):
+    # Sin `tablas` (así la llama post_migrate, ver apps.py) se saltan las que aún no tienen documento_busqueda
+    for tabla in _tablas_con_documento(conexion, tablas or TABLAS_BUSQUEDA):
+        fts, indice = TABLAS_BUSQUEDA[tabla]['fts'], TABLAS_BUSQUEDA[tabla]['indice']
+        with conexion.cursor() as cursor:
+            if conexion.vendor == 'sqlite':
+                triggers = triggers_sqlite(tabla)
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f'{fts}_%'])
+                existentes = {fila[0] for fila in cursor.fetchall()}
+                if existentes == set(triggers):
+                    continue
+                # SQLite borra los triggers al reconstruir la tabla (AlterField), así que se rehace todo
+                cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE {fts} '
+                    "USING fts5(documento, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+                cursor.execute(f'INSERT INTO {fts}(rowid, documento) SELECT id, documento_busqueda FROM {tabla}')
+                for nombre, cuerpo in triggers.items():
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {nombre}')
+                    cursor.execute(f'CREATE TRIGGER {nombre} {cuerpo}')
+            elif conexion.vendor == 'postgresql':
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                # Misma expresión que compila SearchVector('documento_busqueda', config='simple'), para
+                # que el planificador use el índice; reemplaza al <indice>_fts de las migraciones 0030/0037
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {indice}_vector ON {tabla} '
+                    "USING gin (to_tsvector('simple'::regconfig, COALESCE(documento_busqueda, '')))"
+                )
+                cursor.execute(f'DROP INDEX IF EXISTS {indice}_fts')
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {indice}_trgm ON {tabla} '
+                    'USING gin (documento_busqueda gin_trgm_ops)'
+                )
+
+
+def eliminar_indices_busqueda(conexion, tablas=None):
+    for tabla in tablas or TABLAS_BUSQUEDA:
+        fts, indice = TABLAS_BUSQUEDA[tabla]['fts'], TABLAS_BUSQUEDA[tabla]['indice']
+        with conexion.cursor() as cursor:
+            if conexion.vendor == 'sqlite':
+                for nombre in triggers_sqlite(tabla):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {nombre}')
+                cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+            elif conexion.vendor == 'postgresql':
+                cursor.execute(f'DROP INDEX IF EXISTS {indice}_vector')
+                cursor.execute(f'DROP INDEX IF EXISTS {indice}_fts')
+                cursor.execute(f'DROP INDEX IF EXISTS {indice}_trgm')
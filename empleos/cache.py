@@ -0,0 +1,102 @@
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+# --- CACHÉ DE PÁGINAS PÚBLICAS ---
+# Cada grupo de contenido (ofertas, servicios, empresas, noticias) tiene un número de versión
+# en caché. Las claves de página y de fragmento incluyen las versiones de los grupos de los
+# que dependen; al guardar/borrar un modelo (ver empleos.signals) se sube la versión de su
+# grupo y todas esas entradas quedan obsoletas de una vez.
+# La invalidación solo llega a todos los procesos si la caché es compartida (Redis o
+# CACHE_DIR); con LocMemCache cada worker tiene sus propias versiones. Por eso versiones y
+# marcas expiran a los CACHE_VERSIONES_SEGUNDOS: en el peor caso un worker que no vio el
+# cambio sirve contenido viejo durante ese plazo, no indefinidamente.
+
+
+def _segundos():
+    return getattr(settings, 'CACHE_VERSIONES_SEGUNDOS', 300)
+
+
+def _clave_version(grupo):
+    return f"version:{grupo}"
+
+
+def versiones(*grupos):
+    claves = [_clave_version(g) for g in grupos]
+    encontradas = cache.get_many(claves)
+    for clave in claves:
+        if clave not in encontradas:
+            cache.add(clave, int(time.time() * 1000), _segundos())
+            encontradas[clave] = cache.get(clave)
+    return '.'.join(str(encontradas[c]) for c in claves)
+
+
+def invalidar(*grupos):
+    ahora = time.time()
+    for grupo in grupos:
+        # incr no renueva el plazo: se reescribe la versión (el nuevo valor sigue siendo mayor)
+        version = cache.get(_clave_version(grupo))
+        cache.set(_clave_version(grupo), max(int(ahora * 1000), (version or 0) + 1), _segundos())
+        cache.set(_clave_modificado(grupo), ahora, _segundos())
+
+
+def _clave_modificado(grupo):
+    return f"modificado:{grupo}"
+
+
+def ultima_modificacion(*grupos):
+    """Timestamp del último cambio en los grupos (para Last-Modified). Sin registro, "ahora"."""
+    claves = [_clave_modificado(g) for g in grupos]
+    encontradas = cache.get_many(claves)
+    for clave in claves:
+        if clave not in encontradas:
+            cache.add(clave, time.time(), _segundos())
+            encontradas[clave] = cache.get(clave)
+    return max(encontradas.values())
+
+
+def clave_pagina(request, grupos):
+    consulta = urlencode(sorted(request.GET.lists()), doseq=True)
+    huella = hashlib.md5(f"{request.path}?{consulta}".encode()).hexdigest()
+    return f"pagina:{huella}:{versiones(*grupos)}"
+
+
+def cache_publico(*grupos, timeout=None):
+    """Cachea la respuesta completa para visitantes anónimos, por URL + query string."""
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD') or request.user.is_authenticated
+                    or request.COOKIES.get('messages')):
+                return vista(request, *args, **kwargs)
+            clave = clave_pagina(request, grupos)
+            respuesta = cache.get(clave)
+            if respuesta is None:
+                respuesta = vista(request, *args, **kwargs)
+                if respuesta.status_code == 200 and not respuesta.streaming and not respuesta.cookies:
+                    cache.set(clave, respuesta, timeout or getattr(settings, 'CACHE_PAGINAS_SEGUNDOS', 300))
+            return respuesta
+        return envoltura
+    return decorador
+
+
+# --- VALIDADORES HTTP (ETag / Last-Modified) ---
+# No salen de versiones(): con una caché por proceso, un worker que no vio la invalidación
+# respondería 304 con datos viejos para siempre. Se calculan con un agregado sobre el mismo
+# queryset que se va a servir, así que siempre reflejan la base de datos.
+
+
+def estado_consulta(queryset):
+    """(última fecha_modificacion, total) de las filas del queryset, en una consulta."""
+    estado = queryset.order_by().aggregate(ultima=Max('fecha_modificacion'), total=Count('pk'))
+    return estado['ultima'], estado['total']
+
+
+def huella_estado(request, estado):
+    ultima, total = estado
+    return hashlib.md5(f"{request.get_full_path()}|{ultima.isoformat() if ultima else ''}|{total}".encode()).hexdigest()
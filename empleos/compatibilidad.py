@@ -0,0 +1,134 @@
+import numpy as np
+
+from .busqueda import tokenizar
+from .models import NIVEL_EXPERIENCIA
+
+# --- MOTOR DE COMPATIBILIDAD CANDIDATO / OFERTA ---
+# Codifica región, experiencia, sueldo y palabras del título como arreglos NumPy y puntúa
+# un candidato contra muchas ofertas (o una oferta contra muchos candidatos) de una vez.
+# Cada componente vale entre 0 y 1; el porcentaje final es el promedio ponderado.
+
+NIVELES = {codigo: i for i, (codigo, _nombre) in enumerate(NIVEL_EXPERIENCIA)}
+PESOS = np.array([1.0, 1.0, 1.0, 1.0])  # región, experiencia, sueldo, perfil
+CAMPOS_OFERTA = ('id', 'titulo', 'region', 'experiencia', 'sueldo')
+CAMPOS_CANDIDATO = ('id', 'titular', 'region', 'experiencia', 'pretension_renta')
+
+
+def _valor(obj, campo):
+    return obj.get(campo) if isinstance(obj, dict) else getattr(obj, campo)
+
+
+def _montos(valores):
+    return np.array([v if v else np.nan for v in valores], dtype=float)
+
+
+def _cobertura_titulo(tokens_titular, titulos):
+    """Fracción de las palabras del titular del candidato presentes en cada título."""
+    if not tokens_titular:
+        return np.full(len(titulos), np.nan)
+    vocab = {t: i for i, t in enumerate(tokens_titular)}
+    presentes = np.zeros((len(titulos), len(vocab)), dtype=bool)
+    for fila, titulo in enumerate(titulos):
+        for token in set(tokenizar(titulo)) & vocab.keys():
+            presentes[fila, vocab[token]] = True
+    return presentes.mean(axis=1)
+
+
+def _cobertura_titulares(titulares, tokens_titulo):
+    """Para un solo título: fracción de las palabras de cada titular presentes en él."""
+    vocab, filas, columnas = {}, [], []
+    for fila, titular in enumerate(titulares):
+        for token in set(tokenizar(titular)):
+            filas.append(fila)
+            columnas.append(vocab.setdefault(token, len(vocab)))
+    tiene = np.zeros((len(titulares), len(vocab)), dtype=bool)
+    tiene[filas, columnas] = True
+    en_titulo = np.zeros(len(vocab), dtype=bool)
+    en_titulo[[vocab[t] for t in tokens_titulo if t in vocab]] = True
+    totales = tiene.sum(axis=1)
+    with np.errstate(invalid='ignore'):
+        return (tiene & en_titulo).sum(axis=1) / np.where(totales, totales, np.nan)
+
+
+def _componentes(region_c, nivel_c, renta_c, region_o, nivel_o, sueldo_o, cobertura):
+    """Todas las entradas son arreglos del mismo largo; devuelve una matriz (n, 4)."""
+    region = (region_c == region_o).astype(float)
+
+    diferencia = nivel_c - nivel_o  # >= 0: el candidato cumple o supera lo pedido
+    experiencia = np.select([diferencia >= 0, diferencia == -1], [1.0, 0.5], 0.0)
+
+    sin_dato = np.isnan(sueldo_o) | np.isnan(renta_c)
+    with np.errstate(invalid='ignore'):
+        acorde = sueldo_o >= renta_c * 0.9
+    sueldo = np.where(sin_dato, 0.5, acorde.astype(float))
+
+    perfil = np.where(np.isnan(cobertura), 0.5, cobertura)
+    return np.column_stack([region, experiencia, sueldo, perfil])
+
+
+def _porcentajes(componentes):
+    return np.rint(componentes @ PESOS / PESOS.sum() * 100).astype(int)
+
+
+def componentes_candidato(candidato, ofertas):
+    n = len(ofertas)
+    titulos = [_valor(o, 'titulo') for o in ofertas]
+    return _componentes(
+        region_c=np.full(n, candidato.region, dtype=object),
+        nivel_c=np.full(n, NIVELES.get(candidato.experiencia, 0)),
+        renta_c=np.full(n, candidato.pretension_renta or np.nan, dtype=float),
+        region_o=np.array([_valor(o, 'region') for o in ofertas], dtype=object),
+        nivel_o=np.array([NIVELES.get(_valor(o, 'experiencia'), 0) for o in ofertas]),
+        sueldo_o=_montos(_valor(o, 'sueldo') for o in ofertas),
+        cobertura=_cobertura_titulo(sorted(set(tokenizar(candidato.titular))), titulos),
+    )
+
+
+def puntajes_candidato(candidato, ofertas):
+    """Porcentaje de compatibilidad del candidato con cada oferta (instancias o dicts de values())."""
+    if not ofertas:
+        return np.array([], dtype=int)
+    return _porcentajes(componentes_candidato(candidato, ofertas))
+
+
+def puntajes_oferta(oferta, candidatos):
+    """Porcentaje de compatibilidad de cada candidato con la oferta."""
+    if not candidatos:
+        return np.array([], dtype=int)
+    n = len(candidatos)
+    cobertura = _cobertura_titulares([_valor(c, 'titular') for c in candidatos], set(tokenizar(oferta.titulo)))
+    componentes = _componentes(
+        region_c=np.array([_valor(c, 'region') for c in candidatos], dtype=object),
+        nivel_c=np.array([NIVELES.get(_valor(c, 'experiencia'), 0) for c in candidatos]),
+        renta_c=_montos(_valor(c, 'pretension_renta') for c in candidatos),
+        region_o=np.full(n, oferta.region, dtype=object),
+        nivel_o=np.full(n, NIVELES.get(oferta.experiencia, 0)),
+        sueldo_o=np.full(n, oferta.sueldo or np.nan, dtype=float),
+        cobertura=cobertura,
+    )
+    return _porcentajes(componentes)
+
+
+def detalle_compatibilidad(candidato, oferta):
+    """Porcentaje y explicación por componente para la página de detalle."""
+    region, experiencia, sueldo, perfil = componentes_candidato(candidato, [oferta])[0]
+    detalles = [
+        {'icon': '✅', 'text': 'Misma Región'} if region else {'icon': '❌', 'text': 'Diferente Región'},
+        {'icon': '✅', 'text': 'Experiencia suficiente'} if experiencia == 1
+        else {'icon': '⚠️', 'text': 'Piden un poco más de experiencia'} if experiencia
+        else {'icon': '❌', 'text': 'Piden más experiencia'},
+        {'icon': '✅', 'text': 'Sueldo Acorde'} if sueldo == 1
+        else {'icon': '⚖️', 'text': 'Sueldo a negociar'} if sueldo
+        else {'icon': '⚠️', 'text': 'Sueldo bajo tu pretensión'},
+        {'icon': '✅', 'text': 'Perfil Técnico Compatible'} if perfil >= 0.5
+        else {'icon': '🔍', 'text': 'Revisar requisitos'},
+    ]
+    porcentaje = int(_porcentajes(np.array([[region, experiencia, sueldo, perfil]]))[0])
+    return porcentaje, detalles
+
+
+def mejores_ofertas_para(candidato, ofertas, n=20):
+    """Ordena dicts de values(*CAMPOS_OFERTA) por compatibilidad y devuelve [(id, %)] de las n mejores."""
+    puntajes = puntajes_candidato(candidato, ofertas)
+    orden = np.argsort(-puntajes, kind='stable')[:n]
+    return [(ofertas[i]['id'], int(puntajes[i])) for i in orden]
@@ -0,0 +1,158 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .tareas import encolar
+
+# --- ENVÍO MASIVO DE ALERTAS ---
+# Una oferta con miles de alertas se divide en lotes de CORREOS_TAMANO_LOTE; cada lote es una
+# tarea independiente (se reintenta sola) que envía un correo por destinatario usando una
+# única conexión al proveedor y respetando CORREOS_POR_SEGUNDO. Tras cada segundo de envío el
+# lote deja en su tarea solo los destinatarios pendientes: un reintento no repite los enviados.
+
+
+def en_lotes(items, tamano):
+    for i in range(0, len(items), tamano):
+        yield items[i:i + tamano]
+
+
+def enviar_mensajes(mensajes, al_avanzar=None):
+    """Envía EmailMessage por una sola conexión, limitando la tasa de envío.
+
+    `al_avanzar(n)` se llama tras cada grupo (y antes de propagar un error) con cuántos de los
+    primeros mensajes ya salieron.
+    """
+    por_segundo = getattr(settings, 'CORREOS_POR_SEGUNDO', 10)
+    enviados = procesados = 0
+    with get_connection() as conexion:
+        for grupo in en_lotes(mensajes, por_segundo):
+            inicio = time.monotonic()
+            try:
+                for mensaje in grupo:
+                    enviados += conexion.send_messages([mensaje]) or 0
+                    procesados += 1
+            finally:
+                if al_avanzar:
+                    al_avanzar(procesados)
+            restante = 1 - (time.monotonic() - inicio)
+            if restante > 0 and len(grupo) == por_segundo:
+                time.sleep(restante)
+    return enviados
+
+
+def avance_en_tarea(clave, datos, destinatarios):
+    """`al_avanzar` que guarda en la tarea `clave` los destinatarios que faltan por enviar."""
+    from .models import Tarea
+
+    def al_avanzar(procesados):
+        Tarea.objects.filter(clave=clave).update(datos={**datos, 'destinatarios': destinatarios[procesados:]})
+    return al_avanzar
+
+
+def mensaje_alerta(oferta, email, palabras_clave):
+    asunto = f"🔔 Alerta: {oferta.titulo}"
+    cuerpo = (
+        f"Hola,\n\n"
+        f"Publicamos una oferta que coincide con tu alerta \"{', '.join(palabras_clave)}\":\n\n"
+        f"{oferta.titulo}" + (f" - {oferta.empresa}" if oferta.empresa else "") + f" ({oferta.get_region_display()})\n"
+        f"Postula aquí: {settings.URL_SITIO}/oferta/{oferta.id}/\n"
+    )
+    return EmailMessage(asunto, cuerpo, None, [email])
+
+
+def enviar_alertas_oferta(oferta_id):
+    """Tarea: busca las alertas que coinciden con la oferta y encola un envío por lote."""
+    from .alertas import alertas_para_oferta
+    from .models import AlertaEmpleo, OfertaLaboral
+
+    oferta = OfertaLaboral.objects.filter(id=oferta_id, publicada=True).first()
+    if not oferta:
+        return
+    palabras_por_email = {}
+    for email, palabra in alertas_para_oferta(oferta, AlertaEmpleo.INSTANTANEA).values_list('email', 'palabra_clave'):
+        palabras_por_email.setdefault(email.strip().lower(), set()).add(palabra)
+
+    destinatarios = sorted([email, sorted(palabras)] for email, palabras in palabras_por_email.items())
+    tamano = getattr(settings, 'CORREOS_TAMANO_LOTE', 100)
+    for n, lote in enumerate(en_lotes(destinatarios, tamano)):
+        encolar('empleos.correos.enviar_lote_alerta', clave=f"alerta:{oferta_id}:{n}", oferta_id=oferta_id, destinatarios=lote, lote=n)
+
+
+def enviar_lote_alerta(oferta_id, destinatarios, lote=None):
+    from .models import OfertaLaboral
+    oferta = OfertaLaboral.objects.filter(id=oferta_id).first()
+    if not oferta:
+        return
+    al_avanzar = None
+    if lote is not None:
+        al_avanzar = avance_en_tarea(f"alerta:{oferta_id}:{lote}", {'oferta_id': oferta_id, 'lote': lote}, destinatarios)
+    enviar_mensajes([mensaje_alerta(oferta, email, palabras) for email, palabras in destinatarios], al_avanzar)
+
+
+# --- RESÚMENES DIARIOS / SEMANALES ---
+# `manage.py enviar_resumenes` toma las ofertas aprobadas desde la última marca de agua
+# (EnvioResumen.hasta), agrupa las coincidencias por correo y encola un envío por lote.
+# La marca es sobre fecha_aprobacion y no fecha_publicacion: una oferta creada antes y
+# aprobada después conserva su fecha_publicacion antigua y quedaría fuera. Tampoco es
+# fecha_modificacion, que reenviaría una oferta ya enviada cada vez que se edita.
+
+PERIODOS = {'DIA': timedelta(days=1), 'SEM': timedelta(days=7)}
+MAX_OFERTAS_RESUMEN = 20
+
+
+def generar_resumenes(frecuencia, ahora=None):
+    from .alertas import destinatarios_por_oferta
+    from .models import EnvioResumen, OfertaLaboral
+
+    ahora = ahora or timezone.now()
+    marca = EnvioResumen.objects.filter(frecuencia=frecuencia).first()
+    desde = marca.hasta if marca else ahora - PERIODOS[frecuencia]
+    nuevas = list(OfertaLaboral.objects.filter(
+        publicada=True, fecha_aprobacion__gt=desde, fecha_aprobacion__lte=ahora
+    ).order_by('-es_destacado', '-fecha_publicacion').only('id', 'titulo', 'region'))
+
+    ofertas_por_email = {}
+    por_oferta = destinatarios_por_oferta(nuevas, frecuencia)
+    for oferta in nuevas:
+        for email in por_oferta[oferta.id]:
+            ofertas_por_email.setdefault(email, []).append(oferta.id)
+
+    destinatarios = sorted([email, ids[:MAX_OFERTAS_RESUMEN]] for email, ids in ofertas_por_email.items())
+    tamano = getattr(settings, 'CORREOS_TAMANO_LOTE', 100)
+    with transaction.atomic():
+        for n, lote in enumerate(en_lotes(destinatarios, tamano)):
+            nombre = f"{ahora.isoformat()}:{n}"
+            encolar('empleos.correos.enviar_lote_resumen', clave=f"resumen:{frecuencia}:{nombre}",
+                    frecuencia=frecuencia, destinatarios=lote, lote=nombre)
+        EnvioResumen.objects.update_or_create(frecuencia=frecuencia, defaults={'hasta': ahora})
+    return len(destinatarios)
+
+
+def mensaje_resumen(frecuencia, email, ofertas):
+    periodo = 'de hoy' if frecuencia == 'DIA' else 'de la semana'
+    lineas = [
+        f"• {o.titulo}" + (f" - {o.empresa}" if o.empresa else "") + f" ({o.get_region_display()})\n  {settings.URL_SITIO}/oferta/{o.id}/"
+        for o in ofertas
+    ]
+    cuerpo = f"Hola,\n\nEstas son las ofertas {periodo} que coinciden con tus alertas:\n\n" + "\n".join(lineas) + "\n"
+    return EmailMessage(f"📬 {len(ofertas)} ofertas nuevas para ti", cuerpo, None, [email])
+
+
+def enviar_lote_resumen(frecuencia, destinatarios, lote=None):
+    from .models import OfertaLaboral
+    ids = {oferta_id for _email, ofertas in destinatarios for oferta_id in ofertas}
+    ofertas = OfertaLaboral.objects.filter(publicada=True).only('id', 'titulo', 'empresa', 'region').in_bulk(ids)
+    pendientes, mensajes = [], []
+    for email, ofertas_ids in destinatarios:
+        vigentes = [ofertas[i] for i in ofertas_ids if i in ofertas]
+        if vigentes:
+            pendientes.append([email, ofertas_ids])
+            mensajes.append(mensaje_resumen(frecuencia, email, vigentes))
+    al_avanzar = None
+    if lote is not None:
+        al_avanzar = avance_en_tarea(f"resumen:{frecuencia}:{lote}", {'frecuencia': frecuencia, 'lote': lote}, pendientes)
+    enviar_mensajes(mensajes, al_avanzar)
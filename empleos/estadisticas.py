@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .tareas import encolar
+
+# --- ESTADÍSTICAS PRECALCULADAS (ROLLUP DIARIO) ---
+# panel_admin y pagina_estadisticas leen la tabla EstadisticaDiaria (unas decenas de filas
+# por día) en vez de contar y agrupar las tablas base en cada carga.
+#   - Foto del día (FOTO): ofertas por región / tipo / estado y totales, tal como están
+#     al momento de calcular. La última foto de cada día queda como histórico.
+#   - Flujos del día (FLUJOS): ofertas publicadas, postulaciones, registros y visitas.
+# `manage.py actualizar_estadisticas` recalcula hoy y ayer (programar con cron); además,
+# los cambios relevantes (señales) encolan una actualización, como máximo una por minuto.
+
+FOTO = ('ofertas_region', 'ofertas_tipo', 'ofertas_estado', 'total')
+FLUJOS = 'nuevos'
+CLAVES_FLUJO = ('ofertas', 'postulaciones', 'usuarios', 'candidatos', 'visitas')
+INTERVALO_ACTUALIZACION = 60  # segundos entre recálculos disparados por señales
+DIAS_TENDENCIA = 30
+
+
+def _por_dia(queryset, campo, desde, hasta, agregado=None):
+    """[(día, total)] entre `desde` y `hasta` (inclusive), agrupando por día local."""
+    if isinstance(queryset.model._meta.get_field(campo), models.DateTimeField):
+        # Rango de fechas con zona horaria (usa índices) y agrupación por día en hora de Chile
+        inicio = timezone.make_aware(datetime.combine(desde, datetime.min.time()))
+        fin = timezone.make_aware(datetime.combine(hasta + timedelta(days=1), datetime.min.time()))
+        queryset = queryset.filter(**{f'{campo}__gte': inicio, f'{campo}__lt': fin}).annotate(dia=TruncDate(campo))
+    else:
+        queryset = queryset.filter(**{f'{campo}__range': (desde, hasta)}).annotate(dia=F(campo))
+    return queryset.order_by().values('dia').annotate(total=agregado or Count('id')).values_list('dia', 'total')
+
+
+def calcular_foto():
+    from .models import Candidato, OfertaLaboral, PerfilEmpresa
+    filas = []
+    por_region, por_tipo, estados = {}, {}, {'publicadas': 0, 'pendientes': 0}
+    # Un solo GROUP BY sobre ofertas alimenta las tres dimensiones
+    for region, tipo, publicada, total in (
+        OfertaLaboral.objects.order_by().values_list('region', 'tipo', 'publicada').annotate(total=Count('id'))
+    ):
+        estados['publicadas' if publicada else 'pendientes'] += total
+        if publicada:
+            por_region[region] = por_region.get(region, 0) + total
+            por_tipo[tipo] = por_tipo.get(tipo, 0) + total
+    filas += [('ofertas_region', region, total) for region, total in por_region.items()]
+    filas += [('ofertas_tipo', tipo, total) for tipo, total in por_tipo.items()]
+    filas += [('ofertas_estado', estado, total) for estado, total in estados.items()]
+    filas += [
+        ('total', 'ofertas', sum(estados.values())),
+        ('total', 'candidatos', Candidato.objects.count()),
+        ('total', 'usuarios', User.objects.count()),
+        ('total', 'empresas', PerfilEmpresa.objects.count()),
+    ]
+    return filas
+
+
+def calcular_flujos(desde, hasta):
+    from .models import Candidato, OfertaLaboral, Postulacion, VisitaDiaria
+    fuentes = {
+        'ofertas': _por_dia(OfertaLaboral.objects.filter(publicada=True), 'fecha_publicacion', desde, hasta),
+        'postulaciones': _por_dia(Postulacion.objects.all(), 'fecha', desde, hasta),
+        'usuarios': _por_dia(User.objects.all(), 'date_joined', desde, hasta),
+        'candidatos': _por_dia(Candidato.objects.all(), 'fecha_creacion', desde, hasta),
+        'visitas': _por_dia(VisitaDiaria.objects.all(), 'fecha', desde, hasta, Sum('visitas')),
+    }
+    return [(dia, FLUJOS, clave, total) for clave, filas in fuentes.items() for dia, total in filas]
+
+
+def actualizar(dias=2):
+    """Recalcula la foto de hoy y los flujos de los últimos `dias` días (idempotente)."""
+    from .models import EstadisticaDiaria
+    hoy = timezone.localdate()
+    desde = hoy - timedelta(days=max(dias, 1) - 1)
+    foto = calcular_foto()
+    flujos = calcular_flujos(desde, hoy)
+    with transaction.atomic():
+        EstadisticaDiaria.objects.filter(fecha=hoy, metrica__in=FOTO).delete()
+        EstadisticaDiaria.objects.filter(fecha__range=(desde, hoy), metrica=FLUJOS).delete()
+        EstadisticaDiaria.objects.bulk_create(
+            [EstadisticaDiaria(fecha=hoy, metrica=metrica, clave=clave, valor=valor) for metrica, clave, valor in foto]
+            + [EstadisticaDiaria(fecha=dia, metrica=metrica, clave=clave, valor=valor) for dia, metrica, clave, valor in flujos]
+        )
+    cache.delete('estadisticas:pendiente')
+    return len(foto) + len(flujos)
+
+
+def programar_actualizacion():
+    # Muchas escrituras seguidas producen una sola tarea por intervalo
+    if cache.add('estadisticas:pendiente', 1, INTERVALO_ACTUALIZACION):
+        ventana = int(timezone.now().timestamp()) // INTERVALO_ACTUALIZACION
+        encolar('empleos.estadisticas.actualizar', clave=f"estadisticas:{ventana}", retraso=INTERVALO_ACTUALIZACION)
+
+
+def foto_actual():
+    """{metrica: {clave: valor}} de la última foto disponible (la calcula si no hay ninguna)."""
+    from .models import EstadisticaDiaria
+    ultima = EstadisticaDiaria.objects.filter(metrica='total').aggregate(fecha=Max('fecha'))['fecha']
+    if ultima is None:
+        actualizar()
+        ultima = timezone.localdate()
+    foto = {metrica: {} for metrica in FOTO}
+    for metrica, clave, valor in EstadisticaDiaria.objects.filter(fecha=ultima, metrica__in=FOTO).values_list('metrica', 'clave', 'valor'):
+        foto[metrica][clave] = valor
+    return foto
+
+
+def tendencia(dias=DIAS_TENDENCIA):
+    """Serie diaria de flujos: (fechas, {clave: [valores]}), con ceros en los días sin datos."""
+    from .models import EstadisticaDiaria
+    hoy = timezone.localdate()
+    fechas = [hoy - timedelta(days=n) for n in range(dias - 1, -1, -1)]
+    series = {clave: dict.fromkeys(fechas, 0) for clave in CLAVES_FLUJO}
+    filas = EstadisticaDiaria.objects.filter(metrica=FLUJOS, fecha__gte=fechas[0]).values_list('fecha', 'clave', 'valor')
+    for fecha, clave, valor in filas:
+        if clave in series:
+            series[clave][fecha] = valor
+    return fechas, {clave: list(valores.values()) for clave, valores in series.items()}
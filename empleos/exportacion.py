@@ -0,0 +1,169 @@
+import csv
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# --- EXPORTACIÓN EN STREAMING (CSV / XLSX) ---
+# Las filas salen de un values_list(...).iterator(chunk_size=...) con los JOIN ya hechos,
+# y la respuesta se escribe a medida que se leen: la memoria no depende del número de
+# postulantes. El XLSX se arma a mano (zip + XML de SpreadsheetML) para poder escribirlo
+# en streaming sin dependencias extra. El ZIP de CVs usa la misma técnica con archivos.
+
+TAMANO_BLOQUE = 1000
+TAMANO_ENVIO = 64 * 1024  # bytes acumulados antes de mandar un trozo al cliente
+
+COLUMNAS_POSTULACION = [
+    ('Oferta', 'oferta__titulo'),
+    ('Nombre', 'candidato__nombre'),
+    ('Email', 'candidato__email'),
+    ('Teléfono', 'candidato__telefono'),
+    ('Titulo', 'candidato__titular'),
+    ('Estado', 'estado'),
+    ('Fecha', 'fecha'),
+]
+
+
+def filas_postulaciones(postulaciones, con_oferta=True):
+    """Genera el encabezado y luego una lista por postulación, en una sola consulta con JOIN."""
+    from .models import Postulacion
+    columnas = COLUMNAS_POSTULACION if con_oferta else COLUMNAS_POSTULACION[1:]
+    estados = dict(Postulacion.ESTADOS)
+    yield [titulo for titulo, _ in columnas]
+    campos = [campo for _, campo in columnas]
+    i_estado, i_fecha = campos.index('estado'), campos.index('fecha')
+    for fila in postulaciones.order_by('oferta_id', '-fecha').values_list(*campos).iterator(chunk_size=TAMANO_BLOQUE):
+        fila = list(fila)
+        fila[i_estado] = estados.get(fila[i_estado], fila[i_estado])
+        fila[i_fecha] = timezone.localtime(fila[i_fecha]).strftime("%d-%m-%Y")
+        yield fila
+
+
+class _Eco:
+    # Pseudo-archivo para csv.writer: devuelve lo escrito en vez de guardarlo
+    def write(self, valor):
+        return valor
+
+
+def csv_en_streaming(filas):
+    escritor = csv.writer(_Eco())
+    yield '\ufeff'  # BOM: Excel reconoce las tildes
+    for fila in filas:
+        yield escritor.writerow(fila)
+
+
+class _Salida:
+    # Destino no "seekable" para ZipFile: acumula bytes hasta que el generador los vacía
+    def __init__(self):
+        self.trozos = []
+        self.pendiente = 0
+
+    def write(self, datos):
+        self.trozos.append(bytes(datos))
+        self.pendiente += len(datos)
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.trozos)
+        self.trozos, self.pendiente = [], 0
+        return datos
+
+
+_CARACTERES_INVALIDOS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_ESTATICOS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _celda(valor):
+    if valor is None:
+        return '<c/>'
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return f'<c><v>{valor}</v></c>'
+    texto = escape(_CARACTERES_INVALIDOS.sub('', str(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def xlsx_en_streaming(filas, hoja='Postulantes'):
+    salida = _Salida()
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED) as archivo:
+        for nombre, contenido in _XLSX_ESTATICOS.items():
+            archivo.writestr(nombre, contenido)
+        archivo.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(hoja[:31])}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        yield salida.vaciar()
+
+        with archivo.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as xml:
+            xml.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            for fila in filas:
+                xml.write(('<row>' + ''.join(_celda(v) for v in fila) + '</row>').encode('utf-8'))
+                if salida.pendiente >= TAMANO_ENVIO:
+                    yield salida.vaciar()
+            xml.write(b'</sheetData></worksheet>')
+    yield salida.vaciar()
+
+
+def zip_en_streaming(archivos):
+    """Escribe un ZIP con los (nombre, contenido) recibidos, donde contenido son bytes o una
+    función que abre el archivo. Cada archivo se copia por trozos: nunca está entero en memoria."""
+    salida = _Salida()
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archivo:
+        for nombre, contenido in archivos:
+            with archivo.open(nombre, 'w', force_zip64=True) as destino:
+                if isinstance(contenido, bytes):
+                    destino.write(contenido)
+                else:
+                    with contenido() as origen:
+                        while trozo := origen.read(TAMANO_ENVIO):
+                            destino.write(trozo)
+                            if salida.pendiente >= TAMANO_ENVIO:
+                                yield salida.vaciar()
+            if salida.pendiente >= TAMANO_ENVIO:
+                yield salida.vaciar()
+    yield salida.vaciar()
+
+
+FORMATOS = {
+    'csv': (csv_en_streaming, 'text/csv; charset=utf-8', 'csv'),
+    'xlsx': (xlsx_en_streaming, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+def respuesta_exportacion(filas, nombre, formato='csv'):
+    generador, content_type, extension = FORMATOS.get(formato, FORMATOS['csv'])
+    respuesta = StreamingHttpResponse(generador(filas), content_type=content_type)
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre}.{extension}"'
+    return respuesta
@@ -0,0 +1,123 @@
+import json
+from datetime import datetime, timezone as dt_timezone
+from xml.sax.saxutils import escape
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition, require_GET
+
+from .cache import estado_consulta, huella_estado
+from .models import OfertaLaboral
+
+# --- FEED INCREMENTAL DE OFERTAS (Atom / JSON Lines) ---
+# Los agregadores piden ?since=<fecha ISO o epoch> y reciben solo las ofertas modificadas
+# después, en orden de modificación. La respuesta se genera en streaming sobre un
+# iterator(chunk_size=...), así que la memoria no crece con el número de ofertas.
+# En JSON Lines, las ofertas despublicadas desde `since` salen como {"id": .., "estado": "retirada"}.
+
+TAMANO_BLOQUE = 500
+CAMPOS = (
+    'id', 'titulo', 'empresa', 'tipo', 'modalidad', 'region', 'experiencia', 'sueldo', 'etiquetas',
+    'descripcion', 'fecha_publicacion', 'fecha_modificacion', 'fecha_cierre', 'publicada',
+)
+
+
+def _leer_since(valor):
+    if not valor:
+        return None
+    if valor.replace('.', '', 1).isdigit():
+        try:
+            return datetime.fromtimestamp(float(valor), tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):  # fuera del rango de fechas
+            raise ValueError(valor)
+    fecha = parse_datetime(valor.replace(' ', '+'))  # el '+' de la zona horaria llega como espacio
+    if fecha is None:
+        raise ValueError(valor)
+    return fecha if timezone.is_aware(fecha) else timezone.make_aware(fecha)
+
+
+def _cambios(since, incluir_retiradas):
+    ofertas = OfertaLaboral.objects.all() if incluir_retiradas and since else OfertaLaboral.objects.filter(publicada=True)
+    if since:
+        ofertas = ofertas.filter(fecha_modificacion__gt=since)
+    return ofertas.order_by('fecha_modificacion', 'id').values(*CAMPOS).iterator(chunk_size=TAMANO_BLOQUE)
+
+
+def _estado(request):
+    # De la base de datos (no de la caché por proceso); incluye las retiradas, que salen en JSON Lines
+    if not hasattr(request, '_estado_feed'):
+        request._estado_feed = estado_consulta(OfertaLaboral.objects.all())
+    return request._estado_feed
+
+
+def _etag(request, *args, **kwargs):
+    return huella_estado(request, _estado(request))
+
+
+def _ultima_modificacion(request, *args, **kwargs):
+    return _estado(request)[0]
+
+
+def _respuesta(request, generador, content_type):
+    try:
+        since = _leer_since(request.GET.get('since'))
+    except ValueError:
+        return HttpResponseBadRequest("Parámetro 'since' inválido: use ISO 8601 o segundos desde epoch.")
+    respuesta = StreamingHttpResponse(generador(request, since), content_type=content_type)
+    respuesta['Cache-Control'] = 'public, max-age=300'
+    return respuesta
+
+
+def _lineas_jsonl(request, since):
+    for oferta in _cambios(since, incluir_retiradas=True):
+        if not oferta['publicada']:
+            fila = {'id': oferta['id'], 'estado': 'retirada', 'fecha_modificacion': oferta['fecha_modificacion']}
+        else:
+            fila = {**oferta, 'estado': 'publicada', 'url': request.build_absolute_uri(reverse('detalle', args=[oferta['id']]))}
+            del fila['publicada']
+        yield json.dumps(fila, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _atributo(texto):
+    return escape(texto, {'"': '&quot;'})
+
+
+def _fecha_atom(fecha):
+    return fecha.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _entradas_atom(request, since):
+    url_sitio = request.build_absolute_uri('/')
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="es-cl">\n'
+    yield f'<title>Red Laboral Chile - Ofertas de empleo</title>\n<id>{escape(request.build_absolute_uri(request.path))}</id>\n'
+    yield f'<link href="{_atributo(url_sitio)}"/>\n<link rel="self" href="{_atributo(request.build_absolute_uri())}"/>\n'
+    yield f'<updated>{_fecha_atom(_ultima_modificacion(request) or timezone.now())}</updated>\n'
+    for oferta in _cambios(since, incluir_retiradas=False):
+        url = _atributo(request.build_absolute_uri(reverse('detalle', args=[oferta['id']])))
+        yield (
+            '<entry>\n'
+            f'<title>{escape(oferta["titulo"] or "")}</title>\n'
+            f'<id>{url}</id>\n<link href="{url}"/>\n'
+            f'<published>{_fecha_atom(oferta["fecha_publicacion"])}</published>\n'
+            f'<updated>{_fecha_atom(oferta["fecha_modificacion"])}</updated>\n'
+            f'<author><name>{escape(oferta["empresa"] or "Confidencial")}</name></author>\n'
+            f'<category term="{_atributo(oferta["region"] or "")}"/>\n'
+            f'<content type="text">{escape(oferta["descripcion"] or "")}</content>\n'
+            '</entry>\n'
+        )
+    yield '</feed>\n'
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_ultima_modificacion)
+def feed_jsonl(request):
+    return _respuesta(request, _lineas_jsonl, 'application/x-ndjson; charset=utf-8')
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_ultima_modificacion)
+def feed_atom(request):
+    return _respuesta(request, _entradas_atom, 'application/atom+xml; charset=utf-8')
@@ -0,0 +1,155 @@
+import io
+import os
+import uuid
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from PIL import Image, ImageOps
+
+from .tareas import encolar
+
+# --- PROCESAMIENTO DE IMÁGENES SUBIDAS ---
+# Las funciones renombrar_* dan a cada archivo un nombre único, así que el nombre sirve de
+# clave de la tarea: cada imagen se procesa una sola vez, en el worker, después de guardarse.
+#   1. El original se reescribe sin metadatos (EXIF/GPS) y con el lado mayor en MAX_ORIGINAL.
+#      Los GIF y WebP animados quedan tal cual: reescribirlos guardaría solo el primer cuadro.
+#   2. Se generan variantes en miniaturas/<nombre sin extensión>-<ancho>.<formato> para cada
+#      ancho de ANCHOS menor que el original, en WebP (y AVIF si Pillow lo soporta).
+# Las variantes generadas quedan anotadas en la caché; el tag {% imagen %} (templatetags)
+# arma el srcset con ellas y, mientras no existan, muestra el original.
+
+CAMPOS_IMAGEN = {
+    'PerfilEmpresa': ('logo', 'banner'),
+    'OfertaLaboral': ('imagen',),
+    'Candidato': ('foto',),
+    'Servicio': ('imagen',),
+    'Noticia': ('imagen',),
+}
+ANCHOS = (160, 320, 640, 1280)
+MAX_ORIGINAL = 2000
+CALIDAD = 80
+DIRECTORIO = 'miniaturas'
+Image.init()
+FORMATOS = ('avif', 'webp') if 'AVIF' in Image.SAVE else ('webp',)  # AVIF desde Pillow 11.2, en orden de preferencia
+TIPOS_MIME = {'avif': 'image/avif', 'webp': 'image/webp'}
+FORMATOS_ORIGINAL = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True}, 'PNG': {'optimize': True},
+    'WEBP': {'quality': 85}, 'GIF': {'optimize': True},
+}
+
+
+def _clave(nombre):
+    return f"imagenes:{nombre}"
+
+
+def nombre_variante(nombre, ancho, formato):
+    return f"{DIRECTORIO}/{os.path.splitext(nombre)[0]}-{ancho}.{formato}"
+
+
+def _guardar(nombre, datos):
+    """Escribe `datos` en `nombre` sin que el archivo anterior falte en ningún momento.
+
+    En disco se escribe un temporal junto al destino y se renombra encima (os.replace es
+    atómico). Los demás storages (S3, etc.) eligen otro nombre si el pedido está ocupado:
+    se devuelve el nombre guardado y el llamador decide qué hacer con el anterior.
+    """
+    if not isinstance(default_storage, FileSystemStorage):
+        return default_storage.save(nombre, ContentFile(datos))
+    ruta = default_storage.path(nombre)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temporal, 'xb') as archivo:
+            archivo.write(datos)
+        if default_storage.file_permissions_mode is not None:
+            os.chmod(temporal, default_storage.file_permissions_mode)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return nombre
+
+
+def _codificar(imagen, formato, **opciones):
+    salida = io.BytesIO()
+    imagen.save(salida, format=formato, **opciones)
+    return salida.getvalue()
+
+
+def _limpiar_original(nombre, imagen, animada=False):
+    """Reescribe el original sin metadatos y con tamaño acotado. Devuelve el nombre guardado."""
+    formato = imagen.format
+    imagen = ImageOps.exif_transpose(imagen)  # aplica la rotación antes de perder el EXIF
+    imagen.thumbnail((MAX_ORIGINAL, MAX_ORIGINAL))
+    if formato not in FORMATOS_ORIGINAL or animada:
+        return nombre, imagen  # TIFF, BMP, animadas, etc.: se dejan tal cual
+    if formato == 'JPEG' and imagen.mode not in ('RGB', 'L'):
+        imagen = imagen.convert('RGB')
+    # Pillow solo escribe EXIF/XMP si se le pasan al guardar: basta con no arrastrar `info`
+    imagen.info = {k: v for k, v in imagen.info.items() if k in ('icc_profile', 'transparency')}
+    opciones = dict(FORMATOS_ORIGINAL[formato])
+    if imagen.info.get('icc_profile'):
+        opciones['icc_profile'] = imagen.info['icc_profile']  # el perfil de color sí se conserva
+    return _guardar(nombre, _codificar(imagen, formato, **opciones)), imagen
+
+
+def procesar_imagen(nombre, modelo=None, campo=None, pk=None):
+    """Tarea del worker: limpia el original y genera las variantes. Devuelve las variantes."""
+    if not default_storage.exists(nombre):
+        return []
+    with default_storage.open(nombre, 'rb') as archivo:
+        imagen = Image.open(archivo)
+        animada = getattr(imagen, 'is_animated', False)  # recorre los cuadros: con el archivo abierto
+        imagen.load()
+    guardado, imagen = _limpiar_original(nombre, imagen, animada)
+    if guardado != nombre:
+        if modelo:
+            # El storage no respetó el nombre: se apunta el registro al nuevo sin disparar señales
+            # y recién entonces se borra el anterior
+            from django.apps import apps
+            apps.get_model('empleos', modelo).objects.filter(pk=pk).update(**{campo: guardado})
+            default_storage.delete(nombre)
+            nombre = guardado
+        else:
+            default_storage.delete(guardado)  # sin registro que apuntar, el original queda como estaba
+
+    if imagen.mode not in ('RGB', 'RGBA'):
+        imagen = imagen.convert('RGBA' if 'transparency' in imagen.info or imagen.mode in ('LA', 'PA', 'P') else 'RGB')
+    # Sin agrandar: una imagen más chica que ANCHOS[0] queda con su tamaño bajo ese nombre
+    anchos = [ancho for ancho in ANCHOS if ancho < imagen.width] or [ANCHOS[0]]
+    variantes = []
+    for ancho in anchos:
+        real = min(ancho, imagen.width)
+        reducida = imagen.resize((real, max(1, round(imagen.height * real / imagen.width))), Image.LANCZOS)
+        for formato in FORMATOS:
+            _guardar(nombre_variante(nombre, ancho, formato), _codificar(reducida, formato.upper(), quality=CALIDAD))
+            variantes.append((formato, ancho))
+    cache.set(_clave(nombre), variantes, None)
+    return variantes
+
+
+def variantes(nombre):
+    """[(formato, ancho)] ya generadas para la imagen (consulta el storage una vez y cachea)."""
+    encontradas = cache.get(_clave(nombre))
+    if encontradas is None:
+        encontradas = [
+            (formato, ancho) for ancho in ANCHOS for formato in FORMATOS
+            if default_storage.exists(nombre_variante(nombre, ancho, formato))
+        ]
+        # Si aún no hay variantes se vuelve a mirar pronto (el worker puede no compartir la caché)
+        cache.set(_clave(nombre), encontradas, 300 if not encontradas else None)
+    return encontradas
+
+
+def encolar_imagenes(instancia):
+    """Encola el procesamiento de las imágenes de la instancia que aún no se procesaron."""
+    modelo = type(instancia).__name__
+    for campo in CAMPOS_IMAGEN.get(modelo, ()):
+        archivo = getattr(instancia, campo)
+        if archivo and archivo.name:
+            encolar(
+                'empleos.imagenes.procesar_imagen', clave=f"imagen:{archivo.name}",
+                nombre=archivo.name, modelo=modelo, campo=campo, pk=instancia.pk,
+            )
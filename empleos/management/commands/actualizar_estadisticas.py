@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from empleos.estadisticas import actualizar
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las estadísticas diarias de los paneles (foto de hoy + flujos). Programar con cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=2, help='Días hacia atrás a recalcular (p. ej. 365 para reconstruir el histórico)')
+
+    def handle(self, *args, **options):
+        filas = actualizar(options['dias'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Estadísticas actualizadas ({filas} filas, {options['dias']} días)."))
@@ -0,0 +1,51 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from empleos.benchmark import ESCENARIOS, ejecutar, regresiones
+
+
+class Command(BaseCommand):
+    help = 'Mide p50/p95 y consultas SQL de las vistas calientes. Con --comparar falla ante regresiones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('escenarios', nargs='*', help=f"Por defecto todos: {', '.join(e.nombre for e in ESCENARIOS)}")
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--calentamiento', type=int, default=2)
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--guardar', metavar='ARCHIVO', help='Escribe los resultados en JSON (línea base)')
+        parser.add_argument('--comparar', metavar='ARCHIVO', help='Línea base JSON contra la que comparar')
+        parser.add_argument('--tolerancia', type=float, default=0.25, help='Aumento de p95 tolerado (0.25 = 25%%)')
+        parser.add_argument('--forzar', action='store_true', help='Permite correrlo con DEBUG=False')
+
+    def handle(self, *args, **options):
+        # Publica y postula de verdad (dentro de transacciones que se deshacen) y encola tareas
+        if not settings.DEBUG and not options['forzar']:
+            raise CommandError("DEBUG=False: ¿es producción? Use --forzar si de verdad quiere correr el benchmark.")
+        desconocidos = set(options['escenarios']) - {e.nombre for e in ESCENARIOS}
+        if desconocidos:
+            raise CommandError(f"Escenarios desconocidos: {', '.join(sorted(desconocidos))}")
+        try:
+            resultados = ejecutar(options['escenarios'], options['repeticiones'], options['calentamiento'], options['semilla'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{'escenario':<26}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'consultas':>11}")
+        for nombre, r in resultados.items():
+            consultas = str(r['consultas']) if r['consultas'] == r['consultas_min'] else f"{r['consultas_min']}-{r['consultas']}"
+            self.stdout.write(f"{nombre:<26}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}{consultas:>11}")
+
+        if options['guardar']:
+            with open(options['guardar'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2)
+            self.stdout.write(f"💾 Resultados guardados en {options['guardar']}")
+
+        base = None
+        if options['comparar']:
+            with open(options['comparar'], encoding='utf-8') as archivo:
+                base = json.load(archivo)
+        problemas = regresiones(resultados, base, options['tolerancia'])
+        if problemas:
+            raise CommandError("Regresiones detectadas:\n  " + "\n  ".join(problemas))
+        self.stdout.write(self.style.SUCCESS("✅ Sin regresiones."))
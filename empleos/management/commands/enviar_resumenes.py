@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from empleos.correos import generar_resumenes
+from empleos.models import AlertaEmpleo
+
+FRECUENCIAS = {'diaria': AlertaEmpleo.DIARIA, 'semanal': AlertaEmpleo.SEMANAL}
+
+
+class Command(BaseCommand):
+    help = 'Encola los resúmenes de alertas (programar en cron: diaria cada día, semanal cada lunes).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('frecuencia', choices=FRECUENCIAS.keys())
+
+    def handle(self, *args, **options):
+        total = generar_resumenes(FRECUENCIAS[options['frecuencia']])
+        self.stdout.write(self.style.SUCCESS(f"✅ Resumen {options['frecuencia']} encolado para {total} correos."))
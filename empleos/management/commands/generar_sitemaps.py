@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from empleos.sitemaps import directorio_sitemaps, generar_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Genera el índice y los sitemaps por sección (XML + .gz) en SITEMAPS_DIR. Programar con cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directorio', help='Por defecto settings.SITEMAPS_DIR')
+
+    def handle(self, *args, **options):
+        directorio = options['directorio'] or directorio_sitemaps()
+        resumen = generar_sitemaps(directorio)
+        detalle = ', '.join(f'{seccion}: {archivos}' for seccion, archivos in resumen.items())
+        self.stdout.write(self.style.SUCCESS(f"✅ Sitemaps generados en {directorio} ({detalle})."))
@@ -0,0 +1,24 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from empleos.models import Candidato
+from empleos.pdfs import CAMPOS_CV, encolar_cv, ruta_cv
+
+
+class Command(BaseCommand):
+    help = 'Encola el render de los CV en PDF que aún no están en caché (lo procesa el worker).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--todos', action='store_true', help='Incluye candidatos no publicados')
+
+    def handle(self, *args, **options):
+        candidatos = Candidato.objects.only('id', *CAMPOS_CV)
+        if not options['todos']:
+            candidatos = candidatos.filter(publicado=True)
+        encolados = 0
+        for candidato in candidatos.iterator(chunk_size=1000):
+            if not os.path.exists(ruta_cv(candidato)):
+                encolar_cv(candidato)
+                encolados += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ {encolados} CV encolados para generar."))
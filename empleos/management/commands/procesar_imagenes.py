@@ -0,0 +1,21 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from empleos.imagenes import CAMPOS_IMAGEN, encolar_imagenes
+
+
+class Command(BaseCommand):
+    help = 'Encola el procesamiento (sin metadatos + miniaturas WebP) de las imágenes ya subidas.'
+
+    def handle(self, *args, **options):
+        total = 0
+        for modelo, campos in CAMPOS_IMAGEN.items():
+            con_imagen = Q()
+            for campo in campos:
+                con_imagen |= Q(**{f'{campo}__isnull': False}) & ~Q(**{campo: ''})
+            registros = apps.get_model('empleos', modelo).objects.filter(con_imagen).only('pk', *campos)
+            for instancia in registros.iterator(chunk_size=500):
+                encolar_imagenes(instancia)  # las ya procesadas tienen su tarea y se omiten
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ Imágenes de {total} registros encoladas."))
@@ -0,0 +1,40 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from empleos.tareas import VISIBILIDAD, ejecutar, reclamar
+
+
+def _ejecutar_en_hilo(tarea):
+    try:
+        return ejecutar(tarea)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Worker de la cola de tareas (correos, alertas, etc.).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=4, help='Tareas ejecutándose en paralelo como máximo.')
+        parser.add_argument('--visibilidad', type=int, default=VISIBILIDAD, help='Segundos antes de que otro worker pueda retomar una tarea.')
+        parser.add_argument('--espera', type=float, default=2.0, help='Segundos entre consultas cuando la cola está vacía.')
+        parser.add_argument('--una-vez', action='store_true', help='Vacía la cola y termina (útil desde cron).')
+
+    def handle(self, *args, **options):
+        hilos = max(1, options['hilos'])
+        self.stdout.write(f"👷 Worker iniciado con {hilos} hilos.")
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            while True:
+                tareas = reclamar(limite=hilos, visibilidad=options['visibilidad'])
+                close_old_connections()
+                if not tareas:
+                    if options['una_vez']:
+                        break
+                    time.sleep(options['espera'])
+                    continue
+                resultados = list(pool.map(_ejecutar_en_hilo, tareas))
+                for tarea, ok in zip(tareas, resultados):
+                    self.stdout.write(f"{'✅' if ok else '⚠️'} {tarea.funcion} #{tarea.id}")
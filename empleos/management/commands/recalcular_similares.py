@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from empleos.models import OfertaLaboral
+from empleos.recomendaciones import guardar_similares, indexar_rasgos, mejores, puntajes_candidatos
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero los rasgos y las ofertas similares precalculadas.'
+
+    def handle(self, *args, **options):
+        ofertas = OfertaLaboral.objects.only('id', 'titulo', 'etiquetas', 'region', 'tipo', 'experiencia', 'publicada')
+        for oferta in ofertas.iterator(chunk_size=1000):
+            indexar_rasgos(oferta)
+        total = 0
+        for oferta in ofertas.filter(publicada=True).iterator(chunk_size=1000):
+            guardar_similares(oferta.id, mejores(puntajes_candidatos(oferta)))
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ Similares recalculadas para {total} ofertas."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from empleos.busqueda import construir_documento, eliminar_indices_busqueda, instalar_indices_busqueda
+from empleos.models import OfertaLaboral
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el documento de búsqueda de todas las ofertas y reconstruye el índice de texto.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500)
+
+    def handle(self, *args, **options):
+        lote = []
+        total = 0
+        for oferta in OfertaLaboral.objects.only('id', 'titulo', 'empresa', 'etiquetas', 'descripcion').iterator(chunk_size=options['lote']):
+            oferta.documento_busqueda = construir_documento(oferta)
+            lote.append(oferta)
+            if len(lote) >= options['lote']:
+                OfertaLaboral.objects.bulk_update(lote, ['documento_busqueda'])
+                total += len(lote)
+                lote = []
+        if lote:
+            OfertaLaboral.objects.bulk_update(lote, ['documento_busqueda'])
+            total += len(lote)
+
+        eliminar_indices_busqueda(connection, ['empleos_ofertalaboral'])
+        instalar_indices_busqueda(connection, ['empleos_ofertalaboral'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {total} ofertas reindexadas.'))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from empleos.sinteticos import ESCALAS, eliminar_sinteticos, sembrar
+
+
+class Command(BaseCommand):
+    help = 'Carga datos sintéticos (empresas, ofertas, candidatos, postulaciones, alertas) para pruebas de carga.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', choices=ESCALAS, default='pequena', help='Cantidades base; cada una se puede sobrescribir')
+        for tipo in ('empresas', 'ofertas', 'candidatos', 'postulaciones', 'alertas'):
+            parser.add_argument(f'--{tipo}', type=int)
+        parser.add_argument('--lote', type=int, default=5000)
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--limpiar', action='store_true', help='Borra los datos sintéticos existentes antes de cargar')
+        parser.add_argument('--solo-limpiar', action='store_true')
+        parser.add_argument('--forzar', action='store_true', help='Permite correrlo con DEBUG=False')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['forzar']:
+            raise CommandError("DEBUG=False: ¿es producción? Use --forzar si de verdad quiere cargar datos sintéticos.")
+
+        if options['limpiar'] or options['solo_limpiar']:
+            borrados = eliminar_sinteticos()
+            self.stdout.write(f"🧹 Borrados: {', '.join(f'{k}: {v}' for k, v in borrados.items())}")
+            if options['solo_limpiar']:
+                return
+
+        cantidades = {tipo: options[tipo] if options[tipo] is not None else valor for tipo, valor in ESCALAS[options['escala']].items()}
+        resumen = sembrar(
+            **cantidades, lote=options['lote'], semilla=options['semilla'],
+            avisar=lambda mensaje: self.stdout.write(f"  {mensaje}") if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ Datos sintéticos cargados: {', '.join(f'{k}: {v}' for k, v in resumen.items())}."))
+        self.stdout.write("Para las recomendaciones de ofertas similares corra `manage.py recalcular_similares`.")
@@ -0,0 +1,194 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Mod
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_GET
+
+from .cache import estado_consulta, huella_estado
+from .models import REGIONES_CHILE, TIPO_TRABAJO, OfertaLaboral
+
+# --- DATOS DEL MAPA DE EMPLEOS (GeoJSON AGRUPADO) ---
+# Las ofertas no tienen coordenadas propias, solo región. Cada una se ubica en una rejilla de
+# REJILLA×REJILLA celdas alrededor del centro de su región: la celda es id % CELDAS y la
+# posición dentro de la celda también sale del id, así que un aviso cae siempre en el mismo
+# punto (antes era random.uniform en cada carga).
+# El conteo por (región, celda) es un GROUP BY de a lo más 14×64 filas, cacheado bajo el estado
+# de las ofertas del mapa (Max(fecha_modificacion), Count; ver empleos.cache.estado_consulta);
+# con él se arman los grupos de cualquier zoom y bbox sin volver a la base de datos. Solo desde
+# ZOOM_PUNTOS, y si en lo visible hay a lo más MAX_PUNTOS ofertas, se leen las ofertas
+# individuales (values(), acotado a las celdas visibles).
+# El mismo estado da el ETag y el Last-Modified: no dependen de la versión en la caché del
+# proceso, así que un worker que no vio la invalidación tampoco responde 304 con datos viejos.
+
+COORDENADAS_REGIONES = {
+    'AP': (-18.4783, -70.3126), 'TA': (-20.2133, -70.1503), 'AN': (-23.6509, -70.3975), 'AT': (-27.3668, -70.3323),
+    'CO': (-29.9533, -71.3436), 'VA': (-33.0472, -71.6127), 'RM': (-33.4489, -70.6693), 'BI': (-36.8201, -73.0444),
+    'AR': (-38.7359, -72.5904), 'LS': (-41.4689, -72.9411), 'AI': (-45.5712, -72.0685), 'MA': (-53.1638, -70.9171),
+    'NB': (-36.6063, -72.1023), 'LR': (-39.8142, -73.2459),
+}
+NOMBRES_REGIONES = dict(REGIONES_CHILE)
+TIPOS = dict(TIPO_TRABAJO)
+
+REJILLA = 8
+CELDAS = REJILLA * REJILLA
+RADIO = 0.05  # grados alrededor del centro de la región
+LADO = 2 * RADIO / REJILLA
+ZOOM_DETALLE = 8  # desde aquí cada región se divide en celdas
+ZOOM_PUNTOS = 12  # desde aquí se devuelven ofertas individuales
+MAX_PUNTOS = 500
+SEGUNDOS_CONTEO = 3600
+
+
+def _posicion(region, cx, cy, fx=0.5, fy=0.5):
+    """(lng, lat) de un punto de la celda (cx, cy); fx/fy en [0, 1) dentro de la celda."""
+    lat, lng = COORDENADAS_REGIONES[region]
+    return lng - RADIO + (cx + fx) * LADO, lat - RADIO + (cy + fy) * LADO
+
+
+def posicion_oferta(oferta_id, region):
+    celda, resto = oferta_id % CELDAS, oferta_id // CELDAS
+    # Secuencia R2: ids consecutivos de una misma celda quedan bien repartidos
+    return _posicion(region, celda % REJILLA, celda // REJILLA, (resto * 0.7548776662) % 1, (resto * 0.5698402910) % 1)
+
+
+def ofertas_mapa():
+    """Ofertas publicadas con región conocida: las únicas que aparecen en el mapa."""
+    return OfertaLaboral.objects.filter(publicada=True, region__in=COORDENADAS_REGIONES)
+
+
+def conteo_celdas(estado=None):
+    """[(región, celda, total)] de las ofertas del mapa. `estado` es estado_consulta(ofertas_mapa())."""
+    ultima, total = estado or estado_consulta(ofertas_mapa())
+    clave = f"mapa:celdas:{ultima.isoformat() if ultima else ''}:{total}"
+    filas = cache.get(clave)
+    if filas is None:
+        filas = list(
+            ofertas_mapa().annotate(celda=Mod('id', CELDAS))
+            .order_by().values_list('region', 'celda').annotate(total=Count('id'))
+        )
+        cache.set(clave, filas, SEGUNDOS_CONTEO)
+    return filas
+
+
+def _en_bbox(bbox, lng, lat):
+    return bbox is None or (bbox[0] <= lng <= bbox[2] and bbox[1] <= lat <= bbox[3])
+
+
+def _celda_visible(bbox, region, celda):
+    if bbox is None:
+        return True
+    oeste, sur = _posicion(region, celda % REJILLA, celda // REJILLA, 0, 0)
+    return oeste <= bbox[2] and oeste + LADO >= bbox[0] and sur <= bbox[3] and sur + LADO >= bbox[1]
+
+
+def _divisiones(zoom):
+    return 1 if zoom < ZOOM_DETALLE else min(REJILLA, 2 ** (zoom - ZOOM_DETALLE + 1))
+
+
+def _punto(lng, lat, propiedades):
+    return {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [round(lng, 5), round(lat, 5)]}, 'properties': propiedades}
+
+
+def grupos(zoom, bbox=None, divisiones=None, estado=None):
+    """Un Feature por grupo de celdas visible: con zoom bajo, uno por región."""
+    divisiones = divisiones or _divisiones(zoom)
+    factor = REJILLA // divisiones
+    acumulado = {}
+    for region, celda, total in conteo_celdas(estado):
+        cx, cy = celda % REJILLA, celda // REJILLA
+        grupo = acumulado.setdefault((region, cx // factor, cy // factor), [0, 0.0, 0.0])
+        lng, lat = _posicion(region, cx, cy)
+        grupo[0] += total
+        grupo[1] += lng * total
+        grupo[2] += lat * total
+    if divisiones == 1:
+        siguiente = ZOOM_DETALLE
+    else:
+        siguiente = ZOOM_PUNTOS if divisiones == REJILLA else zoom + 1
+    siguiente = max(siguiente, zoom + 1)  # con demasiados puntos visibles, acercarse más
+    features = []
+    for (region, _, _), (total, suma_lng, suma_lat) in acumulado.items():
+        lng, lat = suma_lng / total, suma_lat / total  # centro ponderado por ofertas
+        if _en_bbox(bbox, lng, lat):
+            features.append(_punto(lng, lat, {
+                'grupo': True, 'total': total, 'region': region, 'nombre': NOMBRES_REGIONES.get(region, region),
+                'zoom_siguiente': siguiente,
+            }))
+    return features
+
+
+def puntos(bbox, estado=None):
+    """Features de ofertas individuales en el bbox, o None si hay más de MAX_PUNTOS."""
+    visibles = {}
+    for region, celda, total in conteo_celdas(estado):
+        if _celda_visible(bbox, region, celda):
+            visibles.setdefault(region, []).append((celda, total))
+    if sum(total for celdas in visibles.values() for _, total in celdas) > MAX_PUNTOS:
+        return None
+    if not visibles:
+        return []
+    filtro = Q()
+    for region, celdas in visibles.items():
+        filtro |= Q(region=region, celda__in=[celda for celda, _ in celdas])
+    ofertas = (
+        ofertas_mapa().annotate(celda=Mod('id', CELDAS)).filter(filtro)
+        .order_by('-fecha_publicacion').values('id', 'titulo', 'empresa', 'tipo', 'region')[:MAX_PUNTOS]
+    )
+    features = []
+    for oferta in ofertas:
+        lng, lat = posicion_oferta(oferta['id'], oferta['region'])
+        if _en_bbox(bbox, lng, lat):
+            features.append(_punto(lng, lat, {
+                'id': oferta['id'], 'titulo': oferta['titulo'], 'empresa': oferta['empresa'] or '',
+                'tipo': TIPOS.get(oferta['tipo'], oferta['tipo']), 'url': reverse('detalle', args=[oferta['id']]),
+            }))
+    return features
+
+
+def _leer_parametros(request):
+    zoom = request.GET.get('zoom', '5')
+    if not zoom.isdigit():
+        raise ValueError("'zoom' debe ser un entero")
+    bbox = None
+    if request.GET.get('bbox'):
+        bbox = [float(valor) for valor in request.GET['bbox'].split(',')]
+        if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            raise ValueError("'bbox' debe ser oeste,sur,este,norte")
+    return min(int(zoom), 20), bbox
+
+
+def _estado(request):
+    # condition() pide el ETag y el Last-Modified por separado: una sola consulta por petición
+    if not hasattr(request, '_estado_mapa'):
+        request._estado_mapa = estado_consulta(ofertas_mapa())
+    return request._estado_mapa
+
+
+def _etag(request, *args, **kwargs):
+    return huella_estado(request, _estado(request))
+
+
+def _ultima_modificacion(request, *args, **kwargs):
+    return _estado(request)[0]
+
+
+@require_GET
+@condition(etag_func=_etag, last_modified_func=_ultima_modificacion)
+def datos_mapa(request):
+    """GeoJSON para /mapa/: ?zoom=<n>&bbox=oeste,sur,este,norte (bbox opcional)."""
+    try:
+        zoom, bbox = _leer_parametros(request)
+    except ValueError as e:
+        return HttpResponseBadRequest(f"Parámetros inválidos: {e}")
+    features = None
+    if zoom >= ZOOM_PUNTOS:
+        features = puntos(bbox, _estado(request))
+    if features is None:
+        features = grupos(zoom, bbox, REJILLA if zoom >= ZOOM_PUNTOS else None, _estado(request))
+    respuesta = JsonResponse(
+        {'type': 'FeatureCollection', 'features': features}, content_type='application/geo+json',
+        json_dumps_params={'ensure_ascii': False},
+    )
+    respuesta['Cache-Control'] = 'public, max-age=300'
+    return respuesta
@@ -0,0 +1,281 @@
+import contextvars
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+# --- INSTRUMENTACIÓN: CONSULTAS Y LATENCIA POR VISTA ---
+# Con METRICAS_ACTIVAS=1, MetricasMiddleware mide cada petición: número de consultas y
+# tiempo en la BD (execute_wrapper), tiempo de render de plantillas, tiempo en llamadas
+# HTTP salientes (requests) y latencia total. Devuelve el desglose en el header
+# Server-Timing, lo acumula por vista para /metrics (formato Prometheus) y, si la petición
+# supera METRICAS_UMBRAL_LENTO_MS, la registra con sus consultas agrupadas.
+# Desactivado, el middleware se descarta al arrancar y no cuesta nada.
+# El registro es por proceso: con varios workers cada uno expone sus propios contadores
+# (etiqueta `proceso`), y Prometheus los suma con sum by (vista).
+
+logger = logging.getLogger(__name__)
+
+LIMITES_LATENCIA = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # segundos
+MAX_CONSULTAS_REGISTRADAS = 200
+
+_medicion = contextvars.ContextVar('metricas_medicion', default=None)
+
+
+class Medicion:
+    __slots__ = ('consultas', 'tiempo_bd', 'tiempo_plantillas', 'tiempo_http', 'llamadas_http', '_profundidad', 'sql')
+
+    def __init__(self, guardar_sql=False):
+        self.consultas = 0
+        self.tiempo_bd = 0.0
+        self.tiempo_plantillas = 0.0
+        self.tiempo_http = 0.0
+        self.llamadas_http = 0
+        self._profundidad = 0  # {% include %} renderiza plantillas dentro de plantillas
+        self.sql = [] if guardar_sql else None
+
+
+class _Acumulado:
+    __slots__ = ('peticiones', 'consultas', 'tiempo_bd', 'tiempo_plantillas', 'tiempo_http', 'latencia', 'cubetas')
+
+    def __init__(self):
+        self.peticiones = Counter()  # clase de código HTTP ('2xx', '4xx'...) -> peticiones
+        self.consultas = 0
+        self.tiempo_bd = 0.0
+        self.tiempo_plantillas = 0.0
+        self.tiempo_http = 0.0
+        self.latencia = 0.0
+        self.cubetas = [0] * len(LIMITES_LATENCIA)
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vistas = {}
+
+    def observar(self, vista, codigo, medicion, duracion):
+        with self._lock:
+            acumulado = self._vistas.get(vista)
+            if acumulado is None:
+                acumulado = self._vistas[vista] = _Acumulado()
+            acumulado.peticiones[f"{codigo // 100}xx"] += 1
+            acumulado.consultas += medicion.consultas
+            acumulado.tiempo_bd += medicion.tiempo_bd
+            acumulado.tiempo_plantillas += medicion.tiempo_plantillas
+            acumulado.tiempo_http += medicion.tiempo_http
+            acumulado.latencia += duracion
+            for i, limite in enumerate(LIMITES_LATENCIA):
+                if duracion <= limite:
+                    acumulado.cubetas[i] += 1
+                    break
+
+    def reiniciar(self):
+        with self._lock:
+            self._vistas = {}
+
+    def exportar(self):
+        """Texto en formato de exposición de Prometheus (0.0.4)."""
+        proceso = os.getpid()
+        with self._lock:
+            vistas = sorted(self._vistas.items())
+            lineas = []
+
+            def metrica(nombre, tipo, ayuda, muestras):
+                lineas.append(f"# HELP {nombre} {ayuda}")
+                lineas.append(f"# TYPE {nombre} {tipo}")
+                for sufijo, etiquetas, valor in muestras:
+                    texto = ','.join(f'{k}="{_escapar(v)}"' for k, v in (('proceso', proceso),) + etiquetas)
+                    lineas.append(f"{nombre}{sufijo}{{{texto}}} {_numero(valor)}")
+
+            metrica('empleos_peticiones_total', 'counter', 'Peticiones atendidas por vista y clase de código HTTP.', [
+                ('', (('vista', vista), ('codigo', codigo)), cantidad)
+                for vista, acumulado in vistas for codigo, cantidad in sorted(acumulado.peticiones.items())
+            ])
+            metrica('empleos_consultas_sql_total', 'counter', 'Consultas SQL ejecutadas por vista.', [
+                ('', (('vista', vista),), acumulado.consultas) for vista, acumulado in vistas
+            ])
+            for nombre, campo, ayuda in (
+                ('empleos_bd_segundos_total', 'tiempo_bd', 'Tiempo en la base de datos por vista.'),
+                ('empleos_plantillas_segundos_total', 'tiempo_plantillas', 'Tiempo de render de plantillas por vista.'),
+                ('empleos_http_saliente_segundos_total', 'tiempo_http', 'Tiempo en llamadas HTTP salientes por vista.'),
+            ):
+                metrica(nombre, 'counter', ayuda, [('', (('vista', vista),), getattr(acumulado, campo)) for vista, acumulado in vistas])
+
+            muestras = []
+            for vista, acumulado in vistas:
+                total = 0
+                for limite, cantidad in zip(LIMITES_LATENCIA, acumulado.cubetas):
+                    total += cantidad
+                    muestras.append(('_bucket', (('vista', vista), ('le', _numero(limite))), total))
+                cantidad = sum(acumulado.peticiones.values())
+                muestras.append(('_bucket', (('vista', vista), ('le', '+Inf')), cantidad))
+                muestras.append(('_sum', (('vista', vista),), acumulado.latencia))
+                muestras.append(('_count', (('vista', vista),), cantidad))
+            metrica('empleos_peticion_segundos', 'histogram', 'Latencia total de la petición por vista.', muestras)
+        return '\n'.join(lineas) + '\n'
+
+
+registro = RegistroMetricas()
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+# --- GANCHOS (se instalan una sola vez, al activar el middleware) ---
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if medicion is not None:
+            duracion = time.perf_counter() - inicio
+            medicion.consultas += 1
+            medicion.tiempo_bd += duracion
+            if medicion.sql is not None and len(medicion.sql) < MAX_CONSULTAS_REGISTRADAS:
+                medicion.sql.append((sql, duracion))
+
+
+def _envolver_render(render):
+    def render_medido(self, context):
+        medicion = _medicion.get()
+        if medicion is None:
+            return render(self, context)
+        medicion._profundidad += 1
+        inicio = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            medicion._profundidad -= 1
+            if not medicion._profundidad:
+                medicion.tiempo_plantillas += time.perf_counter() - inicio
+    render_medido._metricas = True
+    return render_medido
+
+
+def _envolver_envio(send):
+    def send_medido(self, request, **kwargs):
+        medicion = _medicion.get()
+        if medicion is None:
+            return send(self, request, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return send(self, request, **kwargs)
+        finally:
+            medicion.llamadas_http += 1
+            medicion.tiempo_http += time.perf_counter() - inicio
+    send_medido._metricas = True
+    return send_medido
+
+
+_ganchos_lock = threading.Lock()
+
+
+def instalar_ganchos():
+    from django.template.base import Template
+    with _ganchos_lock:
+        if not getattr(Template.render, '_metricas', False):
+            Template.render = _envolver_render(Template.render)
+        try:
+            import requests
+        except ImportError:
+            return
+        if not getattr(requests.Session.send, '_metricas', False):
+            requests.Session.send = _envolver_envio(requests.Session.send)
+
+
+# --- MIDDLEWARE ---
+
+class MetricasMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICAS_ACTIVAS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.umbral_lento = getattr(settings, 'METRICAS_UMBRAL_LENTO_MS', 0) / 1000
+        self.server_timing = getattr(settings, 'METRICAS_SERVER_TIMING', True)
+        instalar_ganchos()
+
+    def __call__(self, request):
+        medicion = Medicion(guardar_sql=bool(self.umbral_lento))
+        marca = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as pila:
+                for conexion in connections.all():
+                    pila.enter_context(conexion.execute_wrapper(_medir_consulta))
+                response = self.get_response(request)
+        finally:
+            _medicion.reset(marca)
+        duracion = time.perf_counter() - inicio
+
+        # Las respuestas en streaming siguen consultando después de este punto: no se cuentan
+        vista = request.resolver_match.view_name if request.resolver_match else 'sin_ruta'
+        if vista != 'metricas':
+            registro.observar(vista, response.status_code, medicion, duracion)
+        if self.server_timing:
+            response['Server-Timing'] = server_timing(medicion, duracion)
+        if self.umbral_lento and duracion >= self.umbral_lento:
+            registrar_lenta(request, vista, medicion, duracion)
+        return response
+
+
+def server_timing(medicion, duracion):
+    partes = [
+        f'db;dur={medicion.tiempo_bd * 1000:.1f};desc="{medicion.consultas} consultas"',
+        f'tpl;dur={medicion.tiempo_plantillas * 1000:.1f}',
+    ]
+    if medicion.llamadas_http:
+        partes.append(f'http;dur={medicion.tiempo_http * 1000:.1f};desc="{medicion.llamadas_http} llamadas"')
+    partes.append(f'total;dur={duracion * 1000:.1f}')
+    return ', '.join(partes)
+
+
+def registrar_lenta(request, vista, medicion, duracion):
+    # Consultas idénticas agrupadas: un N+1 aparece como "37× SELECT ..."
+    por_sql = {}
+    for sql, tiempo in medicion.sql or ():
+        veces, acumulado = por_sql.get(sql, (0, 0.0))
+        por_sql[sql] = (veces + 1, acumulado + tiempo)
+    detalle = '\n'.join(
+        f"  {veces}× {acumulado * 1000:.1f} ms  {sql}"
+        for sql, (veces, acumulado) in sorted(por_sql.items(), key=lambda item: -item[1][1])
+    )
+    logger.warning(
+        "Petición lenta %s %s (%s): %.0f ms, %d consultas en %.0f ms, plantillas %.0f ms, HTTP %.0f ms\n%s",
+        request.method, request.get_full_path(), vista, duracion * 1000, medicion.consultas,
+        medicion.tiempo_bd * 1000, medicion.tiempo_plantillas * 1000, medicion.tiempo_http * 1000, detalle,
+    )
+
+
+# --- VISTA /metrics ---
+
+def _autorizado(request):
+    # Con el token (Prometheus) o con sesión de staff; nunca público aunque falte METRICAS_TOKEN
+    token = getattr(settings, 'METRICAS_TOKEN', None)
+    if token:
+        recibido = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if hmac.compare_digest(recibido.encode(), token.encode()):
+            return True
+    return request.user.is_active and request.user.is_staff
+
+
+def vista_metricas(request):
+    if not getattr(settings, 'METRICAS_ACTIVAS', False):
+        raise Http404
+    if not _autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registro.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
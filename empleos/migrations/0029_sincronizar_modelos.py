@@ -0,0 +1,306 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:43
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import empleos.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def regenerar_tokens_duplicados(apps, schema_editor):
+    # 0013 agregó el token con un único default: las ofertas antiguas comparten el mismo UUID
+    OfertaLaboral = apps.get_model('empleos', 'OfertaLaboral')
+    vistos = set()
+    for oferta in OfertaLaboral.objects.order_by('id').only('id', 'token'):
+        if oferta.token in vistos:
+            oferta.token = uuid.uuid4()
+            oferta.save(update_fields=['token'])
+        vistos.add(oferta.token)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0028_candidato_video_ofertalaboral_wsp_activo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='ofertalaboral',
+            name='empresa_verificada',
+        ),
+        migrations.RemoveField(
+            model_name='reporteoferta',
+            name='resuelto',
+        ),
+        migrations.RemoveField(
+            model_name='suscriptor',
+            name='fecha_registro',
+        ),
+        migrations.AddField(
+            model_name='noticia',
+            name='autor',
+            field=models.CharField(default='Equipo Red Laboral', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='noticia',
+            name='bajada',
+            field=models.TextField(blank=True, default='Sin resumen disponible'),
+        ),
+        migrations.AddField(
+            model_name='ofertalaboral',
+            name='pagada',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='perfilempresa',
+            name='fecha_creacion',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='suscriptor',
+            name='fecha_suscripcion',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='alertaempleo',
+            name='fecha_creacion',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='alertaempleo',
+            name='region',
+            field=models.CharField(choices=[('AP', 'Arica y Parinacota'), ('TA', 'Tarapacá'), ('AN', 'Antofagasta'), ('AT', 'Atacama'), ('CO', 'Coquimbo'), ('VA', 'Valparaíso'), ('RM', 'Metropolitana'), ('BI', 'O’Higgins'), ('MA', 'Maule'), ('NB', 'Ñuble'), ('BI', 'Biobío'), ('AR', 'Araucanía'), ('LR', 'Los Ríos'), ('LS', 'Los Lagos'), ('AI', 'Aysén'), ('MA', 'Magallanes')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='cv',
+            field=models.FileField(blank=True, null=True, upload_to=empleos.models.renombrar_archivo),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='disponibilidad',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='experiencia',
+            field=models.CharField(choices=[('sin_experiencia', 'Sin experiencia'), ('junior', 'Junior (1-2 años)'), ('semi_senior', 'Semi Senior (3-5 años)'), ('senior', 'Senior (+5 años)')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='nombre',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='presentacion',
+            field=models.TextField(blank=True, null=True, verbose_name='Breve presentación'),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='pretension_renta',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='publicado',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='region',
+            field=models.CharField(choices=[('AP', 'Arica y Parinacota'), ('TA', 'Tarapacá'), ('AN', 'Antofagasta'), ('AT', 'Atacama'), ('CO', 'Coquimbo'), ('VA', 'Valparaíso'), ('RM', 'Metropolitana'), ('BI', 'O’Higgins'), ('MA', 'Maule'), ('NB', 'Ñuble'), ('BI', 'Biobío'), ('AR', 'Araucanía'), ('LR', 'Los Ríos'), ('LS', 'Los Lagos'), ('AI', 'Aysén'), ('MA', 'Magallanes')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='rubro',
+            field=models.CharField(choices=[('admin', 'Administración y Oficina'), ('agro', 'Agricultura y Pesca'), ('arte', 'Arte y Diseño'), ('comercio', 'Comercio y Ventas'), ('construccion', 'Construcción y Obras'), ('educacion', 'Educación'), ('gastronomia', 'Gastronomía y Turismo'), ('salud', 'Salud y Medicina'), ('tecnologia', 'Tecnología e Informática'), ('transporte', 'Transporte y Logística'), ('otro', 'Otros Oficios')], default='otro', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='titular',
+            field=models.CharField(help_text='Ej: Ingeniero Comercial, Gasfiter Certificado', max_length=200, verbose_name='Titular Profesional'),
+        ),
+        migrations.AlterField(
+            model_name='candidato',
+            name='video',
+            field=models.FileField(blank=True, null=True, upload_to='videos_candidatos/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['mp4', 'mov', 'avi']), empleos.models.validar_video], verbose_name='Video de Presentación (Opcional)'),
+        ),
+        migrations.AlterField(
+            model_name='favorito',
+            name='oferta',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='empleos.ofertalaboral'),
+        ),
+        migrations.AlterField(
+            model_name='noticia',
+            name='fecha_publicacion',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='noticia',
+            name='imagen',
+            field=models.ImageField(upload_to='blog/'),
+        ),
+        migrations.AlterField(
+            model_name='notificacion',
+            name='enlace',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='descripcion',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='duracion',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Duración del contrato'),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='empresa',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='etiquetas',
+            field=models.CharField(blank=True, help_text='Ej: Python, Ventas, Licencia B', max_length=200, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='experiencia',
+            field=models.CharField(choices=[('sin_experiencia', 'Sin experiencia'), ('junior', 'Junior (1-2 años)'), ('semi_senior', 'Semi Senior (3-5 años)'), ('senior', 'Senior (+5 años)')], default='sin_experiencia', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='fecha_cierre',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='fecha_publicacion',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='id',
+            field=models.AutoField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='imagen',
+            field=models.ImageField(blank=True, null=True, upload_to=empleos.models.renombrar_archivo),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='modalidad',
+            field=models.CharField(choices=[('Presencial', 'Presencial'), ('Remoto', 'Remoto'), ('Hibrido', 'Híbrido')], default='Presencial', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='region',
+            field=models.CharField(choices=[('AP', 'Arica y Parinacota'), ('TA', 'Tarapacá'), ('AN', 'Antofagasta'), ('AT', 'Atacama'), ('CO', 'Coquimbo'), ('VA', 'Valparaíso'), ('RM', 'Metropolitana'), ('BI', 'O’Higgins'), ('MA', 'Maule'), ('NB', 'Ñuble'), ('BI', 'Biobío'), ('AR', 'Araucanía'), ('LR', 'Los Ríos'), ('LS', 'Los Lagos'), ('AI', 'Aysén'), ('MA', 'Magallanes')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='sueldo',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Sueldo Líquido (Opcional)'),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='telefono',
+            field=models.CharField(blank=True, max_length=20, null=True, verbose_name='Teléfono / WhatsApp'),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='tipo',
+            field=models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('freelance', 'Freelance'), ('practica', 'Práctica Profesional'), ('remoto', '100% Remoto'), ('hibrido', 'Híbrido'), ('PRA', 'Práctica Profesional')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='titulo',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.RunPython(regenerar_tokens_duplicados, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='token',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='usuario',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ofertas', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='ofertalaboral',
+            name='visitas',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='perfilempresa',
+            name='banner',
+            field=models.ImageField(blank=True, null=True, upload_to=empleos.models.renombrar_banner),
+        ),
+        migrations.AlterField(
+            model_name='perfilempresa',
+            name='nombre',
+            field=models.CharField(blank=True, max_length=150, null=True, verbose_name='Nombre de la Empresa'),
+        ),
+        migrations.AlterField(
+            model_name='postulacion',
+            name='candidato',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postulaciones', to='empleos.candidato'),
+        ),
+        migrations.AlterField(
+            model_name='postulacion',
+            name='estado',
+            field=models.CharField(choices=[('ENV', 'Enviada'), ('VIS', 'Vista por Empresa'), ('INT', 'En Entrevista'), ('NO', 'Descartado'), ('SEL', 'Seleccionado')], default='ENV', max_length=3),
+        ),
+        migrations.AlterField(
+            model_name='reporteoferta',
+            name='detalle',
+            field=models.TextField(),
+        ),
+        migrations.AlterField(
+            model_name='reporteoferta',
+            name='motivo',
+            field=models.CharField(choices=[('fraude', 'Posible Estafa'), ('discriminacion', 'Discriminación'), ('spam', 'Spam / Publicidad'), ('otro', 'Otro')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='valoracion',
+            name='aprobado',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='valoracion',
+            name='empresa_nombre',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='valoracion',
+            name='estrellas',
+            field=models.IntegerField(default=5),
+        ),
+        migrations.CreateModel(
+            name='Servicio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=200, verbose_name='¿Qué servicio ofreces?')),
+                ('descripcion', models.TextField(verbose_name='Detalle del servicio')),
+                ('rubro', models.CharField(choices=[('admin', 'Administración y Oficina'), ('agro', 'Agricultura y Pesca'), ('arte', 'Arte y Diseño'), ('comercio', 'Comercio y Ventas'), ('construccion', 'Construcción y Obras'), ('educacion', 'Educación'), ('gastronomia', 'Gastronomía y Turismo'), ('salud', 'Salud y Medicina'), ('tecnologia', 'Tecnología e Informática'), ('transporte', 'Transporte y Logística'), ('otro', 'Otros Oficios')], max_length=50)),
+                ('region', models.CharField(choices=[('AP', 'Arica y Parinacota'), ('TA', 'Tarapacá'), ('AN', 'Antofagasta'), ('AT', 'Atacama'), ('CO', 'Coquimbo'), ('VA', 'Valparaíso'), ('RM', 'Metropolitana'), ('BI', 'O’Higgins'), ('MA', 'Maule'), ('NB', 'Ñuble'), ('BI', 'Biobío'), ('AR', 'Araucanía'), ('LR', 'Los Ríos'), ('LS', 'Los Lagos'), ('AI', 'Aysén'), ('MA', 'Magallanes')], max_length=50)),
+                ('telefono', models.CharField(max_length=20, verbose_name='WhatsApp / Teléfono')),
+                ('email_contacto', models.EmailField(max_length=254, verbose_name='Correo de contacto')),
+                ('imagen', models.ImageField(blank=True, null=True, upload_to=empleos.models.renombrar_archivo)),
+                ('precio_referencial', models.CharField(blank=True, max_length=100, null=True)),
+                ('fecha_publicacion', models.DateTimeField(default=django.utils.timezone.now)),
+                ('publicado', models.BooleanField(default=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='servicios', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations, models
+
+
+def poblar_documentos(apps, schema_editor):
+    from empleos.busqueda import construir_documento
+    OfertaLaboral = apps.get_model('empleos', 'OfertaLaboral')
+    ofertas = list(OfertaLaboral.objects.all())
+    for oferta in ofertas:
+        oferta.documento_busqueda = construir_documento(oferta)
+    OfertaLaboral.objects.bulk_update(ofertas, ['documento_busqueda'], batch_size=500)
+
+
+# SQL congelado tal como se instaló en esta migración: empleos.busqueda.instalar_indices_busqueda
+# puede cambiar después (y se vuelve a correr en cada migrate, ver apps.py).
+SQL_SQLITE = [
+    'DROP TABLE IF EXISTS empleos_ofertalaboral_fts',
+    "CREATE VIRTUAL TABLE empleos_ofertalaboral_fts USING fts5(documento, tokenize = 'unicode61 remove_diacritics 2')",
+    'INSERT INTO empleos_ofertalaboral_fts(rowid, documento) SELECT id, documento_busqueda FROM empleos_ofertalaboral',
+    'CREATE TRIGGER empleos_ofertalaboral_fts_ai AFTER INSERT ON empleos_ofertalaboral BEGIN '
+    'INSERT INTO empleos_ofertalaboral_fts(rowid, documento) VALUES (new.id, new.documento_busqueda); END',
+    'CREATE TRIGGER empleos_ofertalaboral_fts_ad AFTER DELETE ON empleos_ofertalaboral BEGIN '
+    'DELETE FROM empleos_ofertalaboral_fts WHERE rowid = old.id; END',
+    'CREATE TRIGGER empleos_ofertalaboral_fts_au AFTER UPDATE OF documento_busqueda ON empleos_ofertalaboral BEGIN '
+    'DELETE FROM empleos_ofertalaboral_fts WHERE rowid = old.id; '
+    'INSERT INTO empleos_ofertalaboral_fts(rowid, documento) VALUES (new.id, new.documento_busqueda); END',
+]
+SQL_SQLITE_REVERSO = [
+    'DROP TRIGGER IF EXISTS empleos_ofertalaboral_fts_ai',
+    'DROP TRIGGER IF EXISTS empleos_ofertalaboral_fts_ad',
+    'DROP TRIGGER IF EXISTS empleos_ofertalaboral_fts_au',
+    'DROP TABLE IF EXISTS empleos_ofertalaboral_fts',
+]
+SQL_POSTGRES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS empleos_oferta_busqueda_fts ON empleos_ofertalaboral USING gin (to_tsvector('simple', documento_busqueda))",
+    'CREATE INDEX IF NOT EXISTS empleos_oferta_busqueda_trgm ON empleos_ofertalaboral USING gin (documento_busqueda gin_trgm_ops)',
+]
+SQL_POSTGRES_REVERSO = [
+    'DROP INDEX IF EXISTS empleos_oferta_busqueda_fts',
+    'DROP INDEX IF EXISTS empleos_oferta_busqueda_trgm',
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sentencia in sentencias.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_indices(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQL_SQLITE, 'postgresql': SQL_POSTGRES})
+
+
+def borrar_indices(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQL_SQLITE_REVERSO, 'postgresql': SQL_POSTGRES_REVERSO})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0029_sincronizar_modelos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertalaboral',
+            name='documento_busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(poblar_documentos, migrations.RunPython.noop),
+        migrations.RunPython(crear_indices, borrar_indices),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0030_ofertalaboral_documento_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('visitas', models.IntegerField(default=0)),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visitas_diarias', to='empleos.ofertalaboral')),
+            ],
+            options={
+                'unique_together': {('oferta', 'fecha')},
+            },
+        ),
+    ]
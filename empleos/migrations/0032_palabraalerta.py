@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def indexar_alertas(apps, schema_editor):
+    from empleos.alertas import palabras_de_alerta
+    AlertaEmpleo = apps.get_model('empleos', 'AlertaEmpleo')
+    PalabraAlerta = apps.get_model('empleos', 'PalabraAlerta')
+    filas = []
+    for alerta in AlertaEmpleo.objects.all().iterator():
+        palabras = palabras_de_alerta(alerta.palabra_clave)
+        filas.extend(
+            PalabraAlerta(alerta_id=alerta.id, token=token, region=alerta.region, tokens_requeridos=len(palabras))
+            for token in palabras
+        )
+    PalabraAlerta.objects.bulk_create(filas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0031_visitadiaria'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PalabraAlerta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('region', models.CharField(choices=[('AP', 'Arica y Parinacota'), ('TA', 'Tarapacá'), ('AN', 'Antofagasta'), ('AT', 'Atacama'), ('CO', 'Coquimbo'), ('VA', 'Valparaíso'), ('RM', 'Metropolitana'), ('BI', 'O’Higgins'), ('MA', 'Maule'), ('NB', 'Ñuble'), ('BI', 'Biobío'), ('AR', 'Araucanía'), ('LR', 'Los Ríos'), ('LS', 'Los Lagos'), ('AI', 'Aysén'), ('MA', 'Magallanes')], max_length=50)),
+                ('tokens_requeridos', models.PositiveSmallIntegerField(default=1)),
+                ('alerta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='palabras', to='empleos.alertaempleo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['region', 'token'], name='palabra_alerta_region_token')],
+            },
+        ),
+        migrations.RunPython(indexar_alertas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0032_palabraalerta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('funcion', models.CharField(max_length=200)),
+                ('datos', models.JSONField(blank=True, default=dict)),
+                ('clave', models.CharField(blank=True, help_text='Clave de idempotencia', max_length=200, null=True, unique=True)),
+                ('estado', models.CharField(choices=[('PEN', 'Pendiente'), ('EJE', 'En ejecución'), ('OK', 'Completada'), ('ERR', 'Fallida')], default='PEN', max_length=3)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('max_intentos', models.PositiveSmallIntegerField(default=5)),
+                ('disponible_desde', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueada_hasta', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['estado', 'disponible_desde'], name='tarea_estado_disponible')],
+            },
+        ),
+    ]
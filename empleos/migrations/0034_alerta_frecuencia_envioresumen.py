@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0033_tarea'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnvioResumen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frecuencia', models.CharField(choices=[('INS', 'Al instante'), ('DIA', 'Resumen diario'), ('SEM', 'Resumen semanal')], max_length=3, unique=True)),
+                ('hasta', models.DateTimeField()),
+                ('fecha_envio', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='alertaempleo',
+            name='frecuencia',
+            field=models.CharField(choices=[('INS', 'Al instante'), ('DIA', 'Resumen diario'), ('SEM', 'Resumen semanal')], default='INS', max_length=3),
+        ),
+    ]
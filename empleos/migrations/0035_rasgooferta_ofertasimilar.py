@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0034_alerta_frecuencia_envioresumen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfertaSimilar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntaje', models.FloatField()),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similares_precalculadas', to='empleos.ofertalaboral')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='empleos.ofertalaboral')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['oferta', '-puntaje'], name='oferta_similar_puntaje')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RasgoOferta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rasgo', models.CharField(max_length=60)),
+                ('peso', models.FloatField()),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rasgos', to='empleos.ofertalaboral')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['rasgo'], name='rasgo_oferta_rasgo')],
+            },
+        ),
+    ]
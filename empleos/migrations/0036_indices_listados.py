@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0035_rasgooferta_ofertasimilar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['rubro', 'region', '-fecha_creacion'], name='candidato_pub_rubro_region'),
+        ),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['region', '-fecha_creacion'], name='candidato_pub_region_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['-fecha_creacion'], name='candidato_pub_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='favorito',
+            index=models.Index(fields=['usuario', '-fecha'], name='favorito_usuario_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(condition=models.Q(('leida', False)), fields=['usuario', '-fecha'], name='notificacion_no_leidas'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['-es_destacado', '-fecha_publicacion'], name='oferta_pub_destacado_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['region', '-es_destacado', '-fecha_publicacion'], name='oferta_pub_region_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['tipo', '-fecha_publicacion'], name='oferta_pub_tipo_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['-fecha_publicacion'], name='oferta_pub_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(fields=['usuario', '-fecha_publicacion'], name='oferta_usuario_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='postulacion',
+            index=models.Index(fields=['candidato', '-fecha'], name='postulacion_candidato_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='servicio',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['-fecha_publicacion'], name='servicio_pub_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='servicio',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['rubro', 'region', '-fecha_publicacion'], name='servicio_pub_rubro_region'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def poblar_documentos(apps, schema_editor):
+    from empleos.busqueda import construir_documento_candidato
+    Candidato = apps.get_model('empleos', 'Candidato')
+    candidatos = list(Candidato.objects.only('id', 'titular', 'presentacion'))
+    for candidato in candidatos:
+        candidato.documento_busqueda = construir_documento_candidato(candidato)
+    Candidato.objects.bulk_update(candidatos, ['documento_busqueda'], batch_size=500)
+
+
+# SQL congelado tal como se instaló en esta migración: empleos.busqueda.instalar_indices_busqueda
+# puede cambiar después (y se vuelve a correr en cada migrate, ver apps.py).
+SQL_SQLITE = [
+    'DROP TABLE IF EXISTS empleos_candidato_fts',
+    "CREATE VIRTUAL TABLE empleos_candidato_fts USING fts5(documento, tokenize = 'unicode61 remove_diacritics 2')",
+    'INSERT INTO empleos_candidato_fts(rowid, documento) SELECT id, documento_busqueda FROM empleos_candidato',
+    'CREATE TRIGGER empleos_candidato_fts_ai AFTER INSERT ON empleos_candidato BEGIN '
+    'INSERT INTO empleos_candidato_fts(rowid, documento) VALUES (new.id, new.documento_busqueda); END',
+    'CREATE TRIGGER empleos_candidato_fts_ad AFTER DELETE ON empleos_candidato BEGIN '
+    'DELETE FROM empleos_candidato_fts WHERE rowid = old.id; END',
+    'CREATE TRIGGER empleos_candidato_fts_au AFTER UPDATE OF documento_busqueda ON empleos_candidato BEGIN '
+    'DELETE FROM empleos_candidato_fts WHERE rowid = old.id; '
+    'INSERT INTO empleos_candidato_fts(rowid, documento) VALUES (new.id, new.documento_busqueda); END',
+]
+SQL_SQLITE_REVERSO = [
+    'DROP TRIGGER IF EXISTS empleos_candidato_fts_ai',
+    'DROP TRIGGER IF EXISTS empleos_candidato_fts_ad',
+    'DROP TRIGGER IF EXISTS empleos_candidato_fts_au',
+    'DROP TABLE IF EXISTS empleos_candidato_fts',
+]
+SQL_POSTGRES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS empleos_candidato_busqueda_fts ON empleos_candidato USING gin (to_tsvector('simple', documento_busqueda))",
+    'CREATE INDEX IF NOT EXISTS empleos_candidato_busqueda_trgm ON empleos_candidato USING gin (documento_busqueda gin_trgm_ops)',
+]
+SQL_POSTGRES_REVERSO = [
+    'DROP INDEX IF EXISTS empleos_candidato_busqueda_fts',
+    'DROP INDEX IF EXISTS empleos_candidato_busqueda_trgm',
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sentencia in sentencias.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_indices(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQL_SQLITE, 'postgresql': SQL_POSTGRES})
+
+
+def borrar_indices(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQL_SQLITE_REVERSO, 'postgresql': SQL_POSTGRES_REVERSO})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0036_indices_listados'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidato',
+            name='documento_busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(poblar_documentos, migrations.RunPython.noop),
+        migrations.RunPython(crear_indices, borrar_indices),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['experiencia', '-fecha_creacion'], name='candidato_pub_experiencia'),
+        ),
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(condition=models.Q(('publicado', True)), fields=['pretension_renta'], name='candidato_pub_renta'),
+        ),
+    ]
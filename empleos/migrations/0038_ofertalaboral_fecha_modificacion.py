@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def usar_fecha_publicacion(apps, schema_editor):
+    # Las ofertas existentes se consideran modificadas por última vez al publicarse
+    OfertaLaboral = apps.get_model('empleos', 'OfertaLaboral')
+    OfertaLaboral.objects.update(fecha_modificacion=F('fecha_publicacion'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0037_candidato_documento_busqueda'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertalaboral',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(usar_fecha_publicacion, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(fields=['fecha_modificacion', 'id'], name='oferta_modificacion'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import F
+
+ORIGEN = {
+    'Candidato': 'fecha_creacion',
+    'Noticia': 'fecha_publicacion',
+    'PerfilEmpresa': 'fecha_creacion',
+    'Servicio': 'fecha_publicacion',
+}
+
+
+def usar_fecha_original(apps, schema_editor):
+    for modelo, campo in ORIGEN.items():
+        apps.get_model('empleos', modelo).objects.update(fecha_modificacion=F(campo))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0038_ofertalaboral_fecha_modificacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidato',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='noticia',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='perfilempresa',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='servicio',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(usar_fecha_original, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0039_fecha_modificacion_sitemaps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('metrica', models.CharField(max_length=30)),
+                ('clave', models.CharField(blank=True, default='', max_length=50)),
+                ('valor', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metrica', 'fecha'], name='estadistica_metrica_fecha')],
+                'unique_together': {('fecha', 'metrica', 'clave')},
+            },
+        ),
+    ]
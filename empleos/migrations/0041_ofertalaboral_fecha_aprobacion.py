@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:06
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def usar_fecha_modificacion(apps, schema_editor):
+    # Hasta ahora la marca de agua de los resúmenes era fecha_modificacion: se parte de ella
+    OfertaLaboral = apps.get_model('empleos', 'OfertaLaboral')
+    OfertaLaboral.objects.filter(publicada=True).update(fecha_aprobacion=F('fecha_modificacion'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0040_estadisticas_diarias'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertalaboral',
+            name='fecha_aprobacion',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(usar_fecha_modificacion, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['fecha_aprobacion'], name='oferta_pub_aprobacion'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleos', '0041_ofertalaboral_fecha_aprobacion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ofertalaboral',
+            name='oferta_pub_destacado_fecha',
+        ),
+        migrations.RemoveIndex(
+            model_name='ofertalaboral',
+            name='oferta_pub_region_fecha',
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['-es_destacado', '-fecha_publicacion', '-id'], name='oferta_pub_destacado_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertalaboral',
+            index=models.Index(condition=models.Q(('publicada', True)), fields=['region', '-es_destacado', '-fecha_publicacion', '-id'], name='oferta_pub_region_fecha'),
+        ),
+    ]
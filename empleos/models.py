@@ -6,6 +6,9 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 
+from .alertas import indexar_alerta
+from .busqueda import construir_documento, construir_documento_candidato
+
 # --- FUNCIONES AUXILIARES (NO BORRAR - Requeridas por historial de migraciones) ---
 
 def renombrar_foto(instance, filename):
@@ -84,6 +87,7 @@ class PerfilEmpresa(models.Model):
     
     # ✅ CORREGIDO: Usamos default=timezone.now para evitar error de migración
     fecha_creacion = models.DateTimeField(default=timezone.now)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
 
     def __str__(self): return self.nombre or self.usuario.username
 
@@ -100,6 +104,9 @@ class OfertaLaboral(models.Model):
     experiencia = models.CharField(max_length=50, choices=NIVEL_EXPERIENCIA, default='sin_experiencia')
     sueldo = models.IntegerField(blank=True, null=True, verbose_name="Sueldo Líquido (Opcional)")
     fecha_publicacion = models.DateTimeField(default=timezone.now)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+    # Cuándo pasó a publicada (se borra al despublicarla): marca de agua de los resúmenes
+    fecha_aprobacion = models.DateTimeField(blank=True, null=True, editable=False)
     fecha_cierre = models.DateField(blank=True, null=True)
     telefono = models.CharField(max_length=20, blank=True, null=True, verbose_name="Teléfono / WhatsApp")
     wsp_activo = models.BooleanField(default=False, verbose_name="¿Contactar por WhatsApp?")
@@ -111,9 +118,56 @@ class OfertaLaboral(models.Model):
     pagada = models.BooleanField(default=False)
     es_destacado = models.BooleanField(default=False)
     visitas = models.IntegerField(default=0)
+    documento_busqueda = models.TextField(blank=True, default='', editable=False)
+
+    CAMPOS_BUSQUEDA = {'titulo', 'empresa', 'etiquetas', 'descripcion'}
+
+    class Meta:
+        # Índices parciales: los listados públicos solo leen ofertas publicadas
+        indexes = [
+            # Mismo orden que el keyset del listado (paginar_cursor): el desempate por id también sale del índice
+            models.Index(fields=['-es_destacado', '-fecha_publicacion', '-id'], condition=models.Q(publicada=True), name='oferta_pub_destacado_fecha'),
+            models.Index(fields=['region', '-es_destacado', '-fecha_publicacion', '-id'], condition=models.Q(publicada=True), name='oferta_pub_region_fecha'),
+            models.Index(fields=['tipo', '-fecha_publicacion'], condition=models.Q(publicada=True), name='oferta_pub_tipo_fecha'),
+            models.Index(fields=['-fecha_publicacion'], condition=models.Q(publicada=True), name='oferta_pub_fecha'),
+            models.Index(fields=['usuario', '-fecha_publicacion'], name='oferta_usuario_fecha'),
+            models.Index(fields=['fecha_modificacion', 'id'], name='oferta_modificacion'),
+            models.Index(fields=['fecha_aprobacion'], condition=models.Q(publicada=True), name='oferta_pub_aprobacion'),
+        ]
 
     def __str__(self): return self.titulo
 
+    def save(self, *args, **kwargs):
+        # Texto normalizado (sin tildes) que alimenta el índice de búsqueda
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.CAMPOS_BUSQUEDA & set(update_fields):
+            self.documento_busqueda = construir_documento(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'documento_busqueda'}
+        # Solo al pasar a publicada: editarla después no la vuelve a poner en los resúmenes
+        if self.publicada != (self.fecha_aprobacion is not None):
+            self.fecha_aprobacion = timezone.now() if self.publicada else None
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'fecha_aprobacion'}
+        super().save(*args, **kwargs)
+
+class RasgoOferta(models.Model):
+    # Rasgos ponderados de cada oferta publicada (ver empleos.recomendaciones)
+    oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='rasgos')
+    rasgo = models.CharField(max_length=60)
+    peso = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=['rasgo'], name='rasgo_oferta_rasgo')]
+
+class OfertaSimilar(models.Model):
+    oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='similares_precalculadas')
+    similar = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='+')
+    puntaje = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=['oferta', '-puntaje'], name='oferta_similar_puntaje')]
+
 class Candidato(models.Model):
     usuario = models.OneToOneField(User, on_delete=models.CASCADE, related_name='candidato', null=True, blank=True)
     nombre = models.CharField(max_length=200)
@@ -132,16 +186,57 @@ class Candidato(models.Model):
     presentacion = models.TextField(blank=True, null=True, verbose_name="Breve presentación")
     publicado = models.BooleanField(default=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+    documento_busqueda = models.TextField(blank=True, default='', editable=False)
+
+    CAMPOS_BUSQUEDA = {'titular', 'presentacion'}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['rubro', 'region', '-fecha_creacion'], condition=models.Q(publicado=True), name='candidato_pub_rubro_region'),
+            models.Index(fields=['region', '-fecha_creacion'], condition=models.Q(publicado=True), name='candidato_pub_region_fecha'),
+            models.Index(fields=['-fecha_creacion'], condition=models.Q(publicado=True), name='candidato_pub_fecha'),
+            models.Index(fields=['experiencia', '-fecha_creacion'], condition=models.Q(publicado=True), name='candidato_pub_experiencia'),
+            models.Index(fields=['pretension_renta'], condition=models.Q(publicado=True), name='candidato_pub_renta'),
+        ]
 
     def __str__(self): return self.nombre
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.CAMPOS_BUSQUEDA & set(update_fields):
+            self.documento_busqueda = construir_documento_candidato(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'documento_busqueda'}
+        super().save(*args, **kwargs)
+
 class Postulacion(models.Model):
     ESTADOS = [('ENV', 'Enviada'), ('VIS', 'Vista por Empresa'), ('INT', 'En Entrevista'), ('NO', 'Descartado'), ('SEL', 'Seleccionado')]
     oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='postulaciones')
     candidato = models.ForeignKey(Candidato, on_delete=models.CASCADE, related_name='postulaciones')
     fecha = models.DateTimeField(auto_now_add=True)
     estado = models.CharField(max_length=3, choices=ESTADOS, default='ENV')
-    class Meta: unique_together = ('oferta', 'candidato')
+    class Meta:
+        unique_together = ('oferta', 'candidato')
+        indexes = [models.Index(fields=['candidato', '-fecha'], name='postulacion_candidato_fecha')]
+
+class VisitaDiaria(models.Model):
+    # Serie diaria de visitas por oferta, alimentada por empleos.visitas
+    oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='visitas_diarias')
+    fecha = models.DateField()
+    visitas = models.IntegerField(default=0)
+    class Meta: unique_together = ('oferta', 'fecha')
+
+class EstadisticaDiaria(models.Model):
+    # Agregados por día para los paneles (ver empleos.estadisticas)
+    fecha = models.DateField()
+    metrica = models.CharField(max_length=30)
+    clave = models.CharField(max_length=50, blank=True, default='')
+    valor = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('fecha', 'metrica', 'clave')
+        indexes = [models.Index(fields=['metrica', 'fecha'], name='estadistica_metrica_fecha')]
 
 class Valoracion(models.Model):
     empresa_nombre = models.CharField(max_length=200)
@@ -159,6 +254,7 @@ class Noticia(models.Model):
     contenido = models.TextField()
     imagen = models.ImageField(upload_to='blog/')
     fecha_publicacion = models.DateTimeField(default=timezone.now)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
     autor = models.CharField(max_length=100, default="Equipo Red Laboral")
     
     def __str__(self): return self.titulo
@@ -170,13 +266,37 @@ class Suscriptor(models.Model):
     fecha_suscripcion = models.DateTimeField(default=timezone.now)
 
 class AlertaEmpleo(models.Model):
+    INSTANTANEA, DIARIA, SEMANAL = 'INS', 'DIA', 'SEM'
+    FRECUENCIAS = [(INSTANTANEA, 'Al instante'), (DIARIA, 'Resumen diario'), (SEMANAL, 'Resumen semanal')]
+
     email = models.EmailField()
     palabra_clave = models.CharField(max_length=100)
     region = models.CharField(max_length=50, choices=REGIONES_CHILE)
+    frecuencia = models.CharField(max_length=3, choices=FRECUENCIAS, default=INSTANTANEA)
     
     # ✅ CORREGIDO: Usamos default=timezone.now
     fecha_creacion = models.DateTimeField(default=timezone.now)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        indexar_alerta(self)
+
+class PalabraAlerta(models.Model):
+    # Índice invertido de AlertaEmpleo (ver empleos.alertas)
+    alerta = models.ForeignKey(AlertaEmpleo, on_delete=models.CASCADE, related_name='palabras')
+    token = models.CharField(max_length=100)
+    region = models.CharField(max_length=50, choices=REGIONES_CHILE)
+    tokens_requeridos = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [models.Index(fields=['region', 'token'], name='palabra_alerta_region_token')]
+
+class EnvioResumen(models.Model):
+    # Marca de agua por frecuencia: hasta qué fecha_aprobacion de las ofertas ya se enviaron resúmenes
+    frecuencia = models.CharField(max_length=3, choices=AlertaEmpleo.FRECUENCIAS, unique=True)
+    hasta = models.DateTimeField()
+    fecha_envio = models.DateTimeField(auto_now=True)
+
 class ReporteOferta(models.Model):
     MOTIVOS = [('fraude', 'Posible Estafa'), ('discriminacion', 'Discriminación'), ('spam', 'Spam / Publicidad'), ('otro', 'Otro')]
     oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE)
@@ -191,6 +311,9 @@ class Notificacion(models.Model):
     leida = models.BooleanField(default=False)
     fecha = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['usuario', '-fecha'], condition=models.Q(leida=False), name='notificacion_no_leidas')]
+
 class Pregunta(models.Model):
     oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE, related_name='preguntas')
     usuario = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -203,7 +326,9 @@ class Favorito(models.Model):
     usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='favoritos')
     oferta = models.ForeignKey(OfertaLaboral, on_delete=models.CASCADE)
     fecha = models.DateTimeField(auto_now_add=True)
-    class Meta: unique_together = ('usuario', 'oferta')
+    class Meta:
+        unique_together = ('usuario', 'oferta')
+        indexes = [models.Index(fields=['usuario', '-fecha'], name='favorito_usuario_fecha')]
 
 class Servicio(models.Model):
     usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='servicios')
@@ -216,7 +341,37 @@ class Servicio(models.Model):
     imagen = models.ImageField(upload_to=renombrar_archivo, blank=True, null=True)
     precio_referencial = models.CharField(max_length=100, blank=True, null=True)
     fecha_publicacion = models.DateTimeField(default=timezone.now)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
     publicado = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-fecha_publicacion'], condition=models.Q(publicado=True), name='servicio_pub_fecha'),
+            models.Index(fields=['rubro', 'region', '-fecha_publicacion'], condition=models.Q(publicado=True), name='servicio_pub_rubro_region'),
+        ]
+
     def __str__(self):
-        return f"{self.titulo} - {self.usuario.first_name}"
\ No newline at end of file
+        return f"{self.titulo} - {self.usuario.first_name}"
+
+
+class Tarea(models.Model):
+    # Cola de trabajos en segundo plano (ver empleos.tareas y `manage.py procesar_tareas`)
+    PENDIENTE, EJECUTANDO, COMPLETADA, FALLIDA = 'PEN', 'EJE', 'OK', 'ERR'
+    ESTADOS = [(PENDIENTE, 'Pendiente'), (EJECUTANDO, 'En ejecución'), (COMPLETADA, 'Completada'), (FALLIDA, 'Fallida')]
+
+    funcion = models.CharField(max_length=200)
+    datos = models.JSONField(default=dict, blank=True)
+    clave = models.CharField(max_length=200, unique=True, blank=True, null=True, help_text="Clave de idempotencia")
+    estado = models.CharField(max_length=3, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=5)
+    disponible_desde = models.DateTimeField(default=timezone.now)
+    bloqueada_hasta = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['estado', 'disponible_desde'], name='tarea_estado_disponible')]
+
+    def __str__(self): return f"{self.funcion} ({self.get_estado_display()})"
@@ -0,0 +1,183 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# --- PAGINACIÓN POR CURSOR (KEYSET) ---
+# En vez de COUNT(*) + OFFSET, cada página se pide "a partir de" los valores de orden de la
+# última fila vista: WHERE (es_destacado, fecha_publicacion, id) < (...) ORDER BY ... LIMIT n.
+# Con un índice sobre esas columnas la página 500 cuesta lo mismo que la primera.
+# El cursor viaja en ?cursor= como un token opaco; si el orden no es por columnas del modelo
+# (p. ej. relevancia de búsqueda), el token guarda un desplazamiento y se usa OFFSET.
+
+TOPE_CONTEO = 1000
+
+
+def _codificar(datos):
+    return base64.urlsafe_b64encode(json.dumps(datos, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def _decodificar(token):
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    return datos if isinstance(datos, dict) else None
+
+
+def _serializar(valor):
+    return valor.isoformat() if hasattr(valor, 'isoformat') else valor
+
+
+def _condicion_keyset(modelo, orden, valores, hacia_adelante):
+    """WHERE que deja solo las filas posteriores (o anteriores) a `valores` según `orden`."""
+    campos = [modelo._meta.get_field(c.lstrip('-')) for c in orden]
+    descendentes = [c.startswith('-') for c in orden]
+    valores = [campo.to_python(v) for campo, v in zip(campos, valores)]
+
+    if len(set(descendentes)) == 1:
+        # Mismo sentido en todas las columnas: comparación de tuplas, que el índice resuelve como rango
+        menor = descendentes[0] == hacia_adelante
+        columnas = ', '.join(f'{connection.ops.quote_name(modelo._meta.db_table)}.{connection.ops.quote_name(c.column)}' for c in campos)
+        marcas = ', '.join(['%s'] * len(campos))
+        params = [c.get_db_prep_value(v, connection) for c, v in zip(campos, valores)]
+        return {'where': [f"({columnas}) {'<' if menor else '>'} ({marcas})"], 'params': params}
+
+    condicion = Q()
+    for i in reversed(range(len(campos))):
+        operador = 'lt' if descendentes[i] == hacia_adelante else 'gt'
+        siguiente = Q(**{f'{campos[i].name}__{operador}': valores[i]})
+        condicion = siguiente if i == len(campos) - 1 else siguiente | (Q(**{campos[i].name: valores[i]}) & condicion)
+    return condicion
+
+
+def contar_aproximado(queryset, tope=TOPE_CONTEO):
+    """Devuelve (total, exacto). En PostgreSQL usa la estimación del planificador."""
+    queryset = queryset.order_by()
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimado = int(plan[0]['Plan']['Plan Rows'])
+        if estimado > tope:
+            return estimado, False
+    total = queryset[:tope + 1].count()
+    return min(total, tope), total <= tope
+
+
+class PaginaCursor:
+    def __init__(self, request, object_list, siguiente=None, anterior=None, queryset=None, contar=False):
+        self.request = request
+        self.object_list = object_list
+        self.cursor_siguiente = siguiente
+        self.cursor_anterior = anterior
+        self._queryset = queryset
+        self._contar = contar
+
+    def __iter__(self): return iter(self.object_list)
+    def __len__(self): return len(self.object_list)
+
+    @property
+    def has_next(self): return self.cursor_siguiente is not None
+
+    @property
+    def has_previous(self): return self.cursor_anterior is not None
+
+    def has_other_pages(self): return self.has_next or self.has_previous
+
+    def _url(self, cursor):
+        parametros = self.request.GET.copy()
+        parametros.pop('page', None)
+        parametros['cursor'] = cursor
+        return '?' + parametros.urlencode()
+
+    @property
+    def url_siguiente(self): return self._url(self.cursor_siguiente) if self.has_next else None
+
+    @property
+    def url_anterior(self):
+        if self.cursor_anterior == '':
+            parametros = self.request.GET.copy()
+            parametros.pop('cursor', None)
+            parametros.pop('page', None)
+            return '?' + parametros.urlencode()
+        return self._url(self.cursor_anterior) if self.has_previous else None
+
+    @cached_property
+    def total(self):
+        if not self._contar or self._queryset is None:
+            return None
+        return contar_aproximado(self._queryset)
+
+    @property
+    def total_texto(self):
+        if self.total is None:
+            return ''
+        cantidad, exacto = self.total
+        return f"{cantidad}" if exacto else f"más de {TOPE_CONTEO}" if cantidad <= TOPE_CONTEO else f"~{cantidad}"
+
+
+def paginar_cursor(request, queryset, orden=None, por_pagina=10, contar=False):
+    """Pagina `queryset` con el token de ?cursor=.
+
+    `orden` son campos del modelo terminando en uno único (p. ej. ('-fecha_publicacion', '-id')).
+    Sin `orden` se respeta el orden del queryset y se pagina por desplazamiento.
+    Con `contar=True` la página expone `total_texto` (conteo acotado o estimado).
+    """
+    token = _decodificar(request.GET.get('cursor', '')) or {}
+
+    if orden is None:
+        inicio = token.get('o', 0) if isinstance(token.get('o'), int) and token.get('o') > 0 else 0
+        filas = list(queryset[inicio:inicio + por_pagina + 1])
+        siguiente = _codificar({'o': inicio + por_pagina}) if len(filas) > por_pagina else None
+        anterior = None
+        if inicio:
+            anterior = _codificar({'o': max(inicio - por_pagina, 0)}) if inicio > por_pagina else ''
+        return PaginaCursor(request, filas[:por_pagina], siguiente, anterior, queryset, contar)
+
+    modelo = queryset.model
+    attnames = [modelo._meta.get_field(c.lstrip('-')).attname for c in orden]
+    base = queryset.order_by(*orden)
+    valores = token.get('v')
+    hacia_adelante = token.get('d', 'n') != 'p'
+
+    if isinstance(valores, list) and len(valores) == len(orden):
+        try:
+            condicion = _condicion_keyset(modelo, orden, valores, hacia_adelante)
+        except (ValidationError, ValueError, TypeError):
+            condicion, valores = None, None
+    else:
+        condicion, valores = None, None
+
+    pagina_qs = base
+    if condicion is not None:
+        pagina_qs = base.extra(**condicion) if isinstance(condicion, dict) else base.filter(condicion)
+    if not hacia_adelante and valores is not None:
+        pagina_qs = pagina_qs.reverse()
+
+    filas = list(pagina_qs[:por_pagina + 1])
+    hay_mas = len(filas) > por_pagina
+    filas = filas[:por_pagina]
+    if not hacia_adelante and valores is not None:
+        filas.reverse()
+
+    def cursor(fila, direccion):
+        valores_fila = [fila[a] if isinstance(fila, dict) else getattr(fila, a) for a in attnames]
+        return _codificar({'d': direccion, 'v': [_serializar(v) for v in valores_fila]})
+
+    if valores is None:
+        siguiente = cursor(filas[-1], 'n') if hay_mas else None
+        anterior = None
+    elif hacia_adelante:
+        siguiente = cursor(filas[-1], 'n') if hay_mas else None
+        anterior = cursor(filas[0], 'p') if filas else None
+    else:
+        siguiente = cursor(filas[-1], 'n') if filas else None
+        anterior = cursor(filas[0], 'p') if hay_mas else None
+    return PaginaCursor(request, filas, siguiente, anterior, queryset, contar)
@@ -0,0 +1,233 @@
+import base64
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from itertools import islice
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.utils.text import slugify
+from xhtml2pdf import pisa
+
+from .qr import huella_qr, obtener_qr
+from .tareas import encolar
+
+# --- PDF DE CV CON CACHÉ EN DISCO ---
+# Cada PDF se guarda como <PDF_CACHE_DIR>/cv/<id>-<huella>.pdf, donde la huella es un hash
+# de los campos que usa la plantilla y de la propia plantilla. Si el candidato cambia algo
+# que sale en el CV, la huella cambia y el archivo viejo deja de servirse: no hace falta
+# invalidar nada a mano. Al guardar un candidato se encola el render (ver signals), así el
+# worker (`manage.py procesar_tareas --hilos N`) lo tiene listo antes de la primera descarga.
+# Si aun así no está, la vista lo genera una vez y lo deja en disco para las siguientes.
+
+PLANTILLA_CV = 'pdf/cv_template.html'
+CAMPOS_CV = (
+    'nombre', 'titular', 'email', 'telefono', 'region', 'presentacion', 'experiencia', 'rubro',
+    'disponibilidad', 'pretension_renta', 'linkedin',
+)
+
+
+class ErrorPDF(Exception):
+    pass
+
+
+def _directorio(tipo):
+    return os.path.join(getattr(settings, 'PDF_CACHE_DIR', os.path.join(settings.BASE_DIR, 'cache_pdf')), tipo)
+
+
+def directorio_cv():
+    return _directorio('cv')
+
+
+@lru_cache(maxsize=None)
+def _huella_plantilla(plantilla):
+    return hashlib.sha256(get_template(plantilla).template.source.encode()).hexdigest()
+
+
+def _huella(plantilla, objeto, campos, *extra):
+    datos = [str(getattr(objeto, campo) or '') for campo in campos]
+    contenido = json.dumps([_huella_plantilla(plantilla), datos, *extra], ensure_ascii=False)
+    return hashlib.sha256(contenido.encode()).hexdigest()[:20]
+
+
+def _renderizar(plantilla, contexto, error):
+    html = get_template(plantilla).render(contexto)
+    salida = io.BytesIO()
+    if pisa.CreatePDF(html, dest=salida).err:
+        raise ErrorPDF(error)
+    return salida.getvalue()
+
+
+def _guardar(ruta, datos):
+    # Escritura atómica: una descarga concurrente nunca ve un PDF a medio escribir
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as archivo:
+        archivo.write(datos)
+    os.replace(temporal, ruta)
+
+
+def _borrar(directorio, objeto_id, excepto=None):
+    for ruta in glob.glob(os.path.join(directorio, f"{objeto_id}-*.pdf")):
+        if ruta != excepto:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+
+def huella_cv(candidato):
+    return _huella(PLANTILLA_CV, candidato, CAMPOS_CV)
+
+
+def ruta_cv(candidato, huella=None):
+    return os.path.join(directorio_cv(), f"{candidato.id}-{huella or huella_cv(candidato)}.pdf")
+
+
+def renderizar_cv(candidato):
+    return _renderizar(PLANTILLA_CV, {'candidato': candidato}, f"No se pudo generar el PDF del candidato {candidato.id}")
+
+
+def borrar_cv(candidato_id, excepto=None):
+    _borrar(directorio_cv(), candidato_id, excepto)
+
+
+def guardar_cv(candidato, datos, huella=None):
+    ruta = ruta_cv(candidato, huella)
+    _guardar(ruta, datos)
+    borrar_cv(candidato.id, excepto=ruta)  # versiones anteriores
+    return ruta
+
+
+def generar_cv(candidato):
+    """Renderiza y guarda el CV si no existe ya para su huella actual. Devuelve la ruta."""
+    ruta = ruta_cv(candidato)
+    if not os.path.exists(ruta):
+        guardar_cv(candidato, renderizar_cv(candidato))
+    return ruta
+
+
+def pregenerar_cv(candidato_id):
+    """Tarea del worker."""
+    from .models import Candidato
+    candidato = Candidato.objects.filter(id=candidato_id).first()
+    if candidato:
+        generar_cv(candidato)
+
+
+def encolar_cv(candidato):
+    # La huella en la clave: un mismo contenido se renderiza una sola vez
+    encolar('empleos.pdfs.pregenerar_cv', clave=f"cv:{candidato.id}:{huella_cv(candidato)}", candidato_id=candidato.id)
+
+
+# --- CVs DE TODOS LOS POSTULANTES DE UNA OFERTA (PARA EL ZIP) ---
+# Los PDF que ya están en disco se usan tal cual. Los que faltan se renderizan de a lotes en
+# un pool de procesos (xhtml2pdf es CPU puro y en hilos no escala por el GIL): el hijo solo
+# devuelve los bytes y el proceso web los guarda en la caché, así que en el hijo no se toca
+# la base de datos ni se depende de los ajustes del padre. Se usa 'spawn' para no copiar los
+# hilos y conexiones del servidor web.
+# Cuando empieza a salir el ZIP ya no hay vuelta atrás: un CV que falla por cualquier motivo
+# queda anotado en errores.txt y se sigue con el resto. Si un hijo muere, el pool queda
+# inservible y los CV que faltan se renderizan en el mismo proceso web.
+
+def _iniciar_proceso():
+    import django
+    django.setup()
+
+
+def _pool(procesos):
+    return ProcessPoolExecutor(
+        max_workers=procesos, mp_context=multiprocessing.get_context('spawn'), initializer=_iniciar_proceso,
+    )
+
+
+def cvs_de_postulaciones(postulaciones, procesos=None):
+    """Genera (nombre, contenido) para exportacion.zip_en_streaming: el CV en PDF de cada
+    postulante y, si lo subió, su CV adjunto. Al final, un errores.txt si algo falló."""
+    procesos = procesos or getattr(settings, 'PDF_PROCESOS', 2)
+    campos = ['candidato__id', 'candidato__cv', *(f'candidato__{campo}' for campo in CAMPOS_CV)]
+    filas = postulaciones.select_related('candidato').only(*campos).order_by('-fecha').iterator(chunk_size=procesos * 10)
+    pool, roto, errores, numero = None, False, [], 0
+    try:
+        while lote := [postulacion.candidato for postulacion in islice(filas, procesos * 4)]:
+            huellas = {candidato.id: huella_cv(candidato) for candidato in lote}
+            pendientes = {}
+            for candidato in lote:
+                if not os.path.exists(ruta_cv(candidato, huellas[candidato.id])):
+                    futuro = None  # None: se renderiza en este proceso
+                    if not roto:
+                        pool = pool or _pool(procesos)
+                        try:
+                            futuro = pool.submit(renderizar_cv, candidato)
+                        except BrokenProcessPool:
+                            roto = True
+                    pendientes[candidato.id] = futuro
+            for candidato in lote:
+                numero += 1
+                base = f"{numero:03d}_{slugify(candidato.nombre) or candidato.id}"
+                ruta = ruta_cv(candidato, huellas[candidato.id])
+                if candidato.id in pendientes:
+                    futuro = pendientes.pop(candidato.id)
+                    try:
+                        try:
+                            datos = futuro.result() if futuro else renderizar_cv(candidato)
+                        except BrokenProcessPool:
+                            roto = True
+                            datos = renderizar_cv(candidato)
+                        ruta = guardar_cv(candidato, datos, huellas[candidato.id])
+                    except Exception as e:
+                        errores.append(str(e) if isinstance(e, ErrorPDF) else f"No se pudo generar el PDF de {candidato.nombre}: {e!r}")
+                        ruta = None
+                if ruta:
+                    yield f"{base}.pdf", partial(open, ruta, 'rb')
+                if candidato.cv:
+                    if candidato.cv.storage.exists(candidato.cv.name):
+                        extension = os.path.splitext(candidato.cv.name)[1].lower()
+                        yield f"{base}_adjunto{extension}", partial(candidato.cv.open, 'rb')
+                    else:
+                        errores.append(f"No se encontró el CV adjunto de {candidato.nombre} ({candidato.cv.name})")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    if errores:
+        yield 'errores.txt', '\n'.join(errores).encode('utf-8')
+
+
+# --- CARTEL IMPRIMIBLE DE LA OFERTA EN PDF ---
+# Misma caché que los CV, en <PDF_CACHE_DIR>/carteles/<id>-<huella>.pdf. La huella incluye la
+# del QR. No se pregenera: la mayoría de las ofertas nunca se imprime; la primera descarga lo
+# renderiza y las siguientes (p. ej. una tienda imprimiendo muchas copias) salen del disco.
+
+PLANTILLA_CARTEL = 'pdf/cartel_oferta.html'
+CAMPOS_CARTEL = ('titulo', 'empresa', 'region', 'tipo', 'sueldo', 'descripcion')
+
+
+def huella_cartel(oferta):
+    return _huella(PLANTILLA_CARTEL, oferta, CAMPOS_CARTEL, huella_qr(oferta.id))
+
+
+def ruta_cartel(oferta, huella=None):
+    return os.path.join(_directorio('carteles'), f"{oferta.id}-{huella or huella_cartel(oferta)}.pdf")
+
+
+def generar_cartel(oferta):
+    """Renderiza y guarda el cartel si no existe ya para su huella actual. Devuelve la ruta."""
+    ruta = ruta_cartel(oferta)
+    if not os.path.exists(ruta):
+        qr_b64 = base64.b64encode(obtener_qr(oferta.id)).decode()
+        datos = _renderizar(
+            PLANTILLA_CARTEL, {'oferta': oferta, 'qr_b64': qr_b64}, f"No se pudo generar el cartel de la oferta {oferta.id}"
+        )
+        _guardar(ruta, datos)
+        borrar_cartel(oferta.id, excepto=ruta)
+    return ruta
+
+
+def borrar_cartel(oferta_id, excepto=None):
+    _borrar(_directorio('carteles'), oferta_id, excepto)
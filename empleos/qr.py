@@ -0,0 +1,68 @@
+import hashlib
+import io
+
+import qrcode
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from .tareas import encolar
+
+# --- CÓDIGOS QR DE LAS OFERTAS ---
+# El QR de una oferta solo depende de su URL pública (settings.URL_SITIO + /oferta/<id>/), así que se
+# genera una vez y queda en el storage de media como qr/oferta_<id>_<huella>.png. La huella
+# es de la URL: si cambia el dominio, el nombre cambia y se regenera solo. Se encola al
+# publicar la oferta (ver signals). Solo la tarea escribe el archivo: su clave es única por
+# oferta y URL, así que peticiones concurrentes no dejan copias con sufijo en el storage. Si
+# una petición llega antes que el worker, responde con un PNG generado en memoria.
+# La vista qr_oferta lo sirve como imagen aparte, con caché larga en el navegador.
+
+
+def url_oferta(oferta_id):
+    return f"{settings.URL_SITIO}{reverse('detalle', args=[oferta_id])}"
+
+
+def huella_qr(oferta_id):
+    return hashlib.sha256(url_oferta(oferta_id).encode()).hexdigest()[:12]
+
+
+def nombre_qr(oferta_id):
+    return f"qr/oferta_{oferta_id}_{huella_qr(oferta_id)}.png"
+
+
+def crear_png(url):
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(url)
+    qr.make(fit=True)
+    imagen = qr.make_image(fill='black', back_color='white').get_image().convert('1')  # 1 bit por pixel
+    salida = io.BytesIO()
+    imagen.save(salida, format='PNG', optimize=True)
+    return salida.getvalue()
+
+
+def obtener_qr(oferta_id):
+    """PNG del QR de la oferta: del storage si ya existe; si no, lo genera y encola su guardado."""
+    nombre = nombre_qr(oferta_id)
+    if default_storage.exists(nombre):
+        with default_storage.open(nombre, 'rb') as archivo:
+            return archivo.read()
+    encolar_qr(oferta_id)
+    return crear_png(url_oferta(oferta_id))
+
+
+def generar_qr(oferta_id):
+    """Tarea del worker: la única que escribe el archivo."""
+    nombre = nombre_qr(oferta_id)
+    if not default_storage.exists(nombre):
+        default_storage.save(nombre, ContentFile(crear_png(url_oferta(oferta_id))))
+
+
+def encolar_qr(oferta_id):
+    encolar('empleos.qr.generar_qr', clave=f"qr:{oferta_id}:{huella_qr(oferta_id)}", oferta_id=oferta_id)
+
+
+def borrar_qr(oferta_id):
+    nombre = nombre_qr(oferta_id)
+    if default_storage.exists(nombre):
+        default_storage.delete(nombre)
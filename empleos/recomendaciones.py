@@ -0,0 +1,133 @@
+import math
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .busqueda import tokenizar
+
+# --- OFERTAS SIMILARES PRECALCULADAS ---
+# Cada oferta publicada se describe con rasgos ponderados (palabras del título y etiquetas,
+# región, tipo y experiencia) guardados en RasgoOferta, indexado por rasgo. El puntaje entre
+# dos ofertas es la suma de peso_a * peso_b * idf de los rasgos compartidos; las N mejores se
+# guardan en OfertaSimilar y el detalle las lee con una sola consulta.
+
+TOP_N = 6
+MAX_VECINOS_ACTUALIZADOS = 50
+MAX_FRECUENCIA_CANDIDATO = 5000  # rasgos más comunes que esto no generan candidatos
+
+PESOS = {'t': 3.0, 'e': 2.0, 'r': 1.0, 'k': 1.0, 'x': 0.5}
+RASGOS_DISCRIMINANTES = ('t', 'e')
+
+
+def rasgos(oferta):
+    resultado = {}
+    for token in tokenizar(oferta.titulo):
+        resultado[f"t:{token}"] = PESOS['t']
+    for token in tokenizar(oferta.etiquetas):
+        resultado.setdefault(f"e:{token}", PESOS['e'])
+    if oferta.region:
+        resultado[f"r:{oferta.region}"] = PESOS['r']
+    if oferta.tipo:
+        resultado[f"k:{oferta.tipo}"] = PESOS['k']
+    if oferta.experiencia:
+        resultado[f"x:{oferta.experiencia}"] = PESOS['x']
+    return {rasgo[:60]: peso for rasgo, peso in resultado.items()}
+
+
+def indexar_rasgos(oferta):
+    from .models import RasgoOferta
+    RasgoOferta.objects.filter(oferta_id=oferta.id).delete()
+    if oferta.publicada:
+        RasgoOferta.objects.bulk_create([
+            RasgoOferta(oferta_id=oferta.id, rasgo=rasgo, peso=peso) for rasgo, peso in rasgos(oferta).items()
+        ])
+
+
+def puntajes_candidatos(oferta):
+    """Devuelve {oferta_id: puntaje} para las ofertas que comparten rasgos con `oferta`."""
+    from .models import OfertaLaboral, RasgoOferta
+    propios = rasgos(oferta)
+    total = cache.get_or_set('recomendaciones:total', lambda: OfertaLaboral.objects.filter(publicada=True).count(), 3600) or 1
+    frecuencias = dict(
+        RasgoOferta.objects.filter(rasgo__in=propios).values('rasgo').annotate(n=Count('id')).values_list('rasgo', 'n')
+    )
+    idf = {r: math.log(1 + total / frecuencias.get(r, 1)) for r in propios}
+
+    discriminantes = [
+        r for r in propios
+        if r.split(':', 1)[0] in RASGOS_DISCRIMINANTES and frecuencias.get(r, 0) <= MAX_FRECUENCIA_CANDIDATO
+    ]
+    if not discriminantes:
+        return {}
+    # Subconsulta: los candidatos no pasan por Python (un rasgo puede tener miles de ofertas)
+    candidatos = RasgoOferta.objects.filter(rasgo__in=discriminantes).exclude(oferta_id=oferta.id).values('oferta_id')
+    puntajes = defaultdict(float)
+    filas = RasgoOferta.objects.filter(oferta_id__in=candidatos, rasgo__in=propios).values_list('oferta_id', 'rasgo', 'peso')
+    for oferta_id, rasgo, peso in filas.iterator():
+        puntajes[oferta_id] += propios[rasgo] * peso * idf[rasgo]
+    return puntajes
+
+
+def mejores(puntajes, n=TOP_N):
+    """Los `n` mejores (oferta_id, puntaje); a igual puntaje, la oferta más reciente."""
+    return sorted(puntajes.items(), key=lambda par: (-par[1], -par[0]))[:n]
+
+
+def guardar_similares(oferta_id, lista):
+    from .models import OfertaSimilar
+    OfertaSimilar.objects.filter(oferta_id=oferta_id).delete()
+    OfertaSimilar.objects.bulk_create([
+        OfertaSimilar(oferta_id=oferta_id, similar_id=similar_id, puntaje=puntaje) for similar_id, puntaje in lista
+    ])
+
+
+def _incorporar_vecino(oferta_id, nuevo_id, puntaje):
+    from .models import OfertaSimilar
+    actuales = dict(OfertaSimilar.objects.filter(oferta_id=oferta_id).values_list('similar_id', 'puntaje'))
+    previo = actuales.get(nuevo_id)
+    if previo == puntaje:
+        return
+    actuales[nuevo_id] = puntaje
+    lista = mejores(actuales)
+    if previo is not None or nuevo_id in dict(lista):
+        guardar_similares(oferta_id, lista)
+
+
+def actualizar_similares(oferta_id, afectadas=()):
+    """Tarea: recalcula la lista de la oferta y la propaga a sus vecinas más cercanas.
+
+    `afectadas` son las ofertas que la listaban antes de borrarla (el CASCADE ya las quitó).
+    """
+    from .models import OfertaLaboral, OfertaSimilar
+    oferta = OfertaLaboral.objects.filter(id=oferta_id).first()
+    with transaction.atomic():
+        if oferta is None or not oferta.publicada:
+            afectadas = set(afectadas) | set(OfertaSimilar.objects.filter(similar_id=oferta_id).values_list('oferta_id', flat=True))
+            OfertaSimilar.objects.filter(similar_id=oferta_id).delete()
+            if oferta is not None:
+                indexar_rasgos(oferta)
+                guardar_similares(oferta_id, [])
+            for afectada in OfertaLaboral.objects.filter(id__in=afectadas, publicada=True):
+                guardar_similares(afectada.id, mejores(puntajes_candidatos(afectada)))
+            return
+
+        indexar_rasgos(oferta)
+        puntajes = puntajes_candidatos(oferta)
+        guardar_similares(oferta_id, mejores(puntajes))
+        # El puntaje es simétrico: la oferta nueva puede entrar en la lista de sus vecinas
+        for vecina_id, puntaje in mejores(puntajes, MAX_VECINOS_ACTUALIZADOS):
+            _incorporar_vecino(vecina_id, oferta_id, puntaje)
+
+
+def similares_de(oferta, n=3):
+    from .models import OfertaLaboral
+    ids = list(
+        oferta.similares_precalculadas.filter(similar__publicada=True)
+        .order_by('-puntaje').values_list('similar_id', flat=True)[:n]
+    )
+    if not ids:
+        return OfertaLaboral.objects.filter(tipo=oferta.tipo, publicada=True).exclude(id=oferta.id).order_by('-fecha_publicacion')[:n]
+    por_id = OfertaLaboral.objects.only('id', 'titulo', 'empresa', 'region').in_bulk(ids)
+    return [por_id[i] for i in ids if i in por_id]
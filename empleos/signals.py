@@ -0,0 +1,106 @@
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import invalidar
+from .estadisticas import programar_actualizacion
+from .imagenes import CAMPOS_IMAGEN, encolar_imagenes
+from .models import Candidato, Noticia, OfertaLaboral, OfertaSimilar, PerfilEmpresa, Postulacion, Servicio
+from .pdfs import CAMPOS_CV, borrar_cartel, borrar_cv, encolar_cv
+from .qr import borrar_qr, encolar_qr
+from .tareas import encolar
+
+GRUPOS_POR_MODELO = {
+    OfertaLaboral: 'ofertas',
+    Servicio: 'servicios',
+    PerfilEmpresa: 'empresas',
+    Noticia: 'noticias',
+    Candidato: 'candidatos',
+}
+
+
+@receiver([post_save, post_delete], sender=OfertaLaboral)
+@receiver([post_save, post_delete], sender=Servicio)
+@receiver([post_save, post_delete], sender=PerfilEmpresa)
+@receiver([post_save, post_delete], sender=Noticia)
+@receiver([post_save, post_delete], sender=Candidato)
+def invalidar_cache_publica(sender, **kwargs):
+    invalidar(GRUPOS_POR_MODELO[sender])
+
+
+CAMPOS_RECOMENDACION = {'titulo', 'etiquetas', 'region', 'tipo', 'experiencia', 'publicada'}
+
+
+def _encolar_similares(instance):
+    # La clave se arma al confirmar: varios save() de la misma oferta en una transacción dejan una sola tarea
+    encolar('empleos.recomendaciones.actualizar_similares',
+            clave=f"similares:{instance.id}:{instance.fecha_modificacion.isoformat()}", oferta_id=instance.id)
+
+
+@receiver(post_save, sender=OfertaLaboral)
+def recalcular_similares(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or CAMPOS_RECOMENDACION & set(update_fields):
+        transaction.on_commit(partial(_encolar_similares, instance))
+
+
+@receiver(pre_delete, sender=OfertaLaboral)
+def retirar_de_similares(sender, instance, **kwargs):
+    afectadas = list(OfertaSimilar.objects.filter(similar_id=instance.id).values_list('oferta_id', flat=True))
+    transaction.on_commit(partial(
+        encolar, 'empleos.recomendaciones.actualizar_similares', clave=f"similares:{instance.id}:borrada",
+        oferta_id=instance.id, afectadas=afectadas,
+    ))
+
+
+@receiver([post_save, post_delete], sender=OfertaLaboral)
+@receiver([post_save, post_delete], sender=Postulacion)
+@receiver([post_save, post_delete], sender=Candidato)
+@receiver([post_save, post_delete], sender=PerfilEmpresa)
+@receiver(post_delete, sender=User)
+def actualizar_estadisticas(sender, **kwargs):
+    programar_actualizacion()
+
+
+@receiver(post_save, sender=User)
+def contar_registro(sender, created, **kwargs):
+    # Cada login guarda last_login: solo los registros nuevos cambian las cifras
+    if created:
+        programar_actualizacion()
+
+
+@receiver(post_save, sender=Candidato)
+def pregenerar_cv(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(CAMPOS_CV) & set(update_fields):
+        encolar_cv(instance)
+
+
+@receiver(post_delete, sender=Candidato)
+def borrar_cv_candidato(sender, instance, **kwargs):
+    borrar_cv(instance.id)
+
+
+@receiver(post_save, sender=OfertaLaboral)
+def pregenerar_qr(sender, instance, update_fields=None, **kwargs):
+    # Tras el commit: una oferta que se deshace (p. ej. en el benchmark) no deja archivos
+    if instance.publicada and (update_fields is None or 'publicada' in update_fields):
+        transaction.on_commit(partial(encolar_qr, instance.id))
+
+
+@receiver(post_delete, sender=OfertaLaboral)
+def borrar_impresos_oferta(sender, instance, **kwargs):
+    borrar_qr(instance.id)
+    borrar_cartel(instance.id)
+
+
+@receiver(post_save, sender=PerfilEmpresa)
+@receiver(post_save, sender=OfertaLaboral)
+@receiver(post_save, sender=Candidato)
+@receiver(post_save, sender=Servicio)
+@receiver(post_save, sender=Noticia)
+def procesar_imagenes(sender, instance, update_fields=None, **kwargs):
+    campos = CAMPOS_IMAGEN[sender.__name__]
+    if any(getattr(instance, campo) for campo in campos) and (update_fields is None or set(campos) & set(update_fields)):
+        transaction.on_commit(partial(encolar_imagenes, instance))
@@ -0,0 +1,222 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .alertas import palabras_de_alerta
+from .busqueda import construir_documento, construir_documento_candidato
+from .cache import invalidar
+from .models import (
+    AlertaEmpleo, Candidato, NIVEL_EXPERIENCIA, OfertaLaboral, PalabraAlerta, PerfilEmpresa, Postulacion,
+    REGIONES_CHILE, RUBROS_CHILE, TIPO_TRABAJO,
+)
+
+# --- DATOS SINTÉTICOS PARA PRUEBAS DE CARGA ---
+# Genera empresas, ofertas, candidatos, postulaciones y alertas con bulk_create por lotes:
+# la memoria no depende de la escala. Como bulk_create no pasa por save(), aquí se calculan
+# a mano los documentos de búsqueda y el índice de palabras de las alertas.
+# Todos los usuarios creados empiezan con PREFIJO, así `eliminar_sinteticos` los encuentra
+# (y el CASCADE borra sus ofertas, postulaciones, etc.).
+
+PREFIJO = 'sintetico_'
+DOMINIO = 'sintetico.example.com'
+
+ESCALAS = {
+    'pequena': {'empresas': 20, 'ofertas': 2000, 'candidatos': 1000, 'postulaciones': 8000, 'alertas': 500},
+    'media': {'empresas': 500, 'ofertas': 50000, 'candidatos': 20000, 'postulaciones': 200000, 'alertas': 10000},
+    'grande': {'empresas': 5000, 'ofertas': 500000, 'candidatos': 200000, 'postulaciones': 2000000, 'alertas': 100000},
+}
+
+CARGOS = [
+    'Vendedor', 'Cajero', 'Reponedor', 'Bodeguero', 'Conductor', 'Guardia de Seguridad', 'Recepcionista',
+    'Asistente Administrativo', 'Contador', 'Analista Contable', 'Ejecutivo Comercial', 'Ingeniero Civil',
+    'Desarrollador Python', 'Desarrollador Frontend', 'Soporte TI', 'Analista de Datos', 'Enfermera',
+    'Técnico en Enfermería', 'Kinesiólogo', 'Cocinero', 'Garzón', 'Barista', 'Maestro Gasfiter',
+    'Electricista', 'Operador de Grúa', 'Jornal', 'Profesor de Inglés', 'Diseñador Gráfico',
+    'Community Manager', 'Ejecutivo de Call Center', 'Jefe de Local', 'Supervisor de Turno',
+]
+CALIFICATIVOS = ['', '', '', 'Senior', 'Junior', 'Part Time', 'con Experiencia', 'Turno Noche', 'Bilingüe', 'Licencia A4']
+ETIQUETAS = ['Excel', 'Ventas', 'Licencia B', 'Python', 'SQL', 'Atención al cliente', 'Inglés', 'Caja', 'Turnos', 'SAP']
+FRASES = [
+    'Buscamos personas proactivas y con ganas de crecer.',
+    'Ofrecemos contrato indefinido después del periodo de prueba.',
+    'Se valorará experiencia previa en el rubro.',
+    'Horario de lunes a viernes con sábados alternados.',
+    'Incluye bonos por cumplimiento de metas y colación.',
+    'Trabajo en equipo, buen clima laboral y capacitación constante.',
+    'Requisito excluyente: enseñanza media completa.',
+    'Disponibilidad inmediata para incorporarse.',
+]
+NOMBRES = ['Camila', 'Matías', 'Valentina', 'Benjamín', 'Javiera', 'Vicente', 'Catalina', 'Martín', 'Fernanda', 'Diego', 'Constanza', 'Tomás']
+APELLIDOS = ['González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez']
+EMPRESAS = ['Comercial', 'Servicios', 'Constructora', 'Transportes', 'Inversiones', 'Alimentos', 'Tecnología', 'Clínica']
+
+REGIONES = [codigo for codigo, _ in REGIONES_CHILE]
+# Santiago concentra buena parte de las ofertas reales; los listados por región deben notarlo
+PESOS_REGION = [8 if codigo == 'RM' else 2 if codigo in ('VA', 'BI') else 1 for codigo in REGIONES]
+TIPOS = [codigo for codigo, _ in TIPO_TRABAJO]
+NIVELES = [codigo for codigo, _ in NIVEL_EXPERIENCIA]
+RUBROS = [codigo for codigo, _ in RUBROS_CHILE]
+
+
+def _en_lotes(generador, tamano):
+    lote = []
+    for item in generador:
+        lote.append(item)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _ultimo_id(modelo):
+    return modelo.objects.aggregate(maximo=Max('id'))['maximo'] or 0
+
+
+def _cargo(azar):
+    return f"{azar.choice(CARGOS)} {azar.choice(CALIFICATIVOS)}".strip()
+
+
+class Sembrador:
+    def __init__(self, lote=5000, semilla=1, avisar=None):
+        self.lote = lote
+        self.azar = random.Random(semilla)
+        self.avisar = avisar or (lambda mensaje: None)
+        self.ahora = timezone.now()
+
+    def _insertar(self, modelo, objetos, total):
+        hechos = 0
+        for lote in _en_lotes(objetos, self.lote):
+            with transaction.atomic():
+                modelo.objects.bulk_create(lote, batch_size=self.lote)
+            hechos += len(lote)
+            self.avisar(f"{modelo._meta.verbose_name_plural}: {hechos}/{total}")
+        return hechos
+
+    def empresas(self, cantidad):
+        desde = _ultimo_id(User)
+        inicio = User.objects.filter(username__startswith=f"{PREFIJO}empresa_").count()
+        usuarios = (
+            User(username=f"{PREFIJO}empresa_{inicio + i}", email=f"empresa{inicio + i}@{DOMINIO}", password='!')
+            for i in range(cantidad)
+        )
+        self._insertar(User, usuarios, cantidad)
+        ids = list(User.objects.filter(id__gt=desde, username__startswith=f"{PREFIJO}empresa_").values_list('id', flat=True))
+        perfiles = (
+            PerfilEmpresa(usuario_id=id_usuario, nombre=f"{self.azar.choice(EMPRESAS)} {self.azar.choice(APELLIDOS)} {id_usuario} SpA")
+            for id_usuario in ids
+        )
+        self._insertar(PerfilEmpresa, perfiles, len(ids))
+        return ids
+
+    def ofertas(self, cantidad, empresas):
+        desde = _ultimo_id(OfertaLaboral)
+        azar = self.azar
+
+        def generar():
+            for _ in range(cantidad):
+                oferta = OfertaLaboral(
+                    usuario_id=azar.choice(empresas), titulo=_cargo(azar), empresa=azar.choice(EMPRESAS),
+                    tipo=azar.choice(TIPOS), region=azar.choices(REGIONES, PESOS_REGION)[0], experiencia=azar.choice(NIVELES),
+                    sueldo=azar.choice([None, azar.randrange(500000, 3000000, 10000)]),
+                    etiquetas=', '.join(azar.sample(ETIQUETAS, 2)), descripcion=' '.join(azar.sample(FRASES, 4)),
+                    fecha_publicacion=self.ahora - timedelta(minutes=azar.randrange(180 * 24 * 60)),
+                    publicada=azar.random() < 0.9, pagada=True, es_destacado=azar.random() < 0.02,
+                    visitas=azar.randrange(500),
+                )
+                oferta.documento_busqueda = construir_documento(oferta)
+                yield oferta
+
+        self._insertar(OfertaLaboral, generar(), cantidad)
+        return list(OfertaLaboral.objects.filter(id__gt=desde).values_list('id', flat=True))
+
+    def candidatos(self, cantidad):
+        desde = _ultimo_id(Candidato)
+        azar = self.azar
+
+        def generar():
+            for i in range(cantidad):
+                nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}"
+                candidato = Candidato(
+                    nombre=nombre, titular=_cargo(azar), rubro=azar.choice(RUBROS),
+                    region=azar.choices(REGIONES, PESOS_REGION)[0], experiencia=azar.choice(NIVELES),
+                    pretension_renta=azar.randrange(450000, 2500000, 10000), email=f"candidato{desde + i}@{DOMINIO}",
+                    telefono=f"569{azar.randrange(10000000, 99999999)}", presentacion=' '.join(azar.sample(FRASES, 2)),
+                    publicado=azar.random() < 0.85,
+                )
+                candidato.documento_busqueda = construir_documento_candidato(candidato)
+                yield candidato
+
+        self._insertar(Candidato, generar(), cantidad)
+        return list(Candidato.objects.filter(id__gt=desde).values_list('id', flat=True))
+
+    def postulaciones(self, cantidad, ofertas, candidatos):
+        # Cada candidato postula a ofertas distintas (unique_together oferta+candidato)
+        if not ofertas or not candidatos:
+            return 0
+        azar = self.azar
+        estados = [codigo for codigo, _ in Postulacion.ESTADOS]
+        por_candidato = min(max(cantidad // len(candidatos), 1), len(ofertas))
+
+        def generar():
+            creadas = 0
+            for id_candidato in candidatos:
+                for id_oferta in azar.sample(ofertas, por_candidato):
+                    if creadas >= cantidad:
+                        return
+                    creadas += 1
+                    yield Postulacion(oferta_id=id_oferta, candidato_id=id_candidato, estado=azar.choices(estados, [6, 2, 1, 2, 1])[0])
+
+        return self._insertar(Postulacion, generar(), min(cantidad, por_candidato * len(candidatos)))
+
+    def alertas(self, cantidad):
+        desde = _ultimo_id(AlertaEmpleo)
+        azar = self.azar
+        frecuencias = [codigo for codigo, _ in AlertaEmpleo.FRECUENCIAS]
+        alertas = (
+            AlertaEmpleo(
+                email=f"alerta{desde + i}@{DOMINIO}", palabra_clave=azar.choice(CARGOS).split()[0],
+                region=azar.choices(REGIONES, PESOS_REGION)[0], frecuencia=azar.choices(frecuencias, [6, 3, 1])[0],
+            ) for i in range(cantidad)
+        )
+        self._insertar(AlertaEmpleo, alertas, cantidad)
+
+        def palabras():
+            filas = AlertaEmpleo.objects.filter(id__gt=desde).values_list('id', 'palabra_clave', 'region')
+            for id_alerta, clave, region in filas.iterator(chunk_size=self.lote):
+                tokens = palabras_de_alerta(clave)
+                for token in tokens:
+                    yield PalabraAlerta(alerta_id=id_alerta, token=token, region=region, tokens_requeridos=len(tokens))
+
+        self._insertar(PalabraAlerta, palabras(), cantidad)
+
+
+def sembrar(empresas, ofertas, candidatos, postulaciones, alertas, lote=5000, semilla=1, avisar=None):
+    """Crea los datos sintéticos y devuelve cuántos registros hay de cada tipo."""
+    sembrador = Sembrador(lote=lote, semilla=semilla, avisar=avisar)
+    ids_empresas = sembrador.empresas(empresas)
+    ids_ofertas = sembrador.ofertas(ofertas, ids_empresas) if ids_empresas else []
+    ids_candidatos = sembrador.candidatos(candidatos)
+    total_postulaciones = sembrador.postulaciones(postulaciones, ids_ofertas, ids_candidatos)
+    sembrador.alertas(alertas)
+    # bulk_create no dispara señales: se invalidan a mano las páginas cacheadas
+    invalidar('ofertas', 'empresas', 'candidatos')
+    return {
+        'empresas': len(ids_empresas), 'ofertas': len(ids_ofertas), 'candidatos': len(ids_candidatos),
+        'postulaciones': total_postulaciones, 'alertas': alertas,
+    }
+
+
+def eliminar_sinteticos():
+    usuarios = User.objects.filter(username__startswith=PREFIJO)
+    borrados = {
+        'candidatos': Candidato.objects.filter(email__endswith=f"@{DOMINIO}").delete()[0],
+        'alertas': AlertaEmpleo.objects.filter(email__endswith=f"@{DOMINIO}").delete()[0],
+        'usuarios': usuarios.delete()[0],
+    }
+    invalidar('ofertas', 'empresas', 'candidatos')
+    return borrados
@@ -1,12 +1,176 @@
+import gzip
+import os
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
-from .models import OfertaLaboral
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+
+from .models import Candidato, Noticia, OfertaLaboral, PerfilEmpresa, Servicio
+
+# --- SITEMAPS POR SECCIÓN, GENERADOS A ARCHIVO ---
+# `manage.py generar_sitemaps` (programado con cron) escribe en SITEMAPS_DIR
+# un sitemap.xml índice y un sitemap-<sección>-<n>.xml (+ .gz) por cada bloque de
+# LIMITE_URLS direcciones. Las vistas de abajo solo sirven esos archivos: ningún crawler
+# dispara consultas a la base de datos.
+
+LIMITE_URLS = 10000  # muy bajo el máximo de 50.000 del protocolo
+
+
+class SitemapBase(Sitemap):
+    limit = LIMITE_URLS
+    protocol = 'https'
 
-class OfertaSitemap(Sitemap):
+    def lastmod(self, obj):
+        return obj.fecha_modificacion
+
+
+class OfertaSitemap(SitemapBase):
     changefreq = "daily"
     priority = 0.8
 
     def items(self):
-        return OfertaLaboral.objects.filter(publicada=True).order_by('-fecha_publicacion')
+        return OfertaLaboral.objects.filter(publicada=True).only('id', 'fecha_modificacion').order_by('id')
 
-    def lastmod(self, obj):
-        return obj.fecha_publicacion
\ No newline at end of file
+    def location(self, obj):
+        return reverse('detalle', args=[obj.id])
+
+
+class EmpresaSitemap(SitemapBase):
+    changefreq = "weekly"
+    priority = 0.6
+
+    def items(self):
+        return (
+            PerfilEmpresa.objects.exclude(nombre__isnull=True).exclude(nombre='').exclude(nombre__contains='/')
+            .only('id', 'nombre', 'fecha_modificacion').order_by('id')
+        )
+
+    def location(self, obj):
+        return reverse('perfil_empresa', args=[obj.nombre])
+
+
+class ServicioSitemap(SitemapBase):
+    changefreq = "weekly"
+    priority = 0.5
+
+    def items(self):
+        return Servicio.objects.filter(publicado=True).only('id', 'fecha_modificacion').order_by('id')
+
+    def location(self, obj):
+        return reverse('detalle_servicio', args=[obj.id])
+
+
+class NoticiaSitemap(SitemapBase):
+    changefreq = "monthly"
+    priority = 0.5
+
+    def items(self):
+        return Noticia.objects.only('id', 'fecha_modificacion').order_by('id')
+
+    def location(self, obj):
+        return reverse('detalle_noticia', args=[obj.id])
+
+
+class CandidatoSitemap(SitemapBase):
+    changefreq = "weekly"
+    priority = 0.4
+
+    def items(self):
+        return Candidato.objects.filter(publicado=True).only('id', 'fecha_modificacion').order_by('id')
+
+    def location(self, obj):
+        return reverse('detalle_candidato', args=[obj.id])
+
+
+SITEMAPS = {
+    'ofertas': OfertaSitemap,
+    'empresas': EmpresaSitemap,
+    'servicios': ServicioSitemap,
+    'blog': NoticiaSitemap,
+    'candidatos': CandidatoSitemap,
+}
+
+
+def directorio_sitemaps():
+    return getattr(settings, 'SITEMAPS_DIR', os.path.join(settings.BASE_DIR, 'sitemaps'))
+
+
+def _escribir(directorio, nombre, contenido):
+    # Escritura atómica: un crawler nunca lee un archivo a medio escribir
+    datos = contenido.encode('utf-8')
+    for ruta, cuerpo in ((nombre, datos), (nombre + '.gz', gzip.compress(datos, mtime=0))):
+        temporal = os.path.join(directorio, f'.{ruta}.tmp')
+        with open(temporal, 'wb') as archivo:
+            archivo.write(cuerpo)
+        os.replace(temporal, os.path.join(directorio, ruta))
+
+
+def generar_sitemaps(directorio=None):
+    """Escribe el índice y todas las secciones. Devuelve {sección: número de archivos}."""
+    directorio = directorio or directorio_sitemaps()
+    os.makedirs(directorio, exist_ok=True)
+    url_sitio = urlsplit(settings.URL_SITIO)
+    sitio = SimpleNamespace(domain=url_sitio.netloc)
+
+    indice, escritos, resumen = [], set(), {}
+    for seccion, clase in SITEMAPS.items():
+        sitemap = clase()
+        paginas = sitemap.paginator.num_pages if sitemap.paginator.count else 0
+        for pagina in range(1, paginas + 1):
+            urls = sitemap.get_urls(page=pagina, site=sitio, protocol=url_sitio.scheme)
+            nombre = f'sitemap-{seccion}-{pagina}.xml'
+            _escribir(directorio, nombre, render_to_string('sitemap.xml', {'urlset': urls}))
+            escritos.add(nombre)
+            indice.append({
+                'location': f"{settings.URL_SITIO}{reverse('sitemap_seccion', args=[nombre])}",
+                'last_mod': max((u['lastmod'] for u in urls if u['lastmod']), default=None),
+            })
+        resumen[seccion] = paginas
+    _escribir(directorio, 'sitemap.xml', render_to_string('sitemap_index.xml', {'sitemaps': indice}))
+
+    # Bloques que ya no existen (p. ej. se despublicaron muchas ofertas)
+    for archivo in os.listdir(directorio):
+        base = archivo[:-3] if archivo.endswith('.gz') else archivo
+        if base.startswith('sitemap-') and base.endswith('.xml') and base not in escritos:
+            os.remove(os.path.join(directorio, archivo))
+    return resumen
+
+
+# --- VISTAS ---
+
+def _servir(request, nombre):
+    directorio = directorio_sitemaps()
+    ruta = os.path.join(directorio, nombre)
+    if not os.path.exists(ruta):
+        if nombre != 'sitemap.xml':
+            raise Http404
+        # Primera visita tras un despliegue sin archivos: se generan una vez
+        if not cache.add('sitemaps:generando', 1, 600):
+            return HttpResponse(status=503, headers={'Retry-After': '60'})
+        try:
+            generar_sitemaps(directorio)
+        finally:
+            cache.delete('sitemaps:generando')
+
+    comprimido = 'gzip' in request.headers.get('Accept-Encoding', '') and os.path.exists(ruta + '.gz')
+    respuesta = FileResponse(open(ruta + '.gz' if comprimido else ruta, 'rb'), content_type='application/xml')
+    if comprimido:
+        respuesta['Content-Encoding'] = 'gzip'
+    respuesta['Cache-Control'] = 'public, max-age=3600'
+    patch_vary_headers(respuesta, ['Accept-Encoding'])
+    return respuesta
+
+
+def sitemap_indice(request):
+    return _servir(request, 'sitemap.xml')
+
+
+def sitemap_seccion(request, nombre):
+    # `nombre` ya viene validado por la URL: sitemap-<sección>-<n>.xml
+    return _servir(request, nombre)
@@ -0,0 +1,106 @@
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# --- COLA DE TAREAS EN BASE DE DATOS ---
+# encolar() guarda la tarea; el comando `manage.py procesar_tareas` la ejecuta.
+# Una tarea tomada queda "invisible" durante VISIBILIDAD segundos: si el worker muere,
+# vuelve a estar disponible para otro (si era su último intento, queda FALLIDA). Los fallos
+# se reintentan con backoff exponencial.
+
+VISIBILIDAD = 300
+BACKOFF_BASE = 30
+BACKOFF_MAXIMO = 3600
+
+
+def encolar(funcion, clave=None, retraso=0, max_intentos=5, **datos):
+    """Encola `funcion` (ruta 'modulo.funcion') con `datos` como argumentos.
+
+    Si se indica `clave`, una segunda llamada con la misma clave no crea otra tarea.
+    """
+    from .models import Tarea
+    import_string(funcion)  # falla aquí, no en el worker, si la ruta está mal
+    valores = {
+        'funcion': funcion, 'datos': datos, 'max_intentos': max_intentos,
+        'disponible_desde': timezone.now() + timedelta(seconds=retraso),
+    }
+    if clave is None:
+        tarea = Tarea.objects.create(**valores)
+    else:
+        try:
+            with transaction.atomic():
+                tarea, _ = Tarea.objects.get_or_create(clave=clave, defaults=valores)
+        except IntegrityError:
+            tarea = Tarea.objects.get(clave=clave)
+    if getattr(settings, 'TAREAS_SINCRONAS', False) and tarea.estado == Tarea.PENDIENTE:
+        ejecutar(tarea)
+    return tarea
+
+
+def reclamar(limite=10, visibilidad=VISIBILIDAD):
+    """Toma hasta `limite` tareas listas. Cada UPDATE condicional garantiza un único dueño."""
+    from .models import Tarea
+    ahora = timezone.now()
+    # Una tarea que mata a su worker (memoria, señal) nunca llega al except de ejecutar():
+    # vencida su visibilidad en el último intento, se da por fallida en vez de reclamarla otra vez
+    Tarea.objects.filter(
+        estado=Tarea.EJECUTANDO, bloqueada_hasta__lt=ahora, intentos__gte=F('max_intentos'),
+    ).update(
+        estado=Tarea.FALLIDA, bloqueada_hasta=None, fecha_fin=ahora,
+        error='Se agotó la visibilidad sin que el worker terminara la tarea (visibility timeout exceeded).',
+    )
+    candidatas = Tarea.objects.filter(
+        Q(estado=Tarea.PENDIENTE, disponible_desde__lte=ahora)
+        | Q(estado=Tarea.EJECUTANDO, bloqueada_hasta__lt=ahora, intentos__lt=F('max_intentos'))
+    ).order_by('disponible_desde').values_list('id', 'estado', 'bloqueada_hasta')[:limite]
+
+    tomadas = []
+    for tarea_id, estado, bloqueada_hasta in candidatas:
+        ok = Tarea.objects.filter(id=tarea_id, estado=estado, bloqueada_hasta=bloqueada_hasta).update(
+            estado=Tarea.EJECUTANDO, bloqueada_hasta=ahora + timedelta(seconds=visibilidad),
+            intentos=F('intentos') + 1,
+        )
+        if ok:
+            tomadas.append(tarea_id)
+    return list(Tarea.objects.filter(id__in=tomadas))
+
+
+def ejecutar(tarea):
+    from .models import Tarea
+    if tarea.estado == Tarea.PENDIENTE:
+        # Ejecución directa (TAREAS_SINCRONAS): se cuenta el intento igual que en reclamar()
+        tarea.intentos += 1
+    try:
+        import_string(tarea.funcion)(**tarea.datos)
+    except Exception:
+        tarea.error = traceback.format_exc()[-2000:]
+        if tarea.intentos >= tarea.max_intentos:
+            tarea.estado = Tarea.FALLIDA
+        else:
+            espera = min(BACKOFF_BASE * 2 ** (tarea.intentos - 1), BACKOFF_MAXIMO)
+            tarea.estado = Tarea.PENDIENTE
+            tarea.disponible_desde = timezone.now() + timedelta(seconds=espera * random.uniform(0.8, 1.2))
+    else:
+        tarea.estado = Tarea.COMPLETADA
+        tarea.error = ''
+    tarea.bloqueada_hasta = None
+    tarea.fecha_fin = timezone.now() if tarea.estado in (Tarea.COMPLETADA, Tarea.FALLIDA) else None
+    tarea.save(update_fields=['estado', 'intentos', 'error', 'disponible_desde', 'bloqueada_hasta', 'fecha_fin'])
+    return tarea.estado == Tarea.COMPLETADA
+
+
+# --- TAREAS ---
+
+def enviar_correo(asunto, mensaje, destinatarios):
+    send_mail(asunto, mensaje, None, destinatarios, fail_silently=False)
+
+
+def encolar_correo(asunto, mensaje, destinatarios, clave=None):
+    return encolar('empleos.tareas.enviar_correo', clave=clave, asunto=asunto, mensaje=mensaje, destinatarios=list(destinatarios))
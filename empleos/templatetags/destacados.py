@@ -0,0 +1,28 @@
+from django import template
+
+from empleos.cache import versiones
+from empleos.models import OfertaLaboral, PerfilEmpresa
+
+register = template.Library()
+
+# La barra lateral de destacados es la misma en todos los listados: se cachea como fragmento
+# (parciales/destacados.html) con la versión de 'ofertas' y 'empresas'. Las páginas enteras
+# ya se cachean para anónimos (cache_publico); el fragmento ahorra las consultas a los usuarios
+# con sesión. Los querysets son perezosos: con el fragmento en caché no se ejecutan.
+MAX_OFERTAS = 5
+MAX_EMPRESAS = 8
+
+
+@register.inclusion_tag('parciales/destacados.html')
+def destacados():
+    return {
+        'version_destacados': versiones('ofertas', 'empresas'),
+        'ofertas_destacadas': (
+            OfertaLaboral.objects.filter(publicada=True, es_destacado=True)
+            .order_by('-fecha_publicacion').only('id', 'titulo', 'empresa')[:MAX_OFERTAS]
+        ),
+        'empresas_destacadas': (
+            PerfilEmpresa.objects.filter(es_destacada=True).exclude(nombre__isnull=True).exclude(nombre='').exclude(logo='')
+            .order_by('nombre').only('id', 'nombre', 'logo')[:MAX_EMPRESAS]
+        ),
+    }
@@ -0,0 +1,53 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from empleos.imagenes import TIPOS_MIME, nombre_variante, variantes
+
+register = template.Library()
+
+# Ancho con que se muestra la imagen en cada uso (atributo `sizes`): el navegador elige del
+# srcset la variante más liviana que alcance.
+USOS = {
+    'carrusel': '160px',  # logos, avatares y miniaturas
+    'tarjeta': '(max-width: 576px) 100vw, 400px',
+    'detalle': '(max-width: 992px) 100vw, 800px',
+}
+
+
+def _srcset(nombre, disponibles, formato):
+    return ', '.join(
+        f"{default_storage.url(nombre_variante(nombre, ancho, f))} {ancho}w" for f, ancho in disponibles if f == formato
+    )
+
+
+@register.simple_tag
+def imagen(archivo, uso='tarjeta', **atributos):
+    """<picture> con srcset en los formatos generados; mientras no existan, el <img> original.
+
+    {% imagen oferta.imagen 'carrusel' class="img-fluid" alt=oferta.empresa %}
+    """
+    if not archivo:
+        return ''
+    atributos.setdefault('loading', 'eager' if uso == 'detalle' else 'lazy')
+    atributos.setdefault('decoding', 'async')
+    img = format_html('<img src="{}"{}>', archivo.url, flatatt(atributos))
+    disponibles = variantes(archivo.name)
+    if not disponibles:
+        return img
+    formatos = [formato for formato in TIPOS_MIME if any(f == formato for f, _ in disponibles)]
+    fuentes = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((TIPOS_MIME[formato], _srcset(archivo.name, disponibles, formato), USOS[uso]) for formato in formatos),
+    )
+    return format_html('<picture>{}{}</picture>', fuentes, img)
+
+
+@register.simple_tag
+def imagen_url(archivo, ancho=1280):
+    """URL de la variante más grande que no supere `ancho` (para fondos CSS); si no hay, el original."""
+    if not archivo:
+        return ''
+    candidatas = [a for f, a in variantes(archivo.name) if f == 'webp' and a <= ancho]
+    return default_storage.url(nombre_variante(archivo.name, max(candidatas), 'webp')) if candidatas else archivo.url
@@ -1,3 +1,1233 @@
-from django.test import TestCase
+import base64
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.mail.backends import locmem
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import benchmark, imagenes, mapa, metricas, pdfs, sitemaps
+from .alertas import alertas_para_oferta
+from .busqueda import BuscadorBasico, buscar_ofertas, obtener_buscador
+from .cache import invalidar, versiones
+from .compatibilidad import detalle_compatibilidad, puntajes_oferta
+from .correos import generar_resumenes, mensaje_alerta
+from .estadisticas import INTERVALO_ACTUALIZACION, actualizar, foto_actual, programar_actualizacion, tendencia
+from .exportacion import zip_en_streaming
+from .models import (
+    AlertaEmpleo, Candidato, EnvioResumen, EstadisticaDiaria, Favorito, Notificacion, OfertaLaboral, OfertaSimilar,
+    PalabraAlerta, PerfilEmpresa, Postulacion, Pregunta, Servicio, Tarea, VisitaDiaria,
+)
+from .paginacion import paginar_cursor
+from .pdfs import ruta_cartel, ruta_cv
+from .qr import nombre_qr, obtener_qr, url_oferta
+from .recomendaciones import mejores, puntajes_candidatos
+from .sinteticos import sembrar
+from .tareas import ejecutar, encolar, encolar_correo, reclamar
+from .views import ofertas_con_resumen
+from .visitas import BufferVisitas, guardar_visitas
+
+REGIONES = ['RM', 'VA', 'BI', 'AR', 'MA']
+TIPOS = ['full_time', 'part_time', 'PRA']  # lista_practicas filtra por 'PRA'
+RUBROS = ['admin', 'salud', 'construccion', 'otro']
+NIVELES = ['sin_experiencia', 'junior', 'semi_senior', 'senior']
+
+
+class DirectorioTemporalMixin:
+    """Un directorio temporal por test (self.directorio), borrado al terminar.
+
+    `ajustes_directorio` apunta settings a subcarpetas suyas, p. ej. {'MEDIA_ROOT': 'media'}.
+    """
+    ajustes_directorio = {}
+
+    def setUp(self):
+        super().setUp()
+        self.directorio = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(**{
+            ajuste: os.path.join(self.directorio, subcarpeta) for ajuste, subcarpeta in self.ajustes_directorio.items()
+        }))
+
+
+# --- BÚSQUEDA DE OFERTAS ---
+# Cada motor debe tolerar consultas vacías o sin palabras útiles, ignorar tildes y buscar por prefijo.
+
+class BusquedaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.gasfiter = OfertaLaboral.objects.create(
+            titulo='Gasfíter certificado', empresa='Aguas Señoriales', tipo='full_time', region='RM', descripcion='Mantención de cañerías', publicada=True,
+        )
+        cls.vendedor = OfertaLaboral.objects.create(
+            titulo='Vendedora de tienda', empresa='Retail', tipo='part_time', region='VA', descripcion='Atención de público', publicada=True,
+        )
+
+    def ids(self, q, buscador=None):
+        with override_settings(BUSCADOR_OFERTAS=buscador):
+            return set(buscar_ofertas(OfertaLaboral.objects.all(), q).values_list('id', flat=True))
+
+    def test_consultas_sin_palabras_utiles_no_filtran(self):
+        todas = {self.gasfiter.id, self.vendedor.id}
+        for q in ('', 'de', 'de la y', '¿?¡!'):
+            self.assertEqual(self.ids(q), todas, q)
+        respuesta = self.client.get('/?q=de', secure=True)
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_motores_sin_tokens_devuelven_vacio_ordenable(self):
+        for motor in (BuscadorBasico(), obtener_buscador()):
+            resultado = motor.buscar(OfertaLaboral.objects.all(), 'de')
+            self.assertEqual(list(resultado.order_by('-rango')), [])
+
+    def test_tildes_y_prefijos(self):
+        for buscador in (None, 'empleos.busqueda.BuscadorBasico'):
+            self.assertEqual(self.ids('gasfiter', buscador), {self.gasfiter.id}, buscador)
+            self.assertEqual(self.ids('SEÑORIALES', buscador), {self.gasfiter.id}, buscador)
+            self.assertEqual(self.ids('vended', buscador), {self.vendedor.id}, buscador)
+            self.assertEqual(self.ids('vendedora plomero', buscador), set(), buscador)
+
+    def test_rango_ordena_por_relevancia(self):
+        OfertaLaboral.objects.filter(pk=self.gasfiter.pk).update(documento_busqueda='gasfiter atencion canerias mantencion')
+        OfertaLaboral.objects.filter(pk=self.vendedor.pk).update(documento_busqueda='vendedora atencion atencion')
+        resultado = obtener_buscador().buscar(OfertaLaboral.objects.all(), 'atencion').order_by('-rango')
+        self.assertEqual([oferta.id for oferta in resultado], [self.vendedor.id, self.gasfiter.id])
+        self.assertGreater(resultado[1].rango, 0)
+
+    @skipUnless(connection.vendor == 'postgresql', 'los trigramas son de PostgreSQL (pg_trgm)')
+    def test_respaldo_por_trigramas(self):
+        self.assertEqual(self.ids('gasfitr'), {self.gasfiter.id})
+
+
+# --- COLA DE TAREAS ---
+
+class TareasTests(TestCase):
+
+    def test_clave_no_duplica(self):
+        primera = encolar_correo('Hola', 'Texto', ['a@ejemplo.cl'], clave='prueba:1')
+        self.assertEqual(encolar_correo('Hola', 'Texto', ['a@ejemplo.cl'], clave='prueba:1'), primera)
+        self.assertEqual(Tarea.objects.count(), 1)
+
+    def test_prueba_email_encola_sin_enviar(self):
+        respuesta = self.client.get(reverse('prueba_email'), secure=True)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)  # lo envía el worker
+        tarea = Tarea.objects.get()
+        self.assertEqual(tarea.funcion, 'empleos.tareas.enviar_correo')
+        self.assertTrue(ejecutar(tarea))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_visibilidad_vencida_en_el_ultimo_intento_falla(self):
+        vencida = timezone.now() - timedelta(seconds=1)
+        agotada = encolar_correo('Hola', 'Texto', ['a@ejemplo.cl'], clave='prueba:agotada')
+        Tarea.objects.filter(pk=agotada.pk).update(
+            estado=Tarea.EJECUTANDO, bloqueada_hasta=vencida, intentos=F('max_intentos'),
+        )
+        reintento = encolar_correo('Hola', 'Texto', ['b@ejemplo.cl'], clave='prueba:reintento')
+        Tarea.objects.filter(pk=reintento.pk).update(estado=Tarea.EJECUTANDO, bloqueada_hasta=vencida, intentos=1)
+
+        self.assertEqual([tarea.pk for tarea in reclamar()], [reintento.pk])
+        agotada.refresh_from_db()
+        self.assertEqual((agotada.estado, agotada.intentos, agotada.bloqueada_hasta), (Tarea.FALLIDA, agotada.max_intentos, None))
+        self.assertIn('visibility timeout', agotada.error)
+        self.assertEqual(reclamar(), [])
+
+
+# --- ENVÍO DE ALERTAS POR LOTES ---
+
+class BackendQueFalla(locmem.EmailBackend):
+    """Deja los correos en mail.outbox, salvo los dirigidos a `caidos`, que fallan."""
+    caidos = set()
+
+    def send_messages(self, mensajes):
+        if any(destinatario in self.caidos for mensaje in mensajes for destinatario in mensaje.to):
+            raise ConnectionError('SMTP caído')
+        return super().send_messages(mensajes)
+
+
+@override_settings(EMAIL_BACKEND='empleos.tests.BackendQueFalla', CORREOS_POR_SEGUNDO=2)
+@patch('empleos.correos.time.sleep')
+class LotesCorreoTests(TestCase):
+
+    def test_reintento_no_repite_destinatarios(self, _sleep):
+        oferta = OfertaLaboral.objects.create(titulo='Cajero', tipo='part_time', region='RM', descripcion='-', publicada=True)
+        destinatarios = [[f"p{i}@ejemplo.cl", ['cajero']] for i in range(5)]
+        tarea = encolar('empleos.correos.enviar_lote_alerta', clave=f"alerta:{oferta.id}:0",
+                        oferta_id=oferta.id, destinatarios=destinatarios, lote=0)
+        BackendQueFalla.caidos = {'p3@ejemplo.cl'}
+        self.assertFalse(ejecutar(tarea))
+        tarea.refresh_from_db()
+        self.assertEqual([d[0] for d in tarea.datos['destinatarios']], ['p3@ejemplo.cl', 'p4@ejemplo.cl'])
+
+        BackendQueFalla.caidos = set()
+        self.assertTrue(ejecutar(tarea))
+        enviados = [m.to[0] for m in mail.outbox]
+        self.assertEqual(sorted(enviados), [d[0] for d in destinatarios])  # cada uno exactamente una vez
+
+    def test_resumen_incluye_ofertas_aprobadas_tarde(self, _sleep):
+        AlertaEmpleo.objects.create(email='a@ejemplo.cl', palabra_clave='cajero', region='RM', frecuencia=AlertaEmpleo.DIARIA)
+        AlertaEmpleo.objects.create(email='b@ejemplo.cl', palabra_clave='cajero bancario', region='RM', frecuencia=AlertaEmpleo.DIARIA)
+        ahora = timezone.now()
+        EnvioResumen.objects.create(frecuencia=AlertaEmpleo.DIARIA, hasta=ahora - timedelta(days=1))
+        # Creada hace una semana y aprobada hoy: su fecha_publicacion queda antes de la marca
+        tardia = OfertaLaboral.objects.create(titulo='Cajero bancario', tipo='part_time', region='RM', descripcion='-',
+                                              fecha_publicacion=ahora - timedelta(days=7))
+        tardia.publicada = True
+        tardia.save()
+        for i in range(3):
+            OfertaLaboral.objects.create(titulo=f'Cajero {i}', tipo='part_time', region='RM', descripcion='-', publicada=True)
+        with CaptureQueriesContext(connection) as consultas, patch('empleos.correos.encolar') as encolar_lote:
+            self.assertEqual(generar_resumenes(AlertaEmpleo.DIARIA), 2)
+        # Una sola consulta de coincidencias para las 4 ofertas
+        self.assertEqual(sum('empleos_palabraalerta' in c['sql'] for c in consultas.captured_queries), 1)
+        destinatarios = dict(encolar_lote.call_args.kwargs['destinatarios'])
+        self.assertEqual(destinatarios['b@ejemplo.cl'], [tardia.id])
+        self.assertIn(tardia.id, destinatarios['a@ejemplo.cl'])
+        self.assertEqual(len(destinatarios['a@ejemplo.cl']), 4)
+
+    def test_editar_oferta_ya_enviada_no_la_reenvia(self, _sleep):
+        AlertaEmpleo.objects.create(email='a@ejemplo.cl', palabra_clave='cajero', region='RM', frecuencia=AlertaEmpleo.DIARIA)
+        oferta = OfertaLaboral.objects.create(titulo='Cajero', tipo='part_time', region='RM', descripcion='-', publicada=True)
+        with patch('empleos.correos.encolar'):
+            self.assertEqual(generar_resumenes(AlertaEmpleo.DIARIA), 1)
+
+        oferta.titulo = 'Cajero (corregido)'
+        oferta.es_destacado = True
+        oferta.save()
+        with patch('empleos.correos.encolar') as encolar_lote:
+            self.assertEqual(generar_resumenes(AlertaEmpleo.DIARIA), 0)
+        encolar_lote.assert_not_called()
+
+        # Despublicada y vuelta a aprobar sí cuenta como nueva
+        oferta.publicada = False
+        oferta.save(update_fields=['publicada'])
+        oferta.publicada = True
+        oferta.save(update_fields=['publicada'])
+        with patch('empleos.correos.encolar'):
+            self.assertEqual(generar_resumenes(AlertaEmpleo.DIARIA), 1)
+
+
+# --- ÍNDICE DE ALERTAS ---
+
+class AlertasTests(TestCase):
+
+    def test_coincide_con_todas_las_palabras(self):
+        alerta = AlertaEmpleo.objects.create(email='a@ejemplo.cl', palabra_clave='Cajero bancario', region='RM')
+        oferta = OfertaLaboral.objects.create(titulo='Cajero bancario part time', tipo='part_time', region='RM', descripcion='-')
+        otra = OfertaLaboral.objects.create(titulo='Cajero de supermercado', tipo='part_time', region='RM', descripcion='-')
+        self.assertEqual(list(alertas_para_oferta(oferta)), [alerta])
+        self.assertFalse(alertas_para_oferta(otra).exists())
+
+    def test_reindexar_es_atomico(self):
+        alerta = AlertaEmpleo.objects.create(email='a@ejemplo.cl', palabra_clave='cajero', region='RM')
+        alerta.palabra_clave = 'bodeguero'
+        with patch.object(PalabraAlerta.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                alerta.save()
+        # La inserción falló: se conservan las palabras anteriores
+        self.assertEqual(list(PalabraAlerta.objects.filter(alerta=alerta).values_list('token', flat=True)), ['cajero'])
+
+
+# --- INVALIDACIÓN DE LA CACHÉ PÚBLICA ---
+
+class CachePublicaTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidar_sube_la_version(self):
+        antes = versiones('ofertas', 'empresas')
+        invalidar('ofertas')
+        despues = versiones('ofertas', 'empresas')
+        self.assertNotEqual(antes, despues)
+        self.assertEqual(antes.split('.')[1], despues.split('.')[1])  # 'empresas' no cambia
+
+    def test_guardar_oferta_invalida_la_pagina(self):
+        url = reverse('lista_practicas')
+        OfertaLaboral.objects.create(titulo='Práctica contable', tipo='PRA', region='RM', descripcion='-', publicada=True)
+        self.assertContains(self.client.get(url, secure=True), 'Práctica contable')
+        OfertaLaboral.objects.create(titulo='Práctica de diseño', tipo='PRA', region='RM', descripcion='-', publicada=True)
+        self.assertContains(self.client.get(url, secure=True), 'Práctica de diseño')
+
+    def test_barra_de_destacados_cacheada_para_usuarios_con_sesion(self):
+        self.client.force_login(User.objects.create_user('ana', password='x'))
+        OfertaLaboral.objects.create(titulo='Cajero destacado', tipo='full_time', region='RM', descripcion='-', publicada=True, es_destacado=True)
+        self.assertContains(self.client.get('/', secure=True), 'Cajero destacado')
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertContains(self.client.get('/', secure=True), 'Cajero destacado')
+        self.assertFalse([c for c in consultas.captured_queries if 'empleos_perfilempresa' in c['sql']])
+
+        OfertaLaboral.objects.create(titulo='Vendedor destacado', tipo='full_time', region='RM', descripcion='-', publicada=True, es_destacado=True)
+        self.assertContains(self.client.get(reverse('lista_practicas'), secure=True), 'Vendedor destacado')
+
+    @override_settings(CACHE_VERSIONES_SEGUNDOS=60)
+    def test_versiones_expiran(self):
+        # Con caché por proceso, lo que no ve un worker deja de servirse al expirar su versión
+        antes = versiones('ofertas')
+        with patch('time.time', return_value=time.time() + 61):
+            self.assertNotEqual(versiones('ofertas'), antes)
+
+
+# --- OFERTAS SIMILARES ---
+
+class SimilaresTests(TestCase):
+
+    def crear(self, titulo, **campos):
+        with self.captureOnCommitCallbacks(execute=True):
+            oferta = OfertaLaboral.objects.create(titulo=titulo, tipo='full_time', region='RM', descripcion='-', publicada=True, **campos)
+        return oferta
+
+    def ejecutar_similares(self):
+        for tarea in Tarea.objects.filter(funcion='empleos.recomendaciones.actualizar_similares', estado=Tarea.PENDIENTE):
+            self.assertTrue(ejecutar(tarea), tarea.error)
+
+    def test_se_encola_al_confirmar_y_una_vez_por_transaccion(self):
+        oferta = self.crear('Cajero bancario')
+        Tarea.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                oferta.titulo = 'Cajero de banco'
+                oferta.save()
+                oferta.save()
+                self.assertFalse(Tarea.objects.filter(funcion='empleos.recomendaciones.actualizar_similares').exists())
+        self.assertEqual(Tarea.objects.filter(funcion='empleos.recomendaciones.actualizar_similares').count(), 1)
+
+    def test_similares_y_retiro_al_borrar(self):
+        a = self.crear('Cajero bancario')
+        b = self.crear('Cajero bancario senior')
+        self.crear('Soldador')
+        self.ejecutar_similares()
+        self.assertEqual(list(OfertaSimilar.objects.filter(oferta=a).values_list('similar_id', flat=True)), [b.id])
+        self.assertEqual(list(OfertaSimilar.objects.filter(oferta=b).values_list('similar_id', flat=True)), [a.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            b.delete()
+        self.ejecutar_similares()
+        self.assertFalse(OfertaSimilar.objects.filter(oferta=a).exists())
+
+    def test_candidatos_en_subconsulta(self):
+        a = self.crear('Cajero bancario')
+        self.crear('Cajero bancario senior')
+        self.ejecutar_similares()
+        with CaptureQueriesContext(connection) as consultas:
+            puntajes = puntajes_candidatos(a)
+        self.assertEqual(len(puntajes), 1)
+        self.assertIn('IN (SELECT', consultas.captured_queries[-1]['sql'])
+        self.assertEqual(mejores({1: 2.0, 2: 2.0, 3: 5.0}, 2), [(3, 5.0), (2, 2.0)])
+
+
+# --- COMPATIBILIDAD CANDIDATO / OFERTA ---
+
+class CompatibilidadTests(TestCase):
+
+    def test_puntajes_oferta_coincide_con_el_detalle(self):
+        oferta = OfertaLaboral(titulo='Cajero bancario senior', region='RM', experiencia='junior', sueldo=800000)
+        candidatos = [
+            Candidato(titular='Cajero bancario', region='RM', experiencia='senior', pretension_renta=700000),
+            Candidato(titular='Soldador de cajero', region='VA', experiencia='sin_experiencia'),
+            Candidato(titular='', region='RM', experiencia='junior', pretension_renta=900000),
+        ]
+        esperados = [detalle_compatibilidad(candidato, oferta)[0] for candidato in candidatos]
+        self.assertEqual(list(puntajes_oferta(oferta, candidatos)), esperados)
+        self.assertEqual(esperados[0], 100)
+
+    def test_mejores_ofertas_sin_perfil_redirige(self):
+        usuario = User.objects.create_user('sinperfil', password='clave')
+        self.client.force_login(usuario)
+        respuesta = self.client.get(reverse('mejores_ofertas'), secure=True)
+        self.assertRedirects(respuesta, reverse('publicar_candidato'), fetch_redirect_response=False)
+
+    def test_mejores_ofertas_ordena_por_compatibilidad(self):
+        usuario = User.objects.create_user('ana', password='clave')
+        Candidato.objects.create(usuario=usuario, nombre='Ana', titular='Cajera bancaria', region='RM', experiencia='junior')
+        lejana = OfertaLaboral.objects.create(titulo='Soldador', tipo='full_time', region='MA', descripcion='-', publicada=True)
+        cercana = OfertaLaboral.objects.create(titulo='Cajera bancaria', tipo='full_time', region='RM', descripcion='-', publicada=True)
+        self.client.force_login(usuario)
+        respuesta = self.client.get(reverse('mejores_ofertas'), secure=True)
+        self.assertEqual([oferta.id for oferta in respuesta.context['ofertas']], [cercana.id, lejana.id])
+
+
+# --- PAGINACIÓN POR CURSOR ---
+
+def _codificar_token(datos):
+    return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode()
+
+
+class PaginacionCursorTests(TestCase):
+    ORDEN = ('-es_destacado', '-fecha_publicacion', '-id')
+
+    @classmethod
+    def setUpTestData(cls):
+        fecha = timezone.now() - timedelta(days=1)
+        # Empates en todo salvo el id: 25 ofertas con la misma fecha, 5 de ellas destacadas
+        OfertaLaboral.objects.bulk_create([
+            OfertaLaboral(titulo=f"Oferta {i}", tipo='full_time', region='RM', descripcion='-', publicada=True,
+                          es_destacado=i % 5 == 0, fecha_publicacion=fecha)
+            for i in range(25)
+        ])
+        cls.esperado = list(OfertaLaboral.objects.order_by(*cls.ORDEN).values_list('id', flat=True))
+
+    def pagina(self, cursor=None, orden=ORDEN, por_pagina=10):
+        request = RequestFactory().get('/', {'cursor': cursor} if cursor is not None else {})
+        return paginar_cursor(request, OfertaLaboral.objects.all(), orden, por_pagina=por_pagina)
+
+    def test_recorre_todo_sin_repetir_ni_saltar_empates(self):
+        for orden in (self.ORDEN, ('es_destacado', '-id')):  # tupla o condición por columnas (sentidos mixtos)
+            esperado = list(OfertaLaboral.objects.order_by(*orden).values_list('id', flat=True))
+            paginas, pagina = [], self.pagina(orden=orden)
+            while True:
+                paginas.append([oferta.id for oferta in pagina])
+                if not pagina.has_next:
+                    break
+                pagina = self.pagina(pagina.cursor_siguiente, orden)
+            self.assertEqual(sum(paginas, []), esperado)
+            self.assertEqual([len(p) for p in paginas], [10, 10, 5])
+
+            # De vuelta desde la última página con los cursores "anterior"
+            vuelta = [[oferta.id for oferta in pagina]]
+            while pagina.has_previous:
+                pagina = self.pagina(pagina.cursor_anterior, orden)
+                vuelta.insert(0, [oferta.id for oferta in pagina])
+            self.assertEqual(vuelta, paginas)
+
+    def test_ultima_pagina_exacta(self):
+        pagina = self.pagina(por_pagina=5)
+        for _ in range(4):
+            pagina = self.pagina(pagina.cursor_siguiente, por_pagina=5)
+        self.assertEqual(len(pagina), 5)
+        self.assertFalse(pagina.has_next)
+        self.assertIsNone(pagina.url_siguiente)
+        self.assertTrue(pagina.has_previous)
+
+    def test_token_alterado_vuelve_a_la_primera_pagina(self):
+        primera = [oferta.id for oferta in self.pagina()]
+        alterados = [
+            'no-es-base64!!', _codificar_token(['lista']), _codificar_token({'v': [1]}),
+            _codificar_token({'v': ['x', 'no-es-fecha', 3]}), _codificar_token({'v': [{}, [], None]}),
+            _codificar_token({'d': 'p', 'v': 'texto'}),
+        ]
+        for token in alterados:
+            with self.subTest(token=token):
+                self.assertEqual([oferta.id for oferta in self.pagina(token)], primera)
+        request = RequestFactory().get('/', {'cursor': _codificar_token({'o': -5})})
+        self.assertEqual(len(paginar_cursor(request, OfertaLaboral.objects.order_by('id'), por_pagina=10)), 10)
+
+
+# --- API JSON ---
+
+class ApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ofertas = [
+            OfertaLaboral.objects.create(titulo=f"Oferta {i}", tipo='full_time', region='RM', descripcion='-', publicada=True)
+            for i in range(5)
+        ]
+
+    def test_304_y_cambios_hechos_por_otro_proceso(self):
+        url = reverse('api_ofertas') + '?region=RM'
+        primera = self.client.get(url, secure=True)
+        self.assertEqual(primera.status_code, 200)
+        with self.assertNumQueries(1):  # solo el agregado de los validadores
+            repetida = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=primera['ETag'])
+        self.assertEqual(repetida.status_code, 304)
+
+        # update() no dispara señales ni invalida la caché, como un cambio hecho desde otro worker
+        OfertaLaboral.objects.filter(id=self.ofertas[0].id).update(titulo='Editada', fecha_modificacion=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=primera['ETag']).status_code, 200)
+        # Retirar una oferta cambia el total aunque la última fecha siga igual
+        actual = self.client.get(url, secure=True)['ETag']
+        OfertaLaboral.objects.filter(id=self.ofertas[1].id).update(publicada=False)
+        self.assertEqual(self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=actual).status_code, 200)
+
+    def test_detalle_304(self):
+        url = reverse('api_oferta', args=[self.ofertas[2].id])
+        primera = self.client.get(url, secure=True)
+        self.assertEqual(primera.json()['titulo'], 'Oferta 2')
+        self.assertEqual(self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=primera['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(reverse('api_oferta', args=[999999]), secure=True).status_code, 404)
+
+    def test_cursor_recorre_todas_las_ofertas(self):
+        url, vistos = reverse('api_ofertas') + '?por_pagina=2&campos=id', []
+        while url:
+            datos = self.client.get(url, secure=True).json()
+            vistos += [fila['id'] for fila in datos['resultados']]
+            url = datos['siguiente']
+        self.assertEqual(vistos, [oferta.id for oferta in reversed(self.ofertas)])
+
+
+# --- FEED INCREMENTAL ---
+
+class FeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vieja = OfertaLaboral.objects.create(titulo='Vieja', tipo='full_time', region='RM', descripcion='-', publicada=True)
+        cls.nueva = OfertaLaboral.objects.create(titulo='Nueva & mejor', tipo='full_time', region='RM', descripcion='-', publicada=True)
+        cls.retirada = OfertaLaboral.objects.create(titulo='Retirada', tipo='full_time', region='RM', descripcion='-', publicada=False)
+        hace_un_dia = timezone.now() - timedelta(days=1)
+        OfertaLaboral.objects.filter(id=cls.vieja.id).update(fecha_modificacion=hace_un_dia - timedelta(days=1))
+        cls.since = hace_un_dia.isoformat()
+
+    def lineas(self, respuesta):
+        self.assertTrue(respuesta.streaming)
+        return [json.loads(linea) for linea in b''.join(respuesta.streaming_content).decode().splitlines()]
+
+    def test_since_trae_cambios_y_retiradas(self):
+        lineas = self.lineas(self.client.get(reverse('feed_ofertas_jsonl'), {'since': self.since}, secure=True))
+        self.assertEqual([(fila['id'], fila['estado']) for fila in lineas],
+                         [(self.nueva.id, 'publicada'), (self.retirada.id, 'retirada')])
+        sin_since = self.lineas(self.client.get(reverse('feed_ofertas_jsonl'), secure=True))
+        self.assertEqual({fila['id'] for fila in sin_since}, {self.vieja.id, self.nueva.id})
+
+    def test_atom_en_streaming(self):
+        respuesta = self.client.get(reverse('feed_ofertas_atom'), {'since': self.since}, secure=True)
+        self.assertTrue(respuesta.streaming)
+        xml = b''.join(respuesta.streaming_content).decode()
+        self.assertIn('<title>Nueva &amp; mejor</title>', xml)
+        self.assertNotIn('Vieja', xml)
+
+    def test_since_invalido_o_fuera_de_rango_es_400(self):
+        for since in ('ayer', '2024-13-45T00:00:00', '9' * 20, '9' * 400):
+            with self.subTest(since=since[:25]):
+                self.assertEqual(self.client.get(reverse('feed_ofertas_jsonl'), {'since': since}, secure=True).status_code, 400)
+
+    def test_304_hasta_que_cambia_una_oferta(self):
+        url = reverse('feed_ofertas_jsonl')
+        primera = self.client.get(url, secure=True)
+        cabeceras = {'HTTP_IF_NONE_MATCH': primera['ETag'], 'HTTP_IF_MODIFIED_SINCE': primera['Last-Modified']}
+        self.assertEqual(self.client.get(url, secure=True, **cabeceras).status_code, 304)
+        # Sin señales ni caché de por medio: el cambio se ve igual
+        OfertaLaboral.objects.filter(id=self.vieja.id).update(titulo='Vieja editada', fecha_modificacion=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.client.get(url, secure=True, **cabeceras).status_code, 200)
+
+
+# --- SITEMAPS ---
+
+@override_settings(URL_SITIO='https://ejemplo.cl')
+class SitemapsTests(DirectorioTemporalMixin, TestCase):
+    ajustes_directorio = {'SITEMAPS_DIR': 'sitemaps'}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.ofertas = [
+            OfertaLaboral.objects.create(titulo=f"Oferta {i}", tipo='full_time', region='RM', descripcion='-', publicada=True)
+            for i in range(3)
+        ]
+
+    def test_indice_y_secciones(self):
+        with patch.object(sitemaps.SitemapBase, 'limit', 2):
+            indice = self.client.get(reverse('sitemap'), secure=True)  # primera visita: genera los archivos
+        self.assertEqual(indice.status_code, 200)
+        xml = b''.join(indice.streaming_content).decode()
+        self.assertIn('<loc>https://ejemplo.cl/sitemap-ofertas-1.xml</loc>', xml)
+        self.assertIn('<loc>https://ejemplo.cl/sitemap-ofertas-2.xml</loc>', xml)
+
+        seccion = self.client.get(reverse('sitemap_seccion', args=['sitemap-ofertas-2.xml']), secure=True)
+        xml = b''.join(seccion.streaming_content).decode()
+        self.assertIn(f"<loc>https://ejemplo.cl/oferta/{self.ofertas[2].id}/</loc>", xml)
+
+        comprimida = self.client.get(reverse('sitemap_seccion', args=['sitemap-ofertas-1.xml']), secure=True,
+                                     HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(comprimida['Content-Encoding'], 'gzip')
+        self.assertIn(b'/oferta/', gzip.decompress(b''.join(comprimida.streaming_content)))
+        self.assertEqual(self.client.get(reverse('sitemap_seccion', args=['sitemap-ofertas-9.xml']), secure=True).status_code, 404)
+
+    def test_regenerar_borra_bloques_sobrantes(self):
+        with patch.object(sitemaps.SitemapBase, 'limit', 2):
+            self.assertEqual(sitemaps.generar_sitemaps()['ofertas'], 2)
+        OfertaLaboral.objects.filter(id=self.ofertas[2].id).update(publicada=False)
+        with patch.object(sitemaps.SitemapBase, 'limit', 2):
+            self.assertEqual(sitemaps.generar_sitemaps()['ofertas'], 1)
+        self.assertFalse(os.path.exists(os.path.join(sitemaps.directorio_sitemaps(), 'sitemap-ofertas-2.xml')))
+        self.assertFalse(os.path.exists(os.path.join(sitemaps.directorio_sitemaps(), 'sitemap-ofertas-2.xml.gz')))
+
+    def test_url_sitio_en_qr_y_correos(self):
+        self.assertEqual(url_oferta(7), 'https://ejemplo.cl/oferta/7/')
+        self.assertIn('https://ejemplo.cl/oferta/', mensaje_alerta(self.ofertas[0], 'a@ejemplo.cl', ['cajero']).body)
+
+
+# --- EXPORTACIÓN CSV / XLSX / ZIP ---
+
+class ExportacionTests(TestCase):
+    NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.empresa = User.objects.create_user('empresa_export')
+        PerfilEmpresa.objects.create(usuario=cls.empresa, nombre='Empresa')
+        cls.oferta = OfertaLaboral.objects.create(usuario=cls.empresa, titulo='Cajero', tipo='full_time', region='RM', descripcion='-')
+        for i, nombre in enumerate(['Ana <Pérez> & Cía', 'Luis\x0bRojas']):
+            candidato = Candidato.objects.create(nombre=nombre, titular='Cajero', region='RM', experiencia='junior', telefono=f'+5691234567{i}')
+            Postulacion.objects.create(oferta=cls.oferta, candidato=candidato)
+
+    def abrir(self, respuesta):
+        self.assertTrue(respuesta.streaming)
+        archivo = zipfile.ZipFile(io.BytesIO(b''.join(respuesta.streaming_content)))
+        self.assertIsNone(archivo.testzip())  # CRC de cada miembro correcto
+        return archivo
+
+    def test_xlsx_es_un_libro_valido(self):
+        self.client.force_login(self.empresa)
+        respuesta = self.client.get(reverse('exportar_csv', args=[self.oferta.id]), {'formato': 'xlsx'}, secure=True)
+        self.assertIn('Postulantes_', respuesta['Content-Disposition'])
+        archivo = self.abrir(respuesta)
+        self.assertIn('[Content_Types].xml', archivo.namelist())
+        ElementTree.fromstring(archivo.read('xl/workbook.xml'))
+        hoja = ElementTree.fromstring(archivo.read('xl/worksheets/sheet1.xml'))
+        filas = [[''.join(celda.itertext()) for celda in fila.findall('s:c', self.NS)] for fila in hoja.iterfind('.//s:row', self.NS)]
+        self.assertEqual(filas[0][:2], ['Nombre', 'Email'])
+        self.assertEqual(sorted(fila[0] for fila in filas[1:]), ['Ana <Pérez> & Cía', 'LuisRojas'])  # sin caracteres de control
+
+    def test_zip_en_streaming_por_trozos(self):
+        grande = os.urandom(3 * 64 * 1024 + 123)  # varios envíos
+        archivo = zipfile.ZipFile(io.BytesIO(b''.join(zip_en_streaming([
+            ('a.txt', b'hola'), ('b.bin', lambda: io.BytesIO(grande)),
+        ]))))
+        self.assertIsNone(archivo.testzip())
+        self.assertEqual(archivo.read('a.txt'), b'hola')
+        self.assertEqual(archivo.read('b.bin'), grande)
+
+
+# --- MÉTRICAS (/metrics Y MIDDLEWARE) ---
+
+@override_settings(METRICAS_ACTIVAS=True, METRICAS_TOKEN=None)
+class MetricasTests(TestCase):
+
+    def setUp(self):
+        metricas.registro.reiniciar()
+
+    def test_sin_token_solo_staff(self):
+        self.assertEqual(self.client.get(reverse('metricas'), secure=True).status_code, 403)
+        self.client.force_login(User.objects.create_user('usuario'))
+        self.assertEqual(self.client.get(reverse('metricas'), secure=True).status_code, 403)
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        self.assertEqual(self.client.get(reverse('metricas'), secure=True).status_code, 200)
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_con_token(self):
+        url = reverse('metricas')
+        self.assertEqual(self.client.get(url, secure=True, HTTP_AUTHORIZATION='Bearer otro').status_code, 403)
+        self.assertEqual(self.client.get(url, secure=True, HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+
+    @override_settings(METRICAS_ACTIVAS=False)
+    def test_desactivadas(self):
+        respuesta = self.client.get(reverse('metricas'), secure=True, HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertNotIn('Server-Timing', respuesta)
+
+    def test_middleware_mide_cada_vista(self):
+        OfertaLaboral.objects.create(titulo='Cajero', tipo='PRA', region='RM', descripcion='-', publicada=True)
+        respuesta = self.client.get(reverse('lista_practicas'), secure=True)
+        self.assertRegex(respuesta['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ consultas", tpl;dur=[\d.]+, total;dur=')
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        texto = self.client.get(reverse('metricas'), secure=True).content.decode()
+        self.assertRegex(texto, r'empleos_peticiones_total\{proceso="\d+",vista="lista_practicas",codigo="2xx"\} 1')
+        self.assertNotIn('vista="metricas"', texto)  # el propio scrape no se cuenta
+
+
+# --- ESTADÍSTICAS PRECALCULADAS ---
+
+class EstadisticasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        ayer_mediodia = timezone.now() - timedelta(days=1)
+        ofertas = [
+            OfertaLaboral.objects.create(titulo='A', tipo='full_time', region='RM', descripcion='-', publicada=True),
+            OfertaLaboral.objects.create(titulo='B', tipo='full_time', region='RM', descripcion='-', publicada=True,
+                                         fecha_publicacion=ayer_mediodia),
+            OfertaLaboral.objects.create(titulo='C', tipo='part_time', region='VA', descripcion='-', publicada=True),
+            OfertaLaboral.objects.create(titulo='D', tipo='part_time', region='VA', descripcion='-', publicada=False),
+        ]
+        candidato = Candidato.objects.create(usuario=User.objects.create_user('c1'), nombre='Ana', titular='Cajera', region='RM', experiencia='junior')
+        Postulacion.objects.create(oferta=ofertas[0], candidato=candidato)
+        Postulacion.objects.create(oferta=ofertas[2], candidato=candidato)
+        VisitaDiaria.objects.create(oferta=ofertas[0], fecha=hoy, visitas=7)
+        VisitaDiaria.objects.create(oferta=ofertas[2], fecha=hoy, visitas=3)
+        VisitaDiaria.objects.create(oferta=ofertas[0], fecha=hoy - timedelta(days=1), visitas=5)
+        cls.hoy, cls.ayer = hoy, hoy - timedelta(days=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_foto_y_flujos(self):
+        actualizar(dias=2)
+        filas = EstadisticaDiaria.objects.count()
+        actualizar(dias=2)  # idempotente
+        self.assertEqual(EstadisticaDiaria.objects.count(), filas)
+
+        foto = foto_actual()
+        self.assertEqual(foto['ofertas_region'], {'RM': 2, 'VA': 1})
+        self.assertEqual(foto['ofertas_tipo'], {'full_time': 2, 'part_time': 1})
+        self.assertEqual(foto['ofertas_estado'], {'publicadas': 3, 'pendientes': 1})
+        self.assertEqual(foto['total'], {'ofertas': 4, 'candidatos': 1, 'usuarios': 1, 'empresas': 0})
+
+        fechas, series = tendencia(dias=2)
+        self.assertEqual(fechas, [self.ayer, self.hoy])
+        self.assertEqual(series['ofertas'], [1, 2])
+        self.assertEqual(series['postulaciones'], [0, 2])
+        self.assertEqual(series['visitas'], [5, 10])
+        self.assertEqual(series['candidatos'], [0, 1])
+
+    def test_foto_actual_sin_datos_la_calcula(self):
+        self.assertFalse(EstadisticaDiaria.objects.exists())
+        self.assertEqual(foto_actual()['ofertas_estado'], {'publicadas': 3, 'pendientes': 1})
+        self.assertTrue(EstadisticaDiaria.objects.filter(fecha=self.hoy, metrica='total').exists())
+
+    def test_foto_actual_usa_la_ultima_disponible(self):
+        EstadisticaDiaria.objects.create(fecha=self.ayer, metrica='total', clave='ofertas', valor=99)
+        with self.assertNumQueries(2):  # fecha de la última foto y sus filas: no recalcula
+            self.assertEqual(foto_actual()['total'], {'ofertas': 99})
+
+    def test_programar_una_vez_por_intervalo(self):
+        with patch('empleos.estadisticas.encolar') as encolar_tarea:
+            programar_actualizacion()
+            programar_actualizacion()
+            self.assertEqual(encolar_tarea.call_count, 1)
+            self.assertEqual(encolar_tarea.call_args.kwargs['retraso'], INTERVALO_ACTUALIZACION)
+            actualizar()  # libera la marca: el siguiente cambio vuelve a programar
+            programar_actualizacion()
+            self.assertEqual(encolar_tarea.call_count, 2)
+
+
+# --- CONTADOR DE VISITAS ---
+# Las visitas se agrupan en memoria y se vuelcan sumadas en OfertaLaboral.visitas y VisitaDiaria.
+
+class VisitasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.oferta = OfertaLaboral.objects.create(titulo='Cajero', tipo='part_time', region='RM', descripcion='-', publicada=True)
+
+    def test_guardar_agrupa_por_oferta_y_dia(self):
+        hoy = timezone.localdate()
+        ayer = hoy - timedelta(days=1)
+        guardar_visitas(Counter({(self.oferta.id, hoy): 3, (self.oferta.id, ayer): 2, (999999, hoy): 5}))
+        guardar_visitas(Counter({(self.oferta.id, hoy): 1}))
+        self.oferta.refresh_from_db()
+        self.assertEqual(self.oferta.visitas, 6)
+        self.assertEqual(dict(VisitaDiaria.objects.values_list('fecha', 'visitas')), {hoy: 4, ayer: 2})
+
+    @override_settings(VISITAS_MAX_PENDIENTES=2, VISITAS_INTERVALO_FLUSH=3600)
+    def test_vuelca_al_llenarse(self):
+        buffer = BufferVisitas()
+        buffer._iniciar_hilo = lambda: None
+        buffer.registrar(self.oferta.id)
+        self.assertFalse(VisitaDiaria.objects.exists())
+        buffer.registrar(self.oferta.id + 1)  # segunda clave: buffer lleno
+        self.assertEqual(VisitaDiaria.objects.get().visitas, 1)
+
+    @override_settings(VISITAS_INTERVALO_FLUSH=30)
+    def test_vuelca_por_tiempo_sin_nuevas_visitas(self):
+        buffer = BufferVisitas()
+        buffer._iniciar_hilo = lambda: None
+        buffer.registrar(self.oferta.id)
+        buffer.volcar_si_vencido()
+        self.assertFalse(VisitaDiaria.objects.exists())  # aún no vence
+        buffer._ultimo_volcado -= 31
+        buffer.volcar_si_vencido()  # lo que hace el hilo de fondo
+        self.assertEqual(VisitaDiaria.objects.get().visitas, 1)
+
+
+# --- PLANES DE CONSULTA (EXPLAIN) ---
+# Cada consulta caliente de los listados debe resolverse con un índice. Si una migración
+# o un cambio en la vista la deja en un recorrido completo de tabla, el test falla.
+
+class PlanesConsultaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ahora = timezone.now()
+        cls.usuarios = User.objects.bulk_create([User(username=f"usuario{i}") for i in range(20)])
+        OfertaLaboral.objects.bulk_create([
+            OfertaLaboral(
+                usuario=cls.usuarios[i % 20], titulo=f"Oferta {i}", tipo=TIPOS[i % 3], region=REGIONES[i % 5],
+                descripcion="Descripción", publicada=i % 4 != 0, es_destacado=i % 25 == 0,
+                sueldo=500000 + i * 1000, fecha_publicacion=ahora - timedelta(hours=i),
+            ) for i in range(600)
+        ])
+        candidatos = Candidato.objects.bulk_create([
+            Candidato(
+                usuario=cls.usuarios[i] if i < 20 else None, nombre=f"Candidato {i}", titular="Analista",
+                rubro=RUBROS[i % 4], region=REGIONES[i % 5], experiencia=NIVELES[i % 4], publicado=i % 5 != 0,
+                pretension_renta=400000 + (i % 50) * 20000,
+            ) for i in range(300)
+        ])
+        ofertas = list(OfertaLaboral.objects.order_by('id')[:100])
+        Postulacion.objects.bulk_create([
+            Postulacion(oferta=ofertas[i % 100], candidato=candidatos[i % 300]) for i in range(300)
+        ])
+        Favorito.objects.bulk_create([
+            Favorito(usuario=cls.usuarios[i % 20], oferta=ofertas[i % 100]) for i in range(100)
+        ])
+        Notificacion.objects.bulk_create([
+            Notificacion(usuario=cls.usuarios[i % 20], mensaje=f"Aviso {i}", leida=i % 3 != 0) for i in range(1000)
+        ])
+        Servicio.objects.bulk_create([
+            Servicio(
+                usuario=cls.usuarios[i % 20], titulo=f"Servicio {i}", descripcion="Detalle", rubro=RUBROS[i % 4],
+                region=REGIONES[i % 5], telefono="+56900000000", email_contacto="a@b.cl", publicado=i % 6 != 0,
+            ) for i in range(300)
+        ])
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def plan(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Con tablas de prueba tan chicas Postgres siempre prefiere Seq Scan;
+            # se desactiva para comprobar que existe un índice utilizable.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsaIndice(self, queryset, orden_por_indice=True):
+        plan = self.plan(queryset)
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Seq Scan', plan, plan)
+        elif connection.vendor == 'sqlite':
+            completos = [
+                linea for linea in plan.splitlines()
+                if re.search(r'\bSCAN \w+$', linea)
+                or (orden_por_indice and re.search(r'USE TEMP B-TREE FOR (RIGHT PART OF |LAST TERM OF )?ORDER BY', linea))
+            ]
+            self.assertFalse(completos, plan)
+
+    def test_home(self):
+        base = OfertaLaboral.objects.filter(publicada=True).order_by('-es_destacado', '-fecha_publicacion')
+        self.assertUsaIndice(base[:20])
+        self.assertUsaIndice(base.filter(region='RM')[:20])
+        self.assertUsaIndice(base.filter(fecha_publicacion__gte=timezone.now() - timedelta(days=7)))
+
+    def test_home_keyset(self):
+        # El orden que emite paginar_cursor, con el desempate por id, sin ordenar aparte
+        orden = ('-es_destacado', '-fecha_publicacion', '-id')
+        base = OfertaLaboral.objects.filter(publicada=True).order_by(*orden)
+        self.assertUsaIndice(base[:11])
+        self.assertUsaIndice(base.filter(region='RM')[:11])
+
+    def test_practicas(self):
+        practicas = OfertaLaboral.objects.filter(tipo='PRA', publicada=True).order_by('-fecha_publicacion')
+        self.assertUsaIndice(practicas)
+        self.assertUsaIndice(practicas.filter(region='VA'))
+
+    def test_ofertas_recientes(self):
+        desde = timezone.now() - timedelta(days=90)
+        self.assertUsaIndice(
+            OfertaLaboral.objects.filter(publicada=True, fecha_publicacion__gte=desde).order_by('-fecha_publicacion')[:2000]
+        )
+
+    def test_mis_avisos(self):
+        # Los contadores van en subconsultas correlacionadas: sin GROUP BY, el orden sale del índice
+        self.assertUsaIndice(ofertas_con_resumen(self.usuarios[0]))
+
+    def test_lista_candidatos(self):
+        candidatos = Candidato.objects.filter(publicado=True).order_by('-fecha_creacion')
+        self.assertUsaIndice(candidatos[:20])
+        self.assertUsaIndice(candidatos.filter(region='RM'))
+        self.assertUsaIndice(candidatos.filter(rubro='salud', region='RM'))
+        self.assertUsaIndice(candidatos.filter(experiencia='junior'))
+        self.assertUsaIndice(candidatos.filter(pretension_renta__gte=600000, pretension_renta__lte=900000), orden_por_indice=False)
+
+    def test_notificaciones_no_leidas(self):
+        self.assertUsaIndice(Notificacion.objects.filter(usuario=self.usuarios[0], leida=False).order_by('-fecha')[:5])
+
+    def test_postulaciones_y_favoritos(self):
+        candidato = Candidato.objects.first()
+        self.assertUsaIndice(Postulacion.objects.filter(candidato=candidato).order_by('-fecha'))
+        self.assertUsaIndice(Favorito.objects.filter(usuario=self.usuarios[0]).select_related('oferta').order_by('-fecha'))
+
+    def test_lista_servicios(self):
+        servicios = Servicio.objects.filter(publicado=True).order_by('-fecha_publicacion')
+        self.assertUsaIndice(servicios[:20])
+        self.assertUsaIndice(servicios.filter(rubro='salud', region='RM'))
+
+
+# --- CONSULTAS POR PÁGINA (N+1) ---
+# Los paneles de empresa deben hacer el mismo número de consultas con 1 oferta y 1 postulante
+# que con muchas ofertas y muchos postulantes.
+
+class ConsultasPanelEmpresaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.empresa = User.objects.create_user('empresa', 'empresa@example.com', 'clave')
+        cls.oferta = cls.crear_ofertas(1)[0]
+        cls.postular(cls.oferta, 1)
+
+    @classmethod
+    def crear_ofertas(cls, cantidad):
+        ofertas = OfertaLaboral.objects.bulk_create([
+            OfertaLaboral(usuario=cls.empresa, titulo=f"Oferta {i}", tipo='full_time', region='RM', descripcion="Descripción", publicada=True)
+            for i in range(cantidad)
+        ])
+        hoy = timezone.localdate()
+        Pregunta.objects.bulk_create([Pregunta(oferta=o, usuario=cls.empresa, pregunta="¿Es remoto?") for o in ofertas])
+        VisitaDiaria.objects.bulk_create([VisitaDiaria(oferta=o, fecha=hoy, visitas=3) for o in ofertas])
+        return ofertas
+
+    @classmethod
+    def postular(cls, oferta, cantidad):
+        inicio = Candidato.objects.count()
+        candidatos = Candidato.objects.bulk_create([
+            Candidato(
+                usuario=User.objects.create_user(f"candidato{inicio + i}"), nombre=f"Candidato {inicio + i}",
+                email=f"c{inicio + i}@example.com", titular="Analista", region='RM', publicado=True,
+            ) for i in range(cantidad)
+        ])
+        estados = [codigo for codigo, _ in Postulacion.ESTADOS]
+        Postulacion.objects.bulk_create([
+            Postulacion(oferta=oferta, candidato=c, estado=estados[i % len(estados)]) for i, c in enumerate(candidatos)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.empresa)
+
+    def consultas(self, url):
+        with CaptureQueriesContext(connection) as capturadas:
+            respuesta = self.client.get(url, secure=True)
+        self.assertEqual(respuesta.status_code, 200)
+        return len(capturadas)
+
+    def test_mis_avisos_no_crece_con_las_ofertas(self):
+        base = self.consultas('/mis-avisos/')
+        for oferta in self.crear_ofertas(15):
+            self.postular(oferta, 3)
+        with self.assertNumQueries(base):
+            respuesta = self.client.get('/mis-avisos/', secure=True)
+        self.assertContains(respuesta, "3 Postulantes")
+
+    def test_gestion_candidatos_no_crece_con_los_postulantes(self):
+        url = f'/gestion-oferta/{self.oferta.id}/candidatos/'
+        base = self.consultas(url)
+        self.postular(self.oferta, 25)
+        with self.assertNumQueries(base):
+            respuesta = self.client.get(url, secure=True)
+        self.assertEqual(len(respuesta.context['postulaciones']), 26)
+        with self.assertNumQueries(base):
+            self.client.get(url + '?orden=compatibilidad', secure=True)
+
+
+# --- DATOS SINTÉTICOS Y BENCHMARK ---
+# Corre el benchmark a escala mínima: cada vista caliente responde lo esperado y se mantiene
+# dentro de su presupuesto de consultas (benchmark.ESCENARIOS).
+
+class BenchmarkTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.resumen = sembrar(empresas=3, ofertas=60, candidatos=40, postulaciones=120, alertas=30, lote=25)
+
+    def test_sembrar(self):
+        self.assertEqual(self.resumen, {'empresas': 3, 'ofertas': 60, 'candidatos': 40, 'postulaciones': 120, 'alertas': 30})
+        self.assertEqual(PalabraAlerta.objects.values('alerta').distinct().count(), 30)
+        self.assertFalse(OfertaLaboral.objects.filter(documento_busqueda='').exists())
+
+    def test_escenarios_dentro_del_presupuesto(self):
+        resultados = benchmark.ejecutar(repeticiones=2, calentamiento=1)
+        self.assertEqual(set(resultados), {e.nombre for e in benchmark.ESCENARIOS})
+        self.assertEqual(benchmark.regresiones(resultados), [])
+        # publicar_empleo se deshace en cada repetición
+        self.assertFalse(OfertaLaboral.objects.filter(empresa='Benchmark').exists())
+
+    def test_regresiones_contra_base(self):
+        base = {'inicio': {'p50_ms': 10, 'p95_ms': 20, 'max_ms': 20, 'consultas': 5, 'consultas_min': 5, 'errores': []}}
+        actual = {'inicio': {**base['inicio'], 'p95_ms': 30, 'consultas': 6}}
+        self.assertEqual(len(benchmark.regresiones(actual, base)), 2)
+        self.assertEqual(benchmark.regresiones(actual, base, tolerancia=1), ["inicio: 6 consultas (base 5)"])
+
+    def test_comando_exige_debug_o_forzar(self):
+        with self.assertRaisesMessage(CommandError, '--forzar'):
+            call_command('benchmark', 'inicio', repeticiones=1, calentamiento=0)
+        salida = io.StringIO()
+        call_command('benchmark', 'inicio', repeticiones=1, calentamiento=0, forzar=True, stdout=salida)
+        self.assertIn('inicio', salida.getvalue())
+
+
+# --- PDF DE CV EN CACHÉ ---
+# El PDF se genera una vez por versión del CV: la segunda descarga sale del disco, el ETag
+# permite un 304 y un cambio en el candidato deja una versión nueva y borra la anterior.
+# El ZIP de una oferta junta los PDF en caché y renderiza los faltantes en el pool de procesos.
+
+@override_settings(TAREAS_SINCRONAS=True)
+class CvPdfTests(DirectorioTemporalMixin, TestCase):
+    ajustes_directorio = {'PDF_CACHE_DIR': 'pdf'}
+
+    def setUp(self):
+        super().setUp()
+        self.candidato = Candidato.objects.create(nombre='Ana', titular='Contadora', region='RM', experiencia='junior')
+        self.url = f'/candidato/{self.candidato.id}/descargar/'
+
+    def test_pregenerado_al_guardar_y_servido_desde_disco(self):
+        ruta = ruta_cv(self.candidato)
+        self.assertTrue(os.path.exists(ruta))
+        respuesta = self.client.get(self.url, secure=True)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(b''.join(respuesta.streaming_content).startswith(b'%PDF'))
+        respuesta = self.client.get(self.url, secure=True, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_cambio_en_el_cv_reemplaza_el_pdf(self):
+        anterior = ruta_cv(self.candidato)
+        self.candidato.titular = 'Contadora Auditora'
+        self.candidato.save()
+        self.assertFalse(os.path.exists(anterior))
+        self.assertTrue(os.path.exists(ruta_cv(self.candidato)))
+        self.candidato.delete()
+        self.assertFalse(os.path.exists(ruta_cv(self.candidato)))
+
+    def test_zip_de_cvs_de_una_oferta(self):
+        empresa = User.objects.create_user('empresa')
+        PerfilEmpresa.objects.create(usuario=empresa, nombre='Empresa')
+        oferta = OfertaLaboral.objects.create(usuario=empresa, titulo='Contador', tipo='full_time', region='RM', descripcion='-')
+        otro = Candidato.objects.create(nombre='Luis', titular='Auditor', region='VA', experiencia='senior')
+        Postulacion.objects.create(oferta=oferta, candidato=self.candidato)
+        Postulacion.objects.create(oferta=oferta, candidato=otro)
+        os.remove(ruta_cv(otro))  # este se renderiza en el pool
+
+        self.client.force_login(empresa)
+        respuesta = self.client.get(f'/gestion-oferta/{oferta.id}/cvs/', secure=True)
+        archivo = zipfile.ZipFile(io.BytesIO(b''.join(respuesta.streaming_content)))
+        self.assertEqual(sorted(archivo.namelist()), ['001_luis.pdf', '002_ana.pdf'])
+        self.assertTrue(archivo.read('001_luis.pdf').startswith(b'%PDF'))
+        self.assertTrue(os.path.exists(ruta_cv(otro)))
+
+    def zip_con_pool_que_falla(self, error):
+        class PoolQueFalla:
+            def submit(self, funcion, *args):
+                futuro = Future()
+                futuro.set_exception(error)
+                return futuro
+
+            def shutdown(self, **kwargs):
+                pass
+
+        oferta = OfertaLaboral.objects.create(titulo='Contador', tipo='full_time', region='RM', descripcion='-')
+        otros = [Candidato.objects.create(nombre=nombre, titular='Auditor', region='VA', experiencia='senior') for nombre in ('Luis', 'Eva')]
+        for candidato in [self.candidato, *otros]:
+            Postulacion.objects.create(oferta=oferta, candidato=candidato)
+        for candidato in otros:
+            os.remove(ruta_cv(candidato))
+        with patch('empleos.pdfs._pool', return_value=PoolQueFalla()):
+            entradas = dict(pdfs.cvs_de_postulaciones(Postulacion.objects.filter(oferta=oferta)))
+        return sorted(entradas), entradas.get('errores.txt', b'').decode()
+
+    def test_zip_sigue_si_el_pool_se_rompe(self):
+        # El pool muerto no trunca el ZIP: los CV que faltan se renderizan en el proceso
+        nombres, errores = self.zip_con_pool_que_falla(BrokenProcessPool('un hijo murió'))
+        self.assertEqual(nombres, ['001_eva.pdf', '002_luis.pdf', '003_ana.pdf'])
+        self.assertEqual(errores, '')
+
+    def test_zip_anota_cualquier_error_y_sigue(self):
+        nombres, errores = self.zip_con_pool_que_falla(RuntimeError('plantilla rota'))
+        self.assertEqual(nombres, ['003_ana.pdf', 'errores.txt'])
+        self.assertIn('Luis', errores)
+        self.assertIn('plantilla rota', errores)
+
+
+# --- QR Y CARTEL IMPRIMIBLE ---
+# El QR se genera una vez por oferta y se sirve como imagen aparte; el cartel PDF sale de disco.
+
+@override_settings(TAREAS_SINCRONAS=True)
+class ImpresosOfertaTests(DirectorioTemporalMixin, TestCase):
+    ajustes_directorio = {'MEDIA_ROOT': 'media', 'PDF_CACHE_DIR': 'pdf'}
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.oferta = OfertaLaboral.objects.create(titulo='Cajero', tipo='part_time', region='RM', descripcion='-', publicada=True)
+
+    def test_qr_pregenerado_al_publicar(self):
+        self.assertTrue(default_storage.exists(nombre_qr(self.oferta.id)))
+        respuesta = self.client.get(f'/oferta/{self.oferta.id}/imprimir/', secure=True)
+        self.assertContains(respuesta, f'/oferta/{self.oferta.id}/qr.png')
+        respuesta = self.client.get(f'/oferta/{self.oferta.id}/qr.png', secure=True)
+        self.assertEqual(respuesta['Content-Type'], 'image/png')
+        respuesta = self.client.get(f'/oferta/{self.oferta.id}/qr.png', secure=True, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_qr_solo_de_ofertas_publicadas(self):
+        url = f'/oferta/{self.oferta.id}/qr.png'
+        etag = self.client.get(url, secure=True)['ETag']
+        OfertaLaboral.objects.filter(pk=self.oferta.pk).update(publicada=False)
+        self.assertEqual(self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+        self.oferta.delete()
+        self.assertEqual(self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+    @override_settings(TAREAS_SINCRONAS=False)
+    def test_qr_faltante_lo_escribe_solo_la_tarea(self):
+        default_storage.delete(nombre_qr(self.oferta.id))
+        Tarea.objects.all().delete()
+        primera, segunda = obtener_qr(self.oferta.id), obtener_qr(self.oferta.id)
+        self.assertEqual(primera, segunda)
+        self.assertFalse(default_storage.exists(nombre_qr(self.oferta.id)))
+        tarea = Tarea.objects.get(funcion='empleos.qr.generar_qr')  # una sola, por la clave
+        self.assertTrue(ejecutar(tarea))
+        self.assertEqual(default_storage.listdir('qr')[1], [os.path.basename(nombre_qr(self.oferta.id))])
+
+    def test_cartel_pdf_en_cache(self):
+        respuesta = self.client.get(f'/oferta/{self.oferta.id}/imprimir.pdf', secure=True)
+        self.assertTrue(b''.join(respuesta.streaming_content).startswith(b'%PDF'))
+        anterior = ruta_cartel(self.oferta)
+        self.assertTrue(os.path.exists(anterior))
+        self.oferta.titulo = 'Cajero Reponedor'
+        self.oferta.save()
+        self.client.get(f'/oferta/{self.oferta.id}/imprimir.pdf', secure=True)
+        self.assertFalse(os.path.exists(anterior))
+        actual, qr = ruta_cartel(self.oferta), nombre_qr(self.oferta.id)
+        self.oferta.delete()
+        self.assertFalse(os.path.exists(actual))
+        self.assertFalse(default_storage.exists(qr))
+
+
+# --- DATOS DEL MAPA ---
+# Con zoom bajo llega un grupo por región con el total; desde ZOOM_PUNTOS, las ofertas del bbox
+# en una posición que depende solo del id (la misma en cada carga).
+
+class MapaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        OfertaLaboral.objects.bulk_create([
+            OfertaLaboral(titulo=f"Oferta {i}", tipo='full_time', region=region, descripcion='-', publicada=True)
+            for i, region in enumerate(['RM'] * 5 + ['VA'] * 3)
+        ] + [OfertaLaboral(titulo='Borrador', tipo='full_time', region='RM', descripcion='-', publicada=False)])
+
+    def setUp(self):
+        cache.clear()
+
+    def pedir(self, consulta):
+        respuesta = self.client.get(f'/mapa/datos/?{consulta}', secure=True)
+        self.assertEqual(respuesta['Content-Type'], 'application/geo+json')
+        return respuesta.json()['features']
+
+    def test_grupos_por_region(self):
+        totales = {f['properties']['region']: f['properties']['total'] for f in self.pedir('zoom=5')}
+        self.assertEqual(totales, {'RM': 5, 'VA': 3})
+        norte_de_chile = '-71.0,-30.0,-69.0,-18.0'
+        self.assertEqual(self.pedir(f'zoom=5&bbox={norte_de_chile}'), [])
+
+    def test_ofertas_individuales_con_posicion_estable(self):
+        santiago = '-70.8,-33.6,-70.5,-33.3'
+        with self.assertNumQueries(3):  # estado + conteo por celda (queda en caché) + ofertas visibles
+            features = self.pedir(f'zoom={mapa.ZOOM_PUNTOS}&bbox={santiago}')
+        self.assertEqual(len(features), 5)
+        self.assertEqual(features, self.pedir(f'zoom={mapa.ZOOM_PUNTOS + 1}&bbox={santiago}'))
+        self.assertEqual(self.client.get('/mapa/datos/?bbox=1,2', secure=True).status_code, 400)
+
+    def test_304_y_etag_segun_la_base_de_datos(self):
+        respuesta = self.client.get('/mapa/datos/?zoom=5', secure=True)
+        with self.assertNumQueries(1):  # solo el agregado del estado
+            self.assertEqual(self.client.get(
+                '/mapa/datos/?zoom=5', secure=True, HTTP_IF_NONE_MATCH=respuesta['ETag'],
+            ).status_code, 304)
+
+        # update() no pasa por las señales ni sube la versión de la caché: el ETag igual cambia
+        OfertaLaboral.objects.filter(region='VA').update(region='AN', fecha_modificacion=timezone.now() + timedelta(seconds=1))
+        nueva = self.client.get('/mapa/datos/?zoom=5', secure=True, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(nueva.status_code, 200)
+        self.assertNotEqual(nueva['ETag'], respuesta['ETag'])
+        totales = {f['properties']['region']: f['properties']['total'] for f in nueva.json()['features']}
+        self.assertEqual(totales, {'RM': 5, 'AN': 3})  # el conteo cacheado tampoco quedó viejo
+
+        # Un borrado no mueve Max(fecha_modificacion), pero sí el total
+        OfertaLaboral.objects.filter(region='AN').order_by('id').first().delete()
+        self.assertEqual(self.client.get(
+            '/mapa/datos/?zoom=5', secure=True, HTTP_IF_NONE_MATCH=nueva['ETag'],
+        ).status_code, 200)
+
+
+# --- IMÁGENES SUBIDAS ---
+# Al guardar, el original pierde los metadatos y se acota; las miniaturas WebP alimentan el srcset.
+
+@override_settings(TAREAS_SINCRONAS=True)
+class ImagenesTests(DirectorioTemporalMixin, TestCase):
+    # Guardar un Candidato también pregenera su CV (signals): PDF_CACHE_DIR va al directorio temporal
+    ajustes_directorio = {'MEDIA_ROOT': 'media', 'PDF_CACHE_DIR': 'pdf'}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def subir_foto(self, ancho, alto, formato='JPEG'):
+        exif = Image.Exif()
+        exif[0x010F] = 'Camara'  # Make
+        salida = io.BytesIO()
+        Image.new('RGB', (ancho, alto), 'navy').save(salida, format=formato, exif=exif)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Candidato.objects.create(
+                nombre='Ana', titular='Diseñadora', region='RM', experiencia='junior',
+                foto=SimpleUploadedFile(f'foto.{formato.lower()}', salida.getvalue(), content_type=f'image/{formato.lower()}'),
+            )
+
+    def test_original_limpio_y_variantes(self):
+        candidato = self.subir_foto(3000, 1500)
+        with default_storage.open(candidato.foto.name) as archivo:
+            original = Image.open(archivo)
+            self.assertEqual(original.size, (imagenes.MAX_ORIGINAL, 1000))
+            self.assertNotIn('exif', original.info)
+        self.assertEqual([ancho for formato, ancho in imagenes.variantes(candidato.foto.name) if formato == 'webp'], list(imagenes.ANCHOS))
+        html = Template("{% load imagenes %}{% imagen foto 'carrusel' class='rounded' %}").render(Context({'foto': candidato.foto}))
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('-160.webp 160w', html)
+        self.assertIn('class="rounded"', html)
+
+    def test_imagen_chica_no_se_agranda(self):
+        candidato = self.subir_foto(100, 100)
+        variante = imagenes.nombre_variante(candidato.foto.name, imagenes.ANCHOS[0], 'webp')
+        with default_storage.open(variante) as archivo:
+            self.assertEqual(Image.open(archivo).size, (100, 100))
+
+    def test_webp_y_gif_tambien_pierden_metadatos(self):
+        for formato in ('WEBP', 'GIF'):
+            with self.subTest(formato=formato):
+                candidato = self.subir_foto(3000, 1500, formato)
+                with default_storage.open(candidato.foto.name) as archivo:
+                    original = Image.open(archivo)
+                    self.assertEqual((original.format, original.size), (formato, (imagenes.MAX_ORIGINAL, 1000)))
+                    self.assertNotIn('exif', original.info)
+
+    def test_reemplazo_sin_borrar_el_original(self):
+        with patch.object(default_storage, 'delete', side_effect=AssertionError('no se borra antes de escribir')):
+            candidato = self.subir_foto(3000, 1500)
+        self.assertEqual(candidato.foto.name, Candidato.objects.get().foto.name)
+        with default_storage.open(candidato.foto.name) as archivo:
+            self.assertEqual(Image.open(archivo).size, (imagenes.MAX_ORIGINAL, 1000))
+        self.assertEqual(
+            [nombre for nombre in os.listdir(os.path.dirname(default_storage.path(candidato.foto.name))) if nombre.endswith('.tmp')], [],
+        )
+
+    def test_storage_remoto_apunta_el_registro_al_nuevo_nombre(self):
+        with patch('empleos.imagenes.FileSystemStorage', type('OtroStorage', (), {})):
+            candidato = self.subir_foto(3000, 1500)
+        guardado = Candidato.objects.get().foto.name
+        self.assertNotEqual(guardado, candidato.foto.name)
+        self.assertFalse(default_storage.exists(candidato.foto.name))
+        with default_storage.open(guardado) as archivo:
+            self.assertNotIn('exif', Image.open(archivo).info)
@@ -1,31 +1,23 @@
 import uuid
 import json
-import random
-import io
-import base64
-import qrcode
 import time
-import csv
-import threading
 import os
 import requests 
 
-from django.http import HttpResponse
-from django.template.loader import get_template
-from xhtml2pdf import pisa
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Q, Count, Avg
-from django.core.mail import send_mail
+from django.db.models import Q, Count, Avg, Sum, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Substr
 from django.conf import settings
 from django.contrib import messages
 from django.utils import timezone
 from datetime import timedelta
-from django.core.paginator import Paginator
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.admin.views.decorators import staff_member_required
 from django.urls import reverse # <--- NUEVO IMPORT NECESARIO
+from django.utils.cache import get_conditional_response
 
 # --- IMPORTACIONES PARA ACTIVACIÓN DE CUENTA ---
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -36,7 +28,7 @@ from django.contrib.auth.tokens import default_token_generator
 from .models import (
     OfertaLaboral, Candidato, Noticia, Valoracion, Suscriptor, 
     AlertaEmpleo, Postulacion, PerfilEmpresa, ReporteOferta, Notificacion, 
-    Pregunta, Favorito, Servicio,
+    Pregunta, Favorito, Servicio, VisitaDiaria,
     REGIONES_CHILE, NIVEL_EXPERIENCIA, TIPO_TRABAJO, RUBROS_CHILE
 )
 
@@ -45,27 +37,19 @@ from .forms import (
     ValoracionForm, SuscriptorForm, PerfilEmpresaForm, ReporteForm, 
     PreguntaForm, RegistroForm, NuevoServicioForm
 )
-
-# --- UTILIDAD: HILO PARA EMAIL (ENVÍO RÁPIDO) ---
-class EmailThread(threading.Thread):
-    def __init__(self, subject, message, recipient_list):
-        self.subject = subject
-        self.message = message
-        self.recipient_list = recipient_list
-        threading.Thread.__init__(self)
-
-    def run(self):
-        try:
-            send_mail(
-                self.subject, 
-                self.message, 
-                settings.EMAIL_HOST_USER, 
-                self.recipient_list, 
-                fail_silently=False
-            )
-            print(f"✅ Correo enviado en segundo plano a: {self.recipient_list}")
-        except Exception as e:
-            print(f"⚠️ Error enviando email en segundo plano: {e}")
+from .busqueda import buscar_candidatos, buscar_ofertas
+from .cache import cache_publico
+from .estadisticas import foto_actual, tendencia
+from .exportacion import filas_postulaciones, respuesta_exportacion, zip_en_streaming
+from .compatibilidad import CAMPOS_OFERTA, detalle_compatibilidad, mejores_ofertas_para, puntajes_oferta
+from .paginacion import paginar_cursor
+from .pdfs import (
+    CAMPOS_CARTEL, CAMPOS_CV, ErrorPDF, cvs_de_postulaciones, generar_cartel, generar_cv, huella_cartel, huella_cv,
+)
+from .qr import huella_qr, obtener_qr
+from .recomendaciones import similares_de
+from .tareas import encolar, encolar_correo
+from .visitas import registrar_visita
 
 # =========================================================
 # VISTAS GENERALES
@@ -74,11 +58,12 @@ class EmailThread(threading.Thread):
 def pagina_exito(request): 
     return render(request, 'exito.html')
 
+@cache_publico('ofertas', 'empresas')
 def pagina_inicio(request):
     all_ofertas = OfertaLaboral.objects.filter(publicada=True).order_by('-es_destacado', '-fecha_publicacion')
     
     q = request.GET.get('q')
-    if q: all_ofertas = all_ofertas.filter(Q(titulo__icontains=q) | Q(empresa__icontains=q))
+    if q: all_ofertas = buscar_ofertas(all_ofertas, q)
     
     region = request.GET.get('region')
     if region: all_ofertas = all_ofertas.filter(region=region)
@@ -91,20 +76,19 @@ def pagina_inicio(request):
         fecha_limite = timezone.now() - timedelta(days=int(dias))
         all_ofertas = all_ofertas.filter(fecha_publicacion__gte=fecha_limite)
 
-    paginator = Paginator(all_ofertas, 10)
-    page_obj = paginator.get_page(request.GET.get('page'))
-    
-    empresas = PerfilEmpresa.objects.filter(es_destacada=True).exclude(logo='')
+    # Con búsqueda el orden es por relevancia y se pagina por desplazamiento
+    orden = None if q else ('-es_destacado', '-fecha_publicacion', '-id')
+    page_obj = paginar_cursor(request, all_ofertas, orden, por_pagina=10, contar=True)
     
     favoritos_ids = []
     if request.user.is_authenticated:
         favoritos_ids = Favorito.objects.filter(usuario=request.user).values_list('oferta_id', flat=True)
 
+    # Ofertas y empresas destacadas: barra lateral compartida, ver templatetags/destacados.py
     context = {
-        'ofertas_destacadas': all_ofertas.filter(es_destacado=True)[:5],
         'ofertas': page_obj, 'regiones': REGIONES_CHILE, 
         'tipos': TIPO_TRABAJO, 'niveles': NIVEL_EXPERIENCIA, 
-        'form_newsletter': SuscriptorForm(), 'empresas_carrusel': empresas,
+        'form_newsletter': SuscriptorForm(),
         'favoritos_ids': list(favoritos_ids)
     }
     return render(request, 'lista_ofertas.html', context)
@@ -113,10 +97,9 @@ def pagina_inicio(request):
 
 def detalle_oferta(request, id):
     oferta = get_object_or_404(OfertaLaboral, id=id)
-    oferta.visitas += 1
-    oferta.save(update_fields=['visitas'])
+    registrar_visita(oferta.id)
     
-    similares = OfertaLaboral.objects.filter(tipo=oferta.tipo, publicada=True).exclude(id=id).order_by('-fecha_publicacion')[:3]
+    similares = similares_de(oferta)
     
     if request.method == 'POST' and 'btn_preguntar' in request.POST:
         if not request.user.is_authenticated: 
@@ -137,23 +120,8 @@ def detalle_oferta(request, id):
 
     match_percent = None
     match_details = []
-    if request.user.is_authenticated:
-        try:
-            candidato = request.user.candidato
-            score = 0
-            if oferta.region == candidato.region: score += 1; match_details.append({'icon':'✅', 'text':'Misma Región'})
-            else: match_details.append({'icon':'❌', 'text':'Diferente Región'})
-            
-            if oferta.sueldo and candidato.pretension_renta:
-                if oferta.sueldo >= candidato.pretension_renta * 0.9: score += 1; match_details.append({'icon':'✅', 'text':'Sueldo Acorde'})
-                else: match_details.append({'icon':'⚠️', 'text':'Sueldo bajo tu pretensión'})
-            else: score += 0.5; match_details.append({'icon':'⚖️', 'text':'Sueldo a negociar'})
-            
-            if candidato.titular and oferta.titulo and candidato.titular.lower() in oferta.titulo.lower(): score += 1; match_details.append({'icon':'✅', 'text':'Perfil Técnico Compatible'})
-            else: score += 0.5; match_details.append({'icon':'🔍', 'text':'Revisar requisitos'})
-            
-            match_percent = int((score / 3) * 100)
-        except: pass
+    if request.user.is_authenticated and hasattr(request.user, 'candidato'):
+        match_percent, match_details = detalle_compatibilidad(request.user.candidato, oferta)
 
     return render(request, 'detalle_oferta.html', {
         'oferta': oferta, 'similares': similares, 'match_percent': match_percent, 
@@ -178,15 +146,9 @@ def publicar_empleo(request):
             oferta.publicada = True    
             oferta.save()
             
-            # Sistema de Alertas Automáticas
+            # Sistema de Alertas Automáticas (coincidencias y envío corren en el worker)
             try:
-                palabras = oferta.titulo.split() if oferta.titulo else []
-                query = Q(region=oferta.region) & (Q(palabra_clave__icontains=oferta.titulo) | Q(palabra_clave__in=palabras))
-                alertas_coincidentes = AlertaEmpleo.objects.filter(query)
-                destinatarios = list(set([alerta.email for alerta in alertas_coincidentes]))
-                if destinatarios: 
-                    mensaje = f"Nueva oferta: {oferta.titulo}. Postula aquí: https://www.buscapegachile.cl/oferta/{oferta.id}/"
-                    EmailThread(f"🔔 Alerta: {oferta.titulo}", mensaje, destinatarios).start()
+                encolar('empleos.correos.enviar_alertas_oferta', clave=f"alerta:{oferta.id}", oferta_id=oferta.id)
             except Exception as e: 
                 print(f"Error alertas: {e}")
 
@@ -196,10 +158,28 @@ def publicar_empleo(request):
         form = NuevaOfertaForm()
     return render(request, 'publicar_empleo.html', {'form': form})
 
+def _por_oferta(queryset, agregado):
+    # Subconsulta correlacionada por oferta: varios JOIN 1-N en el mismo GROUP BY multiplicarían las filas
+    return Coalesce(Subquery(
+        queryset.filter(oferta=OuterRef('pk')).order_by().values('oferta').annotate(total=agregado).values('total')
+    ), 0)
+
+def ofertas_con_resumen(usuario):
+    """Ofertas de la empresa con sus contadores del panel, todo en una consulta."""
+    hace_una_semana = timezone.localdate() - timedelta(days=7)
+    return OfertaLaboral.objects.filter(usuario=usuario).only(
+        'id', 'token', 'titulo', 'region', 'fecha_publicacion', 'publicada', 'visitas'
+    ).annotate(
+        postulantes=_por_oferta(Postulacion.objects.all(), Count('id')),
+        postulantes_nuevos=_por_oferta(Postulacion.objects.filter(estado='ENV'), Count('id')),
+        postulantes_entrevista=_por_oferta(Postulacion.objects.filter(estado='INT'), Count('id')),
+        preguntas_pendientes=_por_oferta(Pregunta.objects.filter(respuesta__isnull=True), Count('id')),
+        visitas_semana=_por_oferta(VisitaDiaria.objects.filter(fecha__gt=hace_una_semana), Sum('visitas')),
+    ).order_by('-fecha_publicacion')
+
 @login_required
 def mis_avisos(request): 
-    mis_ofertas = OfertaLaboral.objects.filter(usuario=request.user).order_by('-fecha_publicacion')
-    return render(request, 'mis_avisos.html', {'ofertas': mis_ofertas})
+    return render(request, 'mis_avisos.html', {'ofertas': ofertas_con_resumen(request.user)})
 
 @login_required
 def editar_empresa(request):
@@ -231,6 +211,7 @@ def editar_oferta(request, token):
         form = NuevaOfertaForm(instance=oferta)
     return render(request, 'editar_oferta.html', {'form': form, 'oferta': oferta})
 
+@cache_publico('empresas')
 def lista_empresas(request):
     empresas = PerfilEmpresa.objects.exclude(nombre__isnull=True).exclude(logo='')
     q = request.GET.get('q')
@@ -301,11 +282,10 @@ def postular_oferta(request, id):
 @login_required
 def gestion_candidatos(request, id_oferta):
     oferta = get_object_or_404(OfertaLaboral, id=id_oferta, usuario=request.user)
-    postulaciones = oferta.postulaciones.all().order_by('-fecha')
     if request.method == 'POST':
         post_id = request.POST.get('postulacion_id')
         nuevo_estado = request.POST.get('nuevo_estado')
-        postulacion = get_object_or_404(Postulacion, id=post_id)
+        postulacion = get_object_or_404(Postulacion.objects.select_related('candidato__usuario'), id=post_id, oferta=oferta)
         postulacion.estado = nuevo_estado
         postulacion.save()
         
@@ -319,7 +299,19 @@ def gestion_candidatos(request, id_oferta):
         
         messages.success(request, "Estado actualizado.")
         return redirect('gestion_candidatos', id_oferta=id_oferta)
-    return render(request, 'gestion_candidatos.html', {'oferta': oferta, 'postulaciones': postulaciones})
+
+    postulaciones = list(oferta.postulaciones.select_related('candidato').order_by('-fecha'))
+    for post, puntaje in zip(postulaciones, puntajes_oferta(oferta, [p.candidato for p in postulaciones])):
+        post.compatibilidad = int(puntaje)
+    orden = request.GET.get('orden')
+    if orden == 'compatibilidad':
+        postulaciones.sort(key=lambda p: p.compatibilidad, reverse=True)
+    # Conteo por estado sobre la lista ya cargada: sin consultas extra
+    por_estado = {codigo: 0 for codigo, _ in Postulacion.ESTADOS}
+    for post in postulaciones:
+        por_estado[post.estado] = por_estado.get(post.estado, 0) + 1
+    resumen = [(nombre, por_estado[codigo]) for codigo, nombre in Postulacion.ESTADOS if por_estado[codigo]]
+    return render(request, 'gestion_candidatos.html', {'oferta': oferta, 'postulaciones': postulaciones, 'orden': orden, 'resumen': resumen})
 
 @login_required
 def exportar_candidatos_csv(request, id_oferta):
@@ -327,22 +319,51 @@ def exportar_candidatos_csv(request, id_oferta):
     if not hasattr(request.user, 'perfil_empresa'):
         messages.error(request, "Acción exclusiva para empresas registradas.")
         return redirect('home')
-    
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="Postulantes_{oferta.id}.csv"'
-    writer = csv.writer(response)
-    writer.writerow(['Nombre', 'Email', 'Teléfono', 'Titulo', 'Estado', 'Fecha'])
-    for post in oferta.postulaciones.all(): 
-        writer.writerow([post.candidato.nombre, post.candidato.email, post.candidato.telefono, post.candidato.titular, post.get_estado_display(), post.fecha.strftime("%d-%m-%Y")])
+    filas = filas_postulaciones(Postulacion.objects.filter(oferta=oferta), con_oferta=False)
+    return respuesta_exportacion(filas, f"Postulantes_{oferta.id}", request.GET.get('formato', 'csv'))
+
+@login_required
+def descargar_cvs_oferta(request, id_oferta):
+    # Todos los CV (PDF generado + adjunto) en un ZIP que se escribe mientras se arma
+    oferta = get_object_or_404(OfertaLaboral, id=id_oferta, usuario=request.user)
+    if not hasattr(request.user, 'perfil_empresa'):
+        messages.error(request, "Acción exclusiva para empresas registradas.")
+        return redirect('home')
+    archivos = cvs_de_postulaciones(Postulacion.objects.filter(oferta=oferta))
+    response = StreamingHttpResponse(zip_en_streaming(archivos), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="CVs_{oferta.id}.zip"'
     return response
 
+@login_required
+def exportar_postulaciones_empresa(request):
+    # Todas las postulaciones de todas las ofertas de la cuenta, en un solo archivo
+    if not hasattr(request.user, 'perfil_empresa'):
+        messages.error(request, "Acción exclusiva para empresas registradas.")
+        return redirect('home')
+    filas = filas_postulaciones(Postulacion.objects.filter(oferta__usuario=request.user))
+    return respuesta_exportacion(filas, f"Postulantes_{timezone.localdate():%Y%m%d}", request.GET.get('formato', 'csv'))
+
 def lista_candidatos(request):
-    candidatos = Candidato.objects.filter(publicado=True).order_by('-fecha_creacion')
+    # Solo las columnas de la tarjeta; la presentación llega recortada desde la BD
+    candidatos = Candidato.objects.filter(publicado=True).only(
+        'id', 'nombre', 'titular', 'rubro', 'region', 'experiencia', 'pretension_renta', 'foto', 'fecha_creacion'
+    ).annotate(resumen=Substr('presentacion', 1, 160))
+    q = request.GET.get('q', '').strip()
     rubro = request.GET.get('rubro')
     region = request.GET.get('region')
+    experiencia = request.GET.get('experiencia')
+    renta_min = request.GET.get('renta_min', '')
+    renta_max = request.GET.get('renta_max', '')
+    if q: candidatos = buscar_candidatos(candidatos, q)
     if rubro: candidatos = candidatos.filter(rubro=rubro)
     if region: candidatos = candidatos.filter(region=region)
-    return render(request, 'lista_candidatos.html', {'candidatos': candidatos, 'regiones': REGIONES_CHILE, 'rubros': RUBROS_CHILE})
+    if experiencia: candidatos = candidatos.filter(experiencia=experiencia)
+    if renta_min.isdigit(): candidatos = candidatos.filter(pretension_renta__gte=int(renta_min))
+    if renta_max.isdigit(): candidatos = candidatos.filter(pretension_renta__lte=int(renta_max))
+    candidatos = paginar_cursor(request, candidatos, ('-fecha_creacion', '-id'), por_pagina=12)
+    return render(request, 'lista_candidatos.html', {
+        'candidatos': candidatos, 'regiones': REGIONES_CHILE, 'rubros': RUBROS_CHILE, 'niveles': NIVEL_EXPERIENCIA,
+    })
 
 def detalle_candidato(request, id):
     candidato = get_object_or_404(Candidato, id=id)
@@ -362,15 +383,19 @@ def detalle_candidato(request, id):
     return render(request, 'detalle_candidato.html', {'candidato': candidato, 'puede_ver_contacto': puede_ver_contacto})
 
 def descargar_cv_pdf(request, id):
-    candidato = get_object_or_404(Candidato, id=id)
-    template_path = 'pdf/cv_template.html'
-    context = {'candidato': candidato}
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="CV_{candidato.nombre}.pdf"'
-    template = get_template(template_path)
-    html = template.render(context)
-    pisa_status = pisa.CreatePDF(html, dest=response)
-    if pisa_status.err: return HttpResponse('Error al generar PDF')
+    candidato = get_object_or_404(Candidato.objects.only('id', *CAMPOS_CV), id=id)
+    # El PDF se renderiza una vez por versión del CV (empleos.pdfs); la huella sirve de ETag
+    huella = huella_cv(candidato)
+    no_modificado = get_conditional_response(request, etag=f'"{huella}"')
+    if no_modificado is not None:
+        return no_modificado
+    try:
+        ruta = generar_cv(candidato)
+    except ErrorPDF:
+        return HttpResponse('Error al generar PDF', status=500)
+    response = FileResponse(open(ruta, 'rb'), as_attachment=True, filename=f"CV_{candidato.nombre}.pdf", content_type='application/pdf')
+    response['ETag'] = f'"{huella}"'
+    response['Cache-Control'] = 'private, max-age=3600'
     return response
 
 @login_required
@@ -382,6 +407,23 @@ def mis_postulaciones(request):
     postulaciones = Postulacion.objects.filter(candidato=candidato).order_by('-fecha')
     return render(request, 'mis_postulaciones.html', {'postulaciones': postulaciones, 'candidato': candidato})
 
+@login_required
+def mejores_ofertas(request):
+    try: candidato = request.user.candidato
+    except Candidato.DoesNotExist:
+        messages.warning(request, "Primero crea tu Perfil de Talento.")
+        return redirect('publicar_candidato')
+    desde = timezone.now() - timedelta(days=90)
+    recientes = list(OfertaLaboral.objects.filter(publicada=True, fecha_publicacion__gte=desde).order_by('-fecha_publicacion').values(*CAMPOS_OFERTA)[:2000])
+    ranking = mejores_ofertas_para(candidato, recientes)
+    por_id = OfertaLaboral.objects.in_bulk([oferta_id for oferta_id, _ in ranking])
+    ofertas = []
+    for oferta_id, puntaje in ranking:
+        if oferta_id in por_id:
+            por_id[oferta_id].compatibilidad = puntaje
+            ofertas.append(por_id[oferta_id])
+    return render(request, 'mejores_ofertas.html', {'ofertas': ofertas, 'candidato': candidato})
+
 @login_required
 def toggle_favorito(request, id_oferta):
     oferta = get_object_or_404(OfertaLaboral, id=id_oferta)
@@ -472,7 +514,7 @@ def registro_usuario(request):
             Si no fuiste tú, ignora este correo.
             """
             
-            EmailThread(asunto, mensaje, [user.email]).start()
+            encolar_correo(asunto, mensaje, [user.email], clave=f"activacion:{user.pk}")
             
             # 🔥 CORRECCIÓN INFALIBLE: Redirigir con señal en la URL 🔥
             # Esto evita que el mensaje se pierda por problemas de cookies/SSL
@@ -537,6 +579,7 @@ def publicar_servicio(request):
         
     return render(request, 'servicios/publicar_servicio.html', {'form': form})
 
+@cache_publico('servicios')
 def lista_servicios(request):
     servicios = Servicio.objects.filter(publicado=True).order_by('-fecha_publicacion')
     
@@ -547,6 +590,7 @@ def lista_servicios(request):
     if rubro: servicios = servicios.filter(rubro=rubro)
     if region: servicios = servicios.filter(region=region)
     if q: servicios = servicios.filter(titulo__icontains=q)
+    servicios = paginar_cursor(request, servicios, ('-fecha_publicacion', '-id'), por_pagina=12)
     
     return render(request, 'servicios/lista_servicios.html', {
         'servicios': servicios,
@@ -562,15 +606,20 @@ def detalle_servicio(request, id):
 
 @staff_member_required
 def panel_admin(request):
-    total_ofertas = OfertaLaboral.objects.count()
-    total_candidatos = Candidato.objects.count()
-    total_usuarios = User.objects.count()
-    datos_region = OfertaLaboral.objects.values('region').annotate(total=Count('region')).order_by('-total')
-    labels_reg = [dict(REGIONES_CHILE).get(x['region'], x['region']) for x in datos_region]
-    data_reg = [x['total'] for x in datos_region]
-    publicadas = OfertaLaboral.objects.filter(publicada=True).count()
-    pendientes = OfertaLaboral.objects.filter(publicada=False).count()
-    context = {'kpi_ofertas': total_ofertas, 'kpi_candidatos': total_candidatos, 'kpi_usuarios': total_usuarios, 'labels_reg': json.dumps(labels_reg), 'data_reg': json.dumps(data_reg), 'data_pie': json.dumps([publicadas, pendientes])}
+    # Cifras precalculadas (empleos.estadisticas): no se cuentan las tablas base en cada carga
+    foto = foto_actual()
+    totales = foto['total']
+    regiones = sorted(foto['ofertas_region'].items(), key=lambda item: -item[1])
+    labels_reg = [dict(REGIONES_CHILE).get(region, region) for region, _ in regiones]
+    data_reg = [total for _, total in regiones]
+    estados = foto['ofertas_estado']
+    fechas, series = tendencia()
+    context = {
+        'kpi_ofertas': totales.get('ofertas', 0), 'kpi_candidatos': totales.get('candidatos', 0), 'kpi_usuarios': totales.get('usuarios', 0),
+        'labels_reg': json.dumps(labels_reg), 'data_reg': json.dumps(data_reg),
+        'data_pie': json.dumps([estados.get('publicadas', 0), estados.get('pendientes', 0)]),
+        'labels_tendencia': json.dumps([f.strftime('%d-%m') for f in fechas]), 'series_tendencia': json.dumps(series),
+    }
     return render(request, 'panel_admin.html', context)
 
 # --- EXTRAS (MAPA, QR, PAGOS, ETC) ---
@@ -580,7 +629,9 @@ def crear_alerta(request):
         email = request.POST.get('email')
         clave = request.POST.get('palabra_clave')
         region = request.POST.get('region')
-        AlertaEmpleo.objects.create(email=email, palabra_clave=clave, region=region)
+        frecuencia = request.POST.get('frecuencia')
+        if frecuencia not in dict(AlertaEmpleo.FRECUENCIAS): frecuencia = AlertaEmpleo.INSTANTANEA
+        AlertaEmpleo.objects.create(email=email, palabra_clave=clave, region=region, frecuencia=frecuencia)
         messages.success(request, f"¡Alerta creada!")
     return redirect('home')
 
@@ -612,37 +663,67 @@ def suscribir_newsletter(request):
         messages.success(request, 'Gracias por suscribirte.')
     return redirect('home')
 
+@cache_publico('ofertas')
 def pagina_estadisticas(request):
-    datos = OfertaLaboral.objects.filter(publicada=True).values('region').annotate(total=Count('region')); labels, data = [], []
-    dicc = dict(REGIONES_CHILE)
-    for item in datos: labels.append(dicc.get(item['region'], item['region'])); data.append(item['total'])
-    return render(request, 'estadisticas.html', {'labels_grafico': json.dumps(labels), 'data_grafico': json.dumps(data)})
+    regiones = sorted(foto_actual()['ofertas_region'].items(), key=lambda item: -item[1]); dicc = dict(REGIONES_CHILE)
+    labels, data = [dicc.get(region, region) for region, _ in regiones], [total for _, total in regiones]
+    fechas, series = tendencia()
+    return render(request, 'estadisticas.html', {
+        'labels_grafico': json.dumps(labels), 'data_grafico': json.dumps(data),
+        'labels_tendencia': json.dumps([f.strftime('%d-%m') for f in fechas]), 'ofertas_tendencia': json.dumps(series['ofertas']),
+    })
 
 def pagina_contacto(request):
     if request.method == 'POST': pass 
     return render(request, 'contacto.html', {'form': ContactoForm()})
 
+@cache_publico('noticias')
 def lista_blog(request): return render(request, 'blog.html', {'noticias': Noticia.objects.all().order_by('-fecha_publicacion')})
 def detalle_noticia(request, id): return render(request, 'detalle_noticia.html', {'noticia': get_object_or_404(Noticia, id=id)})
 def terminos_condiciones(request): return render(request, 'legales/terminos.html')
 def politica_privacidad(request): return render(request, 'legales/privacidad.html')
 
+@cache_publico('ofertas')
 def lista_practicas(request):
     practicas = OfertaLaboral.objects.filter(tipo='PRA', publicada=True).order_by('-fecha_publicacion')
     if request.GET.get('region'): practicas = practicas.filter(region=request.GET.get('region'))
+    practicas = paginar_cursor(request, practicas, ('-fecha_publicacion', '-id'), por_pagina=10)
     return render(request, 'lista_practicas.html', {'practicas': practicas, 'regiones': REGIONES_CHILE})
 
+@cache_publico('ofertas')
 def imprimir_oferta(request, id):
-    oferta = get_object_or_404(OfertaLaboral, id=id)
-    url_oferta = request.build_absolute_uri(f"/oferta/{oferta.id}/")
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(url_oferta)
-    qr.make(fit=True)
-    img = qr.make_image(fill='black', back_color='white')
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    return render(request, 'imprimir.html', {'oferta': oferta, 'qr_b64': img_str})
+    # El QR se sirve aparte (qr_oferta) y queda en la caché del navegador
+    oferta = get_object_or_404(OfertaLaboral.objects.only('id', *CAMPOS_CARTEL), id=id)
+    return render(request, 'imprimir.html', {'oferta': oferta})
+
+def qr_oferta(request, id):
+    # Antes del 304: una oferta borrada o sin publicar no tiene QR (es una búsqueda por PK)
+    get_object_or_404(OfertaLaboral.objects.only('id'), id=id, publicada=True)
+    # El QR nunca cambia mientras no cambie el dominio: la huella de la URL sirve de ETag
+    etag = f'"{huella_qr(id)}"'
+    no_modificado = get_conditional_response(request, etag=etag)
+    if no_modificado is not None:
+        return no_modificado
+    response = HttpResponse(obtener_qr(id), content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=2592000'
+    return response
+
+
+def imprimir_oferta_pdf(request, id):
+    oferta = get_object_or_404(OfertaLaboral.objects.only('id', *CAMPOS_CARTEL), id=id)
+    huella = huella_cartel(oferta)
+    no_modificado = get_conditional_response(request, etag=f'"{huella}"')
+    if no_modificado is not None:
+        return no_modificado
+    try:
+        ruta = generar_cartel(oferta)
+    except ErrorPDF:
+        return HttpResponse('Error al generar PDF', status=500)
+    response = FileResponse(open(ruta, 'rb'), filename=f"Cartel_{oferta.id}.pdf", content_type='application/pdf')
+    response['ETag'] = f'"{huella}"'
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
 
 def reportar_oferta(request, id):
     oferta = get_object_or_404(OfertaLaboral, id=id)
@@ -656,32 +737,14 @@ def reportar_oferta(request, id):
     return redirect('detalle', id=id)
 
 def mapa_empleos(request):
-    ofertas = OfertaLaboral.objects.filter(publicada=True)
-    marcadores = []
-    COORDENADAS_REGIONES = {'AP': [-18.4783, -70.3126], 'TA': [-20.2133, -70.1503], 'AN': [-23.6509, -70.3975], 'AT': [-27.3668, -70.3323], 'CO': [-29.9533, -71.3436], 'VA': [-33.0472, -71.6127], 'RM': [-33.4489, -70.6693], 'BI': [-36.8201, -73.0444], 'AR': [-38.7359, -72.5904], 'LS': [-41.4689, -72.9411], 'AI': [-45.5712, -72.0685], 'MA': [-53.1638, -70.9171], 'NB': [-36.6063, -72.1023], 'LR': [-39.8142, -73.2459]}
-    
-    for oferta in ofertas:
-        coords = COORDENADAS_REGIONES.get(oferta.region)
-        if coords: 
-            marcadores.append({
-                'lat': coords[0] + random.uniform(-0.02, 0.02), 
-                'lng': coords[1] + random.uniform(-0.02, 0.02), 
-                'titulo': oferta.titulo, 
-                'empresa': oferta.empresa, 
-                'url': f"/oferta/{oferta.id}/", 
-                'tipo': oferta.get_tipo_display()
-            })
-    return render(request, 'mapa.html', {'marcadores_json': json.dumps(marcadores)})
+    # Los marcadores llegan agrupados desde mapa/datos/ (empleos.mapa) según zoom y área visible
+    return render(request, 'mapa.html')
 
 def prueba_email(request):
-    try:
-        send_mail(
-            'Prueba de Fuego 🔥',
-            'Si lees esto, ¡la configuración de correo funciona perfectamente!',
-            settings.EMAIL_HOST_USER,
-            ['millapeld@gmail.com'], 
-            fail_silently=False,
-        )
-        return HttpResponse("✅ ¡ÉXITO! El correo fue enviado.")
-    except Exception as e:
-        return HttpResponse(f"❌ ERROR DETALLADO: {e}")
\ No newline at end of file
+    # Pasa por la cola como cualquier otro correo: si falla, el error queda en la tarea (admin)
+    tarea = encolar_correo(
+        'Prueba de Fuego 🔥',
+        'Si lees esto, ¡la configuración de correo funciona perfectamente!',
+        ['millapeld@gmail.com'],
+    )
+    return HttpResponse(f"✅ Correo encolado (tarea #{tarea.pk}).")
\ No newline at end of file
@@ -0,0 +1,103 @@
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# --- CONTADOR DE VISITAS CON BUFFER ---
+# Cada worker acumula las visitas en memoria y las vuelca a la base de datos cada
+# VISITAS_INTERVALO_FLUSH segundos (o al llegar a VISITAS_MAX_PENDIENTES) con un
+# UPDATE ... SET visitas = visitas + n por oferta, en vez de una escritura por página vista.
+# Un hilo de fondo vuelca lo pendiente aunque no lleguen más visitas, así que un worker
+# inactivo no retiene conteos: lo máximo que se pierde si el proceso muere a la fuerza
+# (SIGKILL, OOM) es un intervalo.
+
+
+class BufferVisitas:
+    def __init__(self):
+        self._pendientes = Counter()  # (oferta_id, fecha) -> visitas
+        self._lock = threading.Lock()
+        self._ultimo_volcado = time.monotonic()
+        self._hilo = None
+
+    def _intervalo(self):
+        return getattr(settings, 'VISITAS_INTERVALO_FLUSH', 30)
+
+    def registrar(self, oferta_id):
+        clave = (oferta_id, timezone.localdate())
+        with self._lock:
+            self._pendientes[clave] += 1
+            vencido = time.monotonic() - self._ultimo_volcado >= self._intervalo()
+            lleno = len(self._pendientes) >= getattr(settings, 'VISITAS_MAX_PENDIENTES', 1000)
+        self._iniciar_hilo()
+        if vencido or lleno:
+            self.volcar()
+
+    def _iniciar_hilo(self):
+        # Se arranca con la primera visita (no al importar: los comandos de manage.py no lo necesitan)
+        if self._hilo is None or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or not self._hilo.is_alive():
+                    self._hilo = threading.Thread(target=self._volcado_periodico, name='volcado-visitas', daemon=True)
+                    self._hilo.start()
+
+    def _volcado_periodico(self):
+        while True:
+            time.sleep(max(1, self._intervalo() / 2))  # a lo más 1,5 intervalos sin volcar
+            self.volcar_si_vencido()
+
+    def volcar_si_vencido(self):
+        with self._lock:
+            vencido = self._pendientes and time.monotonic() - self._ultimo_volcado >= self._intervalo()
+        if vencido:
+            self.volcar()
+            if threading.current_thread() is self._hilo:
+                connection.close()  # la conexión del hilo no la cierra ningún request
+
+    def volcar(self):
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, Counter()
+            self._ultimo_volcado = time.monotonic()
+        if not pendientes:
+            return
+        try:
+            guardar_visitas(pendientes)
+        except Exception as e:
+            # Si la BD falla se devuelven al buffer para el próximo volcado
+            with self._lock:
+                self._pendientes.update(pendientes)
+            print(f"⚠️ Error volcando visitas: {e}")
+
+
+def guardar_visitas(pendientes):
+    from .models import OfertaLaboral, VisitaDiaria
+
+    por_oferta = Counter()
+    for (oferta_id, _fecha), cantidad in pendientes.items():
+        por_oferta[oferta_id] += cantidad
+
+    with transaction.atomic():
+        for oferta_id, cantidad in por_oferta.items():
+            OfertaLaboral.objects.filter(id=oferta_id).update(visitas=F('visitas') + cantidad)
+
+        if getattr(settings, 'VISITAS_POR_DIA', True):
+            existentes = set(OfertaLaboral.objects.filter(id__in=por_oferta).values_list('id', flat=True))
+            claves = [(oid, fecha) for oid, fecha in pendientes if oid in existentes]
+            VisitaDiaria.objects.bulk_create(
+                [VisitaDiaria(oferta_id=oid, fecha=fecha) for oid, fecha in claves],
+                ignore_conflicts=True,
+            )
+            for oid, fecha in claves:
+                VisitaDiaria.objects.filter(oferta_id=oid, fecha=fecha).update(visitas=F('visitas') + pendientes[(oid, fecha)])
+
+
+buffer_visitas = BufferVisitas()
+atexit.register(buffer_visitas.volcar)
+
+
+def registrar_visita(oferta_id):
+    buffer_visitas.registrar(oferta_id)
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     # Utilidades Django
     'django.contrib.humanize',  # Formato de dinero y fechas
     'django.contrib.sites',     # Necesario para "Olvidé mi contraseña"
+    'django.contrib.sitemaps',  # Plantillas sitemap.xml / sitemap_index.xml
     
     # Mis Apps
     'empleos',
@@ -57,6 +58,7 @@ SITE_ID = 1
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware", # Motor de archivos estáticos
+    'empleos.metricas.MetricasMiddleware', # Solo con METRICAS_ACTIVAS=1 (ver empleos/metricas.py)
     'django.contrib.sessions.middleware.SessionMiddleware', # <--- DEBE IR ANTES DE MESSAGES
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -96,6 +98,25 @@ DATABASES = {
     )
 }
 
+# =========================================================
+# ⚡ CACHÉ (memoria local por defecto, archivos o Redis según entorno)
+# =========================================================
+
+if os.environ.get('REDIS_URL'):
+    # Requiere el paquete `redis` instalado
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': os.environ['REDIS_URL']}}
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': os.environ['CACHE_DIR']}}
+else:
+    # Solo para desarrollo o un único proceso: cada worker de gunicorn tendría su propia caché y
+    # lo que invalida uno (empleos.cache.invalidar) no lo ven los demás hasta CACHE_VERSIONES_SEGUNDOS.
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'busca-pega'}}
+
+# Segundos que vive una página pública cacheada (se invalida antes si cambia el contenido)
+CACHE_PAGINAS_SEGUNDOS = int(os.environ.get('CACHE_PAGINAS_SEGUNDOS', 300))
+# Vida de las versiones de grupo: acota cuánto puede servir contenido viejo un worker sin caché compartida
+CACHE_VERSIONES_SEGUNDOS = int(os.environ.get('CACHE_VERSIONES_SEGUNDOS', CACHE_PAGINAS_SEGUNDOS))
+
 # =========================================================
 # 👑 CONFIGURACIÓN DE JAZZMIN (El nuevo Dashboard)
 # =========================================================
@@ -144,6 +165,9 @@ ANYMAIL = {
 DEFAULT_FROM_EMAIL = "Equipo Busca Pega <noreply@buscapegachile.cl>"
 SERVER_EMAIL = "noreply@buscapegachile.cl"
 
+# URL pública del sitio (sin "/" final) para enlaces fuera de una petición: correos, QR y sitemaps
+URL_SITIO = os.environ.get('URL_SITIO', 'https://www.buscapegachile.cl').rstrip('/')
+
 # =========================================================
 # 🎨 ARCHIVOS ESTÁTICOS Y MEDIA
 # =========================================================
@@ -156,6 +180,14 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Sitemaps pregenerados por `manage.py generar_sitemaps` (ver empleos/sitemaps.py)
+SITEMAPS_DIR = os.environ.get('SITEMAPS_DIR', os.path.join(BASE_DIR, 'sitemaps'))
+
+# PDFs de CV ya renderizados (ver empleos/pdfs.py); se pueden borrar, se regeneran solos
+PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR', os.path.join(BASE_DIR, 'cache_pdf'))
+# Procesos que renderizan los PDF faltantes al descargar el ZIP de CVs de una oferta
+PDF_PROCESOS = int(os.environ.get('PDF_PROCESOS', '2'))
+
 # =========================================================
 # ⚙️ OTRAS CONFIGURACIONES
 # =========================================================
@@ -173,6 +205,31 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Motor de búsqueda de ofertas (vacío = según la base de datos: FTS5 en SQLite, tsvector/pg_trgm en PostgreSQL)
+BUSCADOR_OFERTAS = os.environ.get('BUSCADOR_OFERTAS')
+
+# Contador de visitas: se acumulan en memoria y se vuelcan a la BD cada N segundos (un hilo de fondo
+# lo hace aunque el worker no reciba más tráfico)
+VISITAS_INTERVALO_FLUSH = int(os.environ.get('VISITAS_INTERVALO_FLUSH', 30))
+VISITAS_MAX_PENDIENTES = 1000
+VISITAS_POR_DIA = True
+
+# Cola de tareas: en producción corre `python manage.py procesar_tareas` como proceso aparte.
+# Con TAREAS_SINCRONAS=1 se ejecutan al encolar (útil en desarrollo sin worker).
+TAREAS_SINCRONAS = os.environ.get('TAREAS_SINCRONAS') == '1'
+
+# Envío masivo de alertas: destinatarios por tarea y límite de envío del proveedor
+CORREOS_TAMANO_LOTE = 100
+CORREOS_POR_SEGUNDO = int(os.environ.get('CORREOS_POR_SEGUNDO', 10))
+
+# Instrumentación por vista (consultas, tiempo de BD/plantillas/HTTP): header Server-Timing y /metrics.
+# METRICAS_UMBRAL_LENTO_MS > 0 registra las peticiones más lentas con sus consultas.
+# /metrics exige "Authorization: Bearer <METRICAS_TOKEN>" o una sesión de staff.
+METRICAS_ACTIVAS = os.environ.get('METRICAS_ACTIVAS') == '1'
+METRICAS_SERVER_TIMING = True
+METRICAS_UMBRAL_LENTO_MS = int(os.environ.get('METRICAS_UMBRAL_LENTO_MS', 0))
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN')
 # =========================================================
 # 🔧 CONFIGURACIÓN DE PRODUCCIÓN Y MENSAJES (CRÍTICO)
 # =========================================================
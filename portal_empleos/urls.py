@@ -1,10 +1,9 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.contrib.auth import views as auth_views
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib.sitemaps.views import sitemap
-from empleos.sitemaps import OfertaSitemap
+from empleos import api, feeds, mapa, metricas, sitemaps
 
 # Importamos TODAS las vistas (incluyendo las nuevas de Servicios)
 from empleos.views import (
@@ -12,7 +11,7 @@ from empleos.views import (
     lista_candidatos, publicar_candidato, pagina_exito, 
     pagina_planes, pagina_estadisticas, pagina_contacto,
     perfil_empresa, suscribir_newsletter,
-    lista_blog, detalle_noticia, imprimir_oferta,
+    lista_blog, detalle_noticia, imprimir_oferta, imprimir_oferta_pdf, qr_oferta,
     editar_oferta, mis_postulaciones,
     mapa_empleos, registro_usuario, logout_usuario,
     eliminar_cuenta, terminos_condiciones, politica_privacidad,
@@ -20,16 +19,14 @@ from empleos.views import (
     mis_avisos, panel_admin, crear_alerta,
     lista_practicas, postular_oferta, gestion_candidatos,
     editar_empresa, reportar_oferta, marcar_leidas,
-    pago_simulado, robots_txt, exportar_candidatos_csv,
+    pago_simulado, robots_txt, exportar_candidatos_csv, exportar_postulaciones_empresa, descargar_cvs_oferta,
     lista_empresas, responder_pregunta, toggle_favorito, mis_favoritos,
-    activar_cuenta, prueba_email,
+    activar_cuenta, prueba_email, mejores_ofertas,
     
     # NUEVAS VISTAS DE SERVICIOS / FREELANCE
     lista_servicios, publicar_servicio, detalle_servicio 
 )
 
-sitemaps = {'ofertas': OfertaSitemap}
-
 urlpatterns = [
     # --- ADMIN DE DJANGO ---
     path('admin/', admin.site.urls),
@@ -54,6 +51,8 @@ urlpatterns = [
     path('oferta/<int:id>/', detalle_oferta, name='detalle'),
     path('oferta/editar/<uuid:token>/', editar_oferta, name='editar_oferta'),
     path('oferta/<int:id>/imprimir/', imprimir_oferta, name='imprimir'),
+    path('oferta/<int:id>/imprimir.pdf', imprimir_oferta_pdf, name='imprimir_pdf'),
+    path('oferta/<int:id>/qr.png', qr_oferta, name='qr_oferta'),
     path('publicar/', publicar_empleo, name='publicar'), 
     path('publicar_empleo/', publicar_empleo, name='publicar_empleo'), 
     path('practicas/', lista_practicas, name='lista_practicas'),
@@ -70,8 +69,12 @@ urlpatterns = [
     path('pregunta/<int:id_pregunta>/responder/', responder_pregunta, name='responder_pregunta'),
 
     # --- SEO ---
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemap.xml', sitemaps.sitemap_indice, name='sitemap'),
+    re_path(r'^(?P<nombre>sitemap-[a-z]+-[0-9]+\.xml)$', sitemaps.sitemap_seccion, name='sitemap_seccion'),
     path('robots.txt', robots_txt, name='robots_txt'),
+    path('metrics', metricas.vista_metricas, name='metricas'),
+    path('feed/ofertas.atom', feeds.feed_atom, name='feed_ofertas_atom'),
+    path('feed/ofertas.jsonl', feeds.feed_jsonl, name='feed_ofertas_jsonl'),
 
     # --- GESTIÓN EMPRESA ---
     path('empresa/editar/', editar_empresa, name='editar_empresa'),
@@ -82,6 +85,8 @@ urlpatterns = [
     path('postular/<int:id>/', postular_oferta, name='postular_oferta'),
     path('gestion-oferta/<int:id_oferta>/candidatos/', gestion_candidatos, name='gestion_candidatos'),
     path('gestion-oferta/<int:id_oferta>/exportar/', exportar_candidatos_csv, name='exportar_csv'),
+    path('gestion-oferta/<int:id_oferta>/cvs/', descargar_cvs_oferta, name='descargar_cvs'),
+    path('mis-avisos/exportar/', exportar_postulaciones_empresa, name='exportar_postulaciones'),
     
     # --- CANDIDATOS ---
     path('candidatos/', lista_candidatos, name='candidatos'),
@@ -104,7 +109,19 @@ urlpatterns = [
     path('blog/<int:id>/', detalle_noticia, name='detalle_noticia'),
     path('exito/', pagina_exito, name='pagina_exito'),
     path('mis-postulaciones/', mis_postulaciones, name='mis_postulaciones'),
+    path('ofertas-para-mi/', mejores_ofertas, name='mejores_ofertas'),
     path('mapa/', mapa_empleos, name='mapa_empleos'),
+    path('mapa/datos/', mapa.datos_mapa, name='mapa_datos'),
+
+    # --- API JSON (solo lectura) ---
+    path('api/v1/ofertas/', api.lista, {'recurso': 'ofertas'}, name='api_ofertas'),
+    path('api/v1/ofertas/<int:id>/', api.detalle, {'recurso': 'ofertas'}, name='api_oferta'),
+    path('api/v1/servicios/', api.lista, {'recurso': 'servicios'}, name='api_servicios'),
+    path('api/v1/servicios/<int:id>/', api.detalle, {'recurso': 'servicios'}, name='api_servicio'),
+    path('api/v1/empresas/', api.lista, {'recurso': 'empresas'}, name='api_empresas'),
+    path('api/v1/empresas/<int:id>/', api.detalle, {'recurso': 'empresas'}, name='api_empresa'),
+    path('api/v1/candidatos/', api.lista, {'recurso': 'candidatos'}, name='api_candidatos'),
+    path('api/v1/candidatos/<int:id>/', api.detalle, {'recurso': 'candidatos'}, name='api_candidato'),
 
     # --- LEGALES ---
     path('terminos/', terminos_condiciones, name='terminos'),